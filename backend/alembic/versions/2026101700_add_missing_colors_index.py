@@ -0,0 +1,37 @@
+"""add index for images missing dominant colors
+
+Revision ID: 2026101700_missing_colors
+Revises: 2024111000_exec_tracking
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2026101700_missing_colors'
+down_revision = '2024111000_exec_tracking'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index the dominant_colors IS NULL scan used by /api/images/process-colors"""
+    
+    # JSON columns can't be indexed directly in MySQL, so index the ISNULL()
+    # expression instead (functional key part, MySQL 8.0.13+). InnoDB appends
+    # the primary key, which makes the index covering for SELECT id.
+    connection = op.get_bind()
+    result = connection.execute(sa.text(
+        "SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = 'images' AND index_name = 'ix_images_missing_colors'"
+    ))
+    index_exists = result.scalar() > 0
+    
+    if not index_exists:
+        op.execute("CREATE INDEX ix_images_missing_colors ON images ((ISNULL(dominant_colors)))")
+
+
+def downgrade():
+    """Remove the missing-colors index"""
+    
+    op.drop_index('ix_images_missing_colors', table_name='images')
@@ -0,0 +1,45 @@
+"""add served_mime to images
+
+Revision ID: 2026101701_served_mime
+Revises: 2026101700_missing_colors
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2026101701_served_mime'
+down_revision = '2026101700_missing_colors'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add served_mime column and backfill it from mime_type"""
+    
+    connection = op.get_bind()
+    result = connection.execute(sa.text(
+        "SELECT COUNT(*) FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = 'images' AND column_name = 'served_mime'"
+    ))
+    column_exists = result.scalar() > 0
+    
+    if not column_exists:
+        op.add_column('images',
+            sa.Column('served_mime', sa.String(length=64), nullable=True,
+                      comment='Content-Type used when serving the image (MPO normalized to JPEG)')
+        )
+    
+    # Backfill existing rows
+    op.execute(
+        "UPDATE images SET served_mime = CASE "
+        "WHEN LOWER(mime_type) = 'image/mpo' THEN 'image/jpeg' "
+        "ELSE COALESCE(mime_type, 'image/jpeg') END "
+        "WHERE served_mime IS NULL"
+    )
+
+
+def downgrade():
+    """Remove served_mime column"""
+    
+    op.drop_column('images', 'served_mime')
@@ -0,0 +1,34 @@
+"""add composite index on images processing_status and uploaded_at
+
+Revision ID: 2026101702_proc_status_idx
+Revises: 2026101701_served_mime
+Create Date: 2026-10-17 00:00:02.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2026101702_proc_status_idx'
+down_revision = '2026101701_served_mime'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index (processing_status, uploaded_at) for the processing queue admin endpoints"""
+    
+    connection = op.get_bind()
+    result = connection.execute(sa.text(
+        "SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = 'images' AND index_name = 'ix_images_proc_status_uploaded'"
+    ))
+    index_exists = result.scalar() > 0
+    
+    if not index_exists:
+        op.create_index('ix_images_proc_status_uploaded', 'images', ['processing_status', 'uploaded_at'])
+
+
+def downgrade():
+    """Remove the processing status / upload time index"""
+    
+    op.drop_index('ix_images_proc_status_uploaded', table_name='images')
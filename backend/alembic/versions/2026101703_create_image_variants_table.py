@@ -0,0 +1,48 @@
+"""create image_variants table
+
+Revision ID: 2026101703_image_variants
+Revises: 2026101702_proc_status_idx
+Create Date: 2026-10-17 00:00:03.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2026101703_image_variants'
+down_revision = '2026101702_proc_status_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Record generated display variants so lookups don't have to walk the storage tree"""
+    
+    connection = op.get_bind()
+    result = connection.execute(sa.text(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = 'image_variants'"
+    ))
+    table_exists = result.scalar() > 0
+    
+    if not table_exists:
+        op.create_table(
+            'image_variants',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('image_id', sa.Integer(), nullable=False),
+            sa.Column('width', sa.Integer(), nullable=False),
+            sa.Column('height', sa.Integer(), nullable=False),
+            sa.Column('path', sa.String(length=500), nullable=False),
+            sa.Column('file_size', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+            sa.ForeignKeyConstraint(['image_id'], ['images.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('image_id', 'width', 'height', name='uq_image_variants_image_size')
+        )
+        op.create_index('ix_image_variants_id', 'image_variants', ['id'])
+
+
+def downgrade():
+    """Drop the image_variants table"""
+    
+    op.drop_index('ix_image_variants_id', table_name='image_variants')
+    op.drop_table('image_variants')
@@ -0,0 +1,34 @@
+"""add composite index on user_logs created_at, log_level and action
+
+Revision ID: 2026101704_user_logs_idx
+Revises: 2026101703_image_variants
+Create Date: 2026-10-17 00:00:04.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2026101704_user_logs_idx'
+down_revision = '2026101703_image_variants'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index (created_at, log_level, action) for the admin user log listing"""
+    
+    connection = op.get_bind()
+    result = connection.execute(sa.text(
+        "SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = 'user_logs' AND index_name = 'ix_user_logs_created_level_action'"
+    ))
+    index_exists = result.scalar() > 0
+    
+    if not index_exists:
+        op.create_index('ix_user_logs_created_level_action', 'user_logs', ['created_at', 'log_level', 'action'])
+
+
+def downgrade():
+    """Remove the user log listing index"""
+    
+    op.drop_index('ix_user_logs_created_level_action', table_name='user_logs')
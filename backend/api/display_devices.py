@@ -10,8 +10,10 @@ from models.display_device import DisplayDevice, DeviceStatus
 from models.device_log import DeviceLog, LogLevel
 from models.user import User
 from services.display_device_service import DisplayDeviceService
+from services.caching_service import invalidate_playlist_cache, invalidate_device_cache
 from utils.middleware import require_admin, get_current_user
 from utils.cookies import cookie_manager
+from websocket.manager import connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +121,9 @@ async def get_device_status(
         # Update last seen
         service.update_device_last_seen(device_token)
         
+        # Route playlist broadcasts for this device's playlist to it
+        connection_manager.subscribe(device.device_token, device.playlist_id, device.id)
+        
         # For authorized devices, ensure the cookie is properly set to maintain authentication
         if device.status.value == 'AUTHORIZED':
             cookie_manager.set_display_device_cookie(response, device.device_token)
@@ -288,7 +293,7 @@ async def update_device_orientation(
                 affected_playlists.append(playlist.id)
                 
                 # Re-compute pairing sequence for new orientation
-                images = db.query(Image).filter(Image.playlist_id == playlist.id).all()
+                images = db.query(Image.id, Image.width, Image.height).filter(Image.playlist_id == playlist.id).all()
                 image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
                 
                 # Get current sequence order
@@ -302,6 +307,7 @@ async def update_device_orientation(
                 computed = image_classification_service.compute_sequence(ordered_images, orientation_data.orientation)
                 playlist.computed_sequence = computed
                 db.commit()
+                invalidate_playlist_cache(playlist.id)
                 
                 # Auto-generate variants for new orientation
                 try:
@@ -429,6 +435,8 @@ async def assign_playlist_to_device(
         if not device:
             raise HTTPException(status_code=404, detail="Device not found")
         
+        connection_manager.subscribe(device.device_token, device.playlist_id, device.id)
+        
         logger.info(f"Playlist {assignment_data.playlist_id} assigned to device {device_id} by {current_user.username}")
         
         return DeviceResponse.from_device(device)
@@ -514,11 +522,13 @@ async def reset_device(
         # Reset the device token to force re-registration
         # This will invalidate any existing cookies
         from models.display_device import DisplayDevice
+        old_token = device.device_token
         new_token = DisplayDevice.generate_device_token()
         device.device_token = new_token
         device.status = DeviceStatus.PENDING
         
         db.commit()
+        invalidate_device_cache(old_token)
         
         logger.info(f"Device {device_id} reset by admin {current_user.username}")
         
@@ -1,37 +1,207 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Request, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Request, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy import func, case, update, select
+from sqlalchemy.orm import Session, load_only
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
 from pydantic import BaseModel
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import zipfile
-import io
+from itertools import repeat
 import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import orjson
 
-from models import get_db, Image, Album, Playlist
+from models import get_db, Image, Album
+from models.image import served_mime_for
 from models.user import User
 from models.display_device import DisplayDevice, DeviceStatus
+from models.playlist_variant import PlaylistVariantType
 from utils.middleware import require_auth
 from services.image_service import ImageService
 from services.image_storage_service import image_storage_service
 from services.display_device_service import DisplayDeviceService
+from services.playlist_variant_service import PlaylistVariantService, bucket_device_geometry
+from services.color_extractor import color_extractor_service
+from services.caching_service import cache_service
 from utils.csrf import csrf_protection
 from utils.cookies import CookieManager
 from utils.retry import image_processing_circuit_breaker
+from utils.responses import SendfileResponse
 from websocket.processing_notifier import (
     notify_thumbnail_complete,
     notify_thumbnail_failed,
-    notify_variant_complete,
-    notify_variant_failed,
-    notify_processing_complete,
-    notify_processing_failed
+    emit_processing_updates_sync
+)
+from websocket.events import (
+    variant_complete_event,
+    variant_failed_event,
+    processing_complete_event,
+    processing_failed_event
 )
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/images", tags=["images"])
+router = APIRouter(prefix="/api/images", tags=["images"], default_response_class=ORJSONResponse)
+
+# Images per worker chunk, and per commit within a chunk, for batch color extraction
+COLOR_BATCH_CHUNK_SIZE = 500
+COLOR_COMMIT_BATCH_SIZE = 200
+
+# Image IDs in a running color batch, so a repeated /process-colors call
+# doesn't extract the same images twice. Claimed and released by the batch
+# itself, so a queued task that never runs can't leave IDs stuck here.
+_colors_in_flight: set = set()
+_colors_in_flight_lock = threading.Lock()
+
+# Max hashes per IN (...) list for batch duplicate checks
+DUPLICATE_HASH_CHUNK_SIZE = 500
+
+# Page size of the unfiltered image listing when the client sends no limit
+DEFAULT_IMAGE_PAGE_SIZE = 100
+
+# Read size when copying files into a streamed zip download
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+
+# File endpoints keep a small snapshot of the image row and the requesting
+# device's geometry so repeated slideshow fetches skip the DB lookups
+SERVED_IMAGE_TTL_SECONDS = 60
+SMART_DEVICE_TTL_SECONDS = 30
+# Resolved, existing file paths per image and size (misses are never cached)
+FILE_PATH_TTL_SECONDS = 60
+
+# Trailing "_<width>x<height>.<ext>" of a scaled variant filename
+SCALED_DIMENSIONS_RE = re.compile(r"_(\d+)x(\d+)\.[^.]+$")
+
+# Headers shared by every image file response
+BASE_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "SAMEORIGIN",
+    "X-Cache": "HIT",  # Indicate this is served from cache
+    "Vary": "Accept",
+}
+
+
+class _ServedImage(NamedTuple):
+    """
+    The fields of an image row the file endpoints need, safe to keep across sessions.
+    
+    The ETag base and the Last-Modified / Content-Disposition header values only
+    depend on columns that never change after upload, so they are formatted once
+    when the snapshot is built rather than on every response.
+    """
+    id: int
+    filename: str
+    filename_stem: str  # filename split once for building scaled-variant names
+    filename_ext: str
+    original_filename: str
+    media_type: str
+    playlist_id: Optional[int]
+    etag_base: str
+    last_modified: datetime  # Naive UTC, second precision like the HTTP date
+    last_modified_http: str
+    content_disposition: str
+
+
+def _get_served_image(db: Session, image_id: int) -> Optional[_ServedImage]:
+    """Look up an image for file serving, cached briefly per image id"""
+    # "image_{id}" prefix so ImageService's invalidate_image_cache(id) drops it on update/delete
+    cache_key = f"image_{image_id}_served"
+    served = cache_service.get(cache_key)
+    if served is None:
+        # Only the columns the snapshot is built from - EXIF/color JSON stay on disk
+        image = db.execute(
+            select(Image)
+            .options(load_only(
+                Image.filename, Image.original_filename, Image.mime_type, Image.served_mime,
+                Image.playlist_id, Image.uploaded_at
+            ))
+            .where(Image.id == image_id)
+        ).scalar_one_or_none()
+        if not image:
+            return None
+        stem, _, ext = image.filename.rpartition('.')
+        served = _ServedImage(
+            id=image.id,
+            filename=image.filename,
+            filename_stem=stem,
+            filename_ext=ext,
+            original_filename=image.original_filename,
+            media_type=image.served_mime or served_mime_for(image.mime_type),
+            playlist_id=image.playlist_id,
+            etag_base=image.etag_base,
+            last_modified=image.uploaded_at.replace(tzinfo=None, microsecond=0),
+            last_modified_http=image.last_modified_http,
+            content_disposition=f'inline; filename="{image.original_filename}"',
+        )
+        cache_service.set(cache_key, served, SERVED_IMAGE_TTL_SECONDS)
+    return served
+
+
+def _cached_file_path(image_id: int, size: str, resolve: Callable[[], Optional[Path]]) -> Optional[Path]:
+    """
+    Resolve a file path for an image size and check it exists, remembering hits briefly.
+    
+    Repeat requests skip the resolution (a storage-tree walk for originals, a
+    variant lookup for scaled files) but still stat the cached path, so a file
+    removed or moved within the TTL is re-resolved instead of served as a 500.
+    Keyed under "image_{id}" so invalidate_image_cache(id) drops it when the
+    image is updated or deleted.
+    """
+    cache_key = f"image_{image_id}_path_{size}"
+    file_path = cache_service.get(cache_key)
+    if file_path is not None and not file_path.exists():
+        cache_service.delete(cache_key)
+        file_path = None
+    if file_path is None:
+        file_path = resolve()
+        if not file_path or not file_path.exists():
+            return None
+        cache_service.set(cache_key, file_path, FILE_PATH_TTL_SECONDS)
+    return file_path
+
+
+def _get_device_geometry(db: Session, device_token: str) -> Optional[Tuple[Optional[int], Optional[int], Optional[str]]]:
+    """(screen_width, screen_height, device_pixel_ratio) for a device token, cached briefly"""
+    cache_key = f"smart_device_{device_token}"
+    geometry = cache_service.get(cache_key)
+    if geometry is None:
+        device = DisplayDeviceService(db).get_device_by_token(device_token)
+        if not device:
+            return None
+        geometry = (device.screen_width, device.screen_height, device.device_pixel_ratio)
+        cache_service.set(cache_key, geometry, SMART_DEVICE_TTL_SECONDS)
+    return geometry
+
+
+# Expires header value per max-age in days, rebuilt at most once per second
+_EXPIRES_CACHE: dict = {}
+
+
+def _expires_header(days: int) -> str:
+    """HTTP date `days` from now, formatted once per wall-clock second and shared"""
+    now = int(time.time())
+    cached = _EXPIRES_CACHE.get(days)
+    if cached is None or cached[0] != now:
+        cached = (now, (datetime.utcfromtimestamp(now) + timedelta(days=days)).strftime("%a, %d %b %Y %H:%M:%S GMT"))
+        _EXPIRES_CACHE[days] = cached
+    return cached[1]
+
+
+def _client_hint(request: Request, name: str) -> Optional[float]:
+    """Read a numeric Client Hint, preferring the Sec-CH- form"""
+    value = request.headers.get(f"Sec-CH-{name}") or request.headers.get(name)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
 
 
 def process_image_background(image_id: int, filename: str, user_id: int):
@@ -56,33 +226,37 @@ def process_image_background(image_id: int, filename: str, user_id: int):
     # Ensure database is initialized
     db_module.ensure_database_initialized()
     
-    # Check circuit breaker before processing
-    if image_processing_circuit_breaker.is_open(image_id):
-        logger.error(
-            f"⛔ Circuit breaker OPEN for image {image_id}. "
-            f"Too many failures ({image_processing_circuit_breaker.get_failure_count(image_id)}). "
-            "Skipping processing. Use manual retry to reset."
-        )
-        
-        # Update database to reflect permanent failure
-        db = db_module.SessionLocal()
-        try:
-            image = db.query(Image).filter(Image.id == image_id).first()
-            if image:
-                image.processing_status = 'failed'
-                image.thumbnail_status = 'failed'
-                image.variant_status = 'failed'
-                image.processing_error = (
-                    "Processing blocked by circuit breaker due to repeated failures. "
-                    "Use manual retry endpoint to reset."
-                )
-                db.commit()
-        finally:
-            db.close()
-        return
-    
-    db = db_module.SessionLocal()
+    # Keep the image row loaded across the per-stage commits instead of re-SELECTing it
+    db = db_module.SessionLocal(expire_on_commit=False)
+    # Final-state WebSocket events, published once the session is closed
+    pending_events = []
     try:
+        # Check circuit breaker before processing
+        circuit_open, failure_count = image_processing_circuit_breaker.probe(image_id)
+        if circuit_open:
+            logger.error(
+                f"⛔ Circuit breaker OPEN for image {image_id}. "
+                f"Too many failures ({failure_count}). "
+                "Skipping processing. Use manual retry to reset."
+            )
+            
+            # Update database to reflect permanent failure (same session, no row load)
+            db.execute(
+                update(Image)
+                .where(Image.id == image_id)
+                .values(
+                    processing_status='failed',
+                    thumbnail_status='failed',
+                    variant_status='failed',
+                    processing_error=(
+                        "Processing blocked by circuit breaker due to repeated failures. "
+                        "Use manual retry endpoint to reset."
+                    )
+                )
+            )
+            db.commit()
+            return
+        
         logger.info(f"🎬 Starting background processing for image {image_id}")
         
         # Get the image record
@@ -94,19 +268,24 @@ def process_image_background(image_id: int, filename: str, user_id: int):
         # Update status to 'processing'
         image.processing_status = 'processing'
         image.processing_attempts += 1
-        image.last_processing_attempt = datetime.now()
+        image.last_processing_attempt = datetime.utcnow()
         db.commit()
         
-        # Step 1: Generate thumbnails (priority)
+        # Thumbnails and variants read the same original and write independent
+        # files, so generate them concurrently (Pillow releases the GIL while
+        # decoding, resizing and encoding). DB updates stay on this thread.
+        logger.info(f"📸 Generating thumbnails and variants for image {image_id}")
+        stage_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"image-{image_id}")
+        # Outputs that survived a previous partial run are reused on retry
+        thumbnail_future = stage_executor.submit(image_storage_service.process_thumbnails, filename, user_id=user_id, skip_existing=True)
+        variant_future = stage_executor.submit(image_storage_service.process_variants, filename, user_id=user_id, skip_existing=True)
+        stage_executor.shutdown(wait=False)
+        
+        # Step 1: Thumbnails (priority)
+        # Status commits happen once per finished stage (not on every transition);
+        # the thumbnail result is committed before variants so the UI can show it early
         try:
-            logger.info(f"📸 Generating thumbnails for image {image_id}")
-            image.thumbnail_status = 'processing'
-            db.commit()
-            
-            thumbnail_paths = image_storage_service.process_thumbnails(
-                filename,
-                user_id=user_id
-            )
+            thumbnail_paths = thumbnail_future.result()
             
             image.thumbnail_status = 'complete'
             db.commit()
@@ -124,62 +303,50 @@ def process_image_background(image_id: int, filename: str, user_id: int):
             # Notify failure via WebSocket
             notify_thumbnail_failed(image_id, str(e))
         
-        # Step 2: Generate display variants
+        # Step 2: Display variants (committed together with the overall status below)
         try:
-            logger.info(f"🖼️  Generating variants for image {image_id}")
-            image.variant_status = 'processing'
-            db.commit()
-            
-            variant_paths = image_storage_service.process_variants(
-                filename,
-                user_id=user_id
-            )
+            variant_paths = variant_future.result()
             
+            ImageService(db).record_variants(image_id, variant_paths)
             image.variant_status = 'complete'
-            db.commit()
+            variant_error = None
             logger.info(f"✅ Variants complete for image {image_id}: {len(variant_paths)} sizes")
             
-            # Notify via WebSocket
-            notify_variant_complete(image_id, len(variant_paths))
-            
         except Exception as e:
             logger.error(f"❌ Variant generation failed for image {image_id}: {e}", exc_info=True)
             image.variant_status = 'failed'
+            variant_error = str(e)
             if image.processing_error:
                 image.processing_error += f"; Variant generation failed: {str(e)}"
             else:
                 image.processing_error = f"Variant generation failed: {str(e)}"
-            db.commit()
-            
-            # Notify failure via WebSocket
-            notify_variant_failed(image_id, str(e))
         
         # Update overall processing status
-        if image.thumbnail_status == 'complete' and image.variant_status == 'complete':
-            image.processing_status = 'complete'
-            image.processing_completed_at = datetime.now()
-            logger.info(f"🎉 All processing complete for image {image_id}")
-            # Record success in circuit breaker
-            image_processing_circuit_breaker.record_success(image_id)
-            # Notify complete via WebSocket
-            notify_processing_complete(image_id)
-        elif image.thumbnail_status == 'failed' or image.variant_status == 'failed':
+        processing_failed = image.thumbnail_status == 'failed' or image.variant_status == 'failed'
+        if processing_failed:
             image.processing_status = 'failed'
+        else:
+            image.processing_status = 'complete'
+            image.processing_completed_at = datetime.utcnow()
+        
+        db.commit()
+        
+        if variant_error is None:
+            pending_events.append(variant_complete_event(image_id, len(variant_paths)))
+        else:
+            pending_events.append(variant_failed_event(image_id, variant_error))
+        
+        if processing_failed:
             logger.error(f"⚠️  Processing failed for image {image_id}")
             # Record failure in circuit breaker
             image_processing_circuit_breaker.record_failure(image_id)
-            # Notify failure via WebSocket
-            notify_processing_failed(image_id, image.processing_error or "Processing failed")
+            pending_events.append(processing_failed_event(image_id, image.processing_error or "Processing failed"))
         else:
-            image.processing_status = 'complete'  # Partial success
-            image.processing_completed_at = datetime.now()
-            logger.warning(f"⚠️  Processing partially complete for image {image_id}")
-            # Partial success - clear circuit breaker
+            logger.info(f"🎉 All processing complete for image {image_id}")
+            # Record success in circuit breaker
             image_processing_circuit_breaker.record_success(image_id)
-            # Notify complete via WebSocket
-            notify_processing_complete(image_id)
+            pending_events.append(processing_complete_event(image_id))
         
-        db.commit()
         logger.info(f"✅ Background processing finished for image {image_id}")
         
     except Exception as e:
@@ -195,16 +362,88 @@ def process_image_background(image_id: int, filename: str, user_id: int):
                 image.processing_error = f"Background processing error: {str(e)}"
                 db.commit()
                 
-                # Notify failure via WebSocket (with error handling)
-                try:
-                    notify_processing_failed(image_id, str(e), stage="background_task")
-                except Exception as ws_error:
-                    logger.warning(f"Failed to send WebSocket notification: {ws_error}")
+                pending_events = [processing_failed_event(image_id, str(e), stage="background_task")]
                     
         except Exception as commit_error:
             logger.error(f"Failed to update error status: {commit_error}")
     finally:
         db.close()
+    
+    # Notify via WebSocket off the DB path (the final state is already committed)
+    emit_processing_updates_sync(pending_events)
+
+
+def _queue_image_processing(background_tasks: BackgroundTasks, image_id: int, filename: str, user_id: int,
+                             reset_breaker: bool = False) -> bool:
+    """
+    Queue full thumbnail/variant processing for an image.
+    
+    Prefers the Celery worker pool (durable across restarts, scales with
+    worker processes) and falls back to in-process BackgroundTasks when
+    Celery is disabled or the broker is unreachable.
+    
+    Circuit breaker state lives in each process's memory, so reset_breaker
+    clears it in this process and asks the worker to clear its own copy.
+    
+    Returns:
+        True if the job went to Celery, False if it fell back to BackgroundTasks
+    """
+    if os.getenv('USE_CELERY', 'true').lower() == 'true':
+        try:
+            from tasks.image_processing import process_full_image
+            result = process_full_image.delay(image_id, filename, user_id, reset_breaker=reset_breaker)
+            logger.info(f"📋 Image {image_id} queued in Celery: {result.id}")
+            return True
+        except Exception as celery_error:
+            logger.warning(f"⚠️ Celery unavailable for image {image_id}, falling back to BackgroundTasks: {celery_error}", exc_info=True)
+    
+    if reset_breaker:
+        image_processing_circuit_breaker.reset(image_id)
+    background_tasks.add_task(process_image_background, image_id, filename, user_id)
+    logger.info(f"📋 Image {image_id} queued in BackgroundTasks")
+    return False
+
+
+def _queue_image_processing_many(
+    background_tasks: BackgroundTasks,
+    jobs: List[Tuple[int, str]],
+    user_id: int,
+    reset_breaker: bool = False
+) -> bool:
+    """
+    Queue full processing for many (image_id, filename) pairs.
+    
+    Sends a single Celery group (one broker round-trip) when Celery is
+    enabled, otherwise one BackgroundTasks job that runs them across a
+    process pool. reset_breaker clears each image's circuit breaker where
+    the job runs (the pool's workers fork from this process).
+    
+    Returns:
+        True if the jobs went to Celery, False if they fell back to BackgroundTasks
+    """
+    if os.getenv('USE_CELERY', 'true').lower() == 'true':
+        try:
+            from celery import group
+            from tasks.image_processing import process_full_image
+            result = group([
+                process_full_image.s(image_id, filename, user_id, reset_breaker=reset_breaker)
+                for image_id, filename in jobs
+            ]).apply_async()
+            logger.info(f"📋 Queued {len(jobs)} images in Celery group: {result.id}")
+            return True
+        except Exception as celery_error:
+            logger.warning(f"⚠️ Celery unavailable for {len(jobs)} images, falling back to BackgroundTasks: {celery_error}", exc_info=True)
+    
+    if reset_breaker:
+        image_processing_circuit_breaker.reset_many([image_id for image_id, _ in jobs])
+    background_tasks.add_task(_run_processing_batch, list(jobs), user_id)
+    logger.info(f"📋 Queued {len(jobs)} images as one BackgroundTasks batch")
+    return False
+
+
+def get_image_service(db: Session = Depends(get_db)) -> ImageService:
+    """Request-scoped ImageService dependency"""
+    return ImageService(db)
 
 
 @router.post("/upload")
@@ -234,30 +473,28 @@ async def upload_image(
     try:
         csrf_protection.require_csrf_token(request)
         
-        file_content = await file.read()
-        
-        image_metadata = image_storage_service.validate_and_store_original(
-            file_content, 
-            file.filename,
-            user_id=current_user.id
-        )
+        # Check for a duplicate before anything is decoded or written to storage
+        file_hash = image_storage_service.calculate_file_hash(file.file)
         
         image_service = ImageService(db)
-        existing_image = image_service.get_image_by_hash(image_metadata['file_hash'])
+        existing_image = image_service.get_image_by_hash(file_hash)
         
         if existing_image:
-            try:
-                os.remove(image_metadata['storage_path'])
-            except Exception as e:
-                pass
-            
             return {
                 "message": "Duplicate image - already exists in library",
-                "data": existing_image.to_dict(),
+                "data": existing_image.to_summary_dict(),
                 "status_code": 200,
                 "is_duplicate": True
             }
         
+        # Hand the spooled upload stream to storage rather than reading it all into memory
+        image_metadata = image_storage_service.validate_and_store_original(
+            file.file,
+            file.filename,
+            user_id=current_user.id,
+            file_hash=file_hash
+        )
+        
         image = image_service.create_image(
             filename=image_metadata['filename'],
             original_filename=image_metadata['original_filename'],
@@ -274,7 +511,6 @@ async def upload_image(
         # If uploading to a playlist, properly add it and update the sequence
         if playlist_id:
             from services.playlist_service import PlaylistService
-            from services.playlist_variant_service import PlaylistVariantService
             
             playlist_service = PlaylistService(db)
             playlist_service.add_image_to_playlist(playlist_id, image.id)
@@ -290,35 +526,9 @@ async def upload_image(
                 logger.warning(f"Auto playlist variant generation failed (non-fatal): {e}")
                 # Don't fail the upload if variant generation fails
         
-        # Queue background processing via Celery
-        use_celery = os.getenv('USE_CELERY', 'true').lower() == 'true'
-        
-        if use_celery:
-            try:
-                # Use Celery for parallel distributed processing
-                from tasks.image_processing import process_full_image
-                result = process_full_image.delay(image.id, image.filename, current_user.id)
-                logger.info(f"Image {image.id} uploaded successfully, queued in Celery: {result.id}")
-            except Exception as celery_error:
-                logger.warning(f"⚠️ Celery unavailable for image {image.id}, falling back to BackgroundTasks: {celery_error}", exc_info=True)
-                # Fallback to BackgroundTasks if Celery fails
-                background_tasks.add_task(
-                    process_image_background,
-                    image.id,
-                    image.filename,
-                    current_user.id
-                )
-                logger.info(f"Image {image.id} uploaded successfully, queued in BackgroundTasks (fallback)")
-        else:
-            # Use FastAPI BackgroundTasks (slower, sequential)
-            logger.info(f"📋 Queuing BackgroundTask for image {image.id}")
-            background_tasks.add_task(
-                process_image_background,
-                image.id,
-                image.filename,
-                current_user.id
-            )
-            logger.info(f"Image {image.id} uploaded successfully, queued in BackgroundTasks")
+        # Queue background processing (Celery, falling back to BackgroundTasks)
+        _queue_image_processing(background_tasks, image.id, image.filename, current_user.id)
+        logger.info(f"Image {image.id} uploaded successfully")
         
         return {
             "message": "Image uploaded successfully",
@@ -362,7 +572,7 @@ async def check_duplicate_image(
         if existing_image:
             return {
                 "is_duplicate": True,
-                "existing_image": existing_image.to_dict(),
+                "existing_image": existing_image.to_summary_dict(),
                 "message": "Image already exists"
             }
         else:
@@ -381,24 +591,44 @@ async def check_duplicate_image(
 @router.post("/check-duplicates-batch")
 async def check_duplicates_batch(
     request_data: BatchDuplicateCheckRequest,
+    hashes_only: bool = False,
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
-    """Check multiple images for duplicates in a single request"""
+    """
+    Check multiple images for duplicates in a single request.
+    
+    With hashes_only=true, duplicates report just the existing image id
+    instead of the full serialized image.
+    """
     try:
         image_service = ImageService(db)
         results = {}
         
-        # Get all existing images with the provided hashes in one query
-        existing_images = db.query(Image).filter(Image.file_hash.in_(request_data.file_hashes)).all()
-        existing_hashes = {img.file_hash: img for img in existing_images}
+        # Dedupe the hashes and look them up in IN-list chunks
+        unique_hashes = sorted(set(request_data.file_hashes))
+        existing_hashes = {}
+        for start in range(0, len(unique_hashes), DUPLICATE_HASH_CHUNK_SIZE):
+            chunk = unique_hashes[start:start + DUPLICATE_HASH_CHUNK_SIZE]
+            if hashes_only:
+                rows = db.query(Image.file_hash, Image.id).filter(Image.file_hash.in_(chunk)).all()
+                existing_hashes.update({file_hash: image_id for file_hash, image_id in rows})
+            else:
+                images = image_service.get_images_by_hashes(chunk)
+                existing_hashes.update({img.file_hash: img for img in images})
         
         # Check each hash
         for file_hash in request_data.file_hashes:
             if file_hash in existing_hashes:
+                if hashes_only:
+                    results[file_hash] = {
+                        "is_duplicate": True,
+                        "id": existing_hashes[file_hash]
+                    }
+                    continue
                 results[file_hash] = {
                     "is_duplicate": True,
-                    "existing_image": existing_hashes[file_hash].to_dict(),
+                    "existing_image": existing_hashes[file_hash].to_summary_dict(),
                     "message": "Image already exists"
                 }
             else:
@@ -449,9 +679,9 @@ async def get_processing_status(
             "variant_status": image.variant_status,
             "processing_error": image.processing_error,
             "processing_attempts": image.processing_attempts,
-            "last_processing_attempt": image.last_processing_attempt.isoformat() if image.last_processing_attempt else None,
-            "processing_completed_at": image.processing_completed_at.isoformat() if image.processing_completed_at else None,
-            "uploaded_at": image.uploaded_at.isoformat() if image.uploaded_at else None
+            "last_processing_attempt": image.last_processing_attempt,
+            "processing_completed_at": image.processing_completed_at,
+            "uploaded_at": image.uploaded_at
         }
         
     except HTTPException:
@@ -490,10 +720,6 @@ async def retry_processing(
                 detail="Image not found"
             )
         
-        # Reset circuit breaker to allow retry
-        image_processing_circuit_breaker.reset(image_id)
-        logger.info(f"Circuit breaker reset for image {image_id}")
-        
         # Reset processing status fields
         image.processing_status = 'pending'
         image.thumbnail_status = 'pending'
@@ -501,13 +727,9 @@ async def retry_processing(
         image.processing_error = None
         db.commit()
         
-        # Queue background processing
-        background_tasks.add_task(
-            process_image_background,
-            image.id,
-            image.filename,
-            current_user.id
-        )
+        # Queue background processing, resetting the circuit breaker wherever the job runs
+        _queue_image_processing(background_tasks, image.id, image.filename, current_user.id, reset_breaker=True)
+        logger.info(f"Circuit breaker reset requested for image {image_id}")
         
         logger.info(f"Manual retry queued for image {image_id}")
         
@@ -543,38 +765,37 @@ async def retry_all_failed_processing(
         # CSRF protection
         csrf_protection.require_csrf_token(request)
         
-        # Get all failed images
-        failed_images = db.query(Image).filter(Image.processing_status == 'failed').all()
+        # Get all failed images (only the columns needed to queue them)
+        failed_jobs = db.query(Image.id, Image.filename)\
+            .filter(Image.processing_status == 'failed')\
+            .all()
         
-        if not failed_images:
+        if not failed_jobs:
             return {
                 "message": "No failed jobs to retry",
                 "retry_count": 0
             }
         
-        retry_count = 0
-        for image in failed_images:
-            # Reset circuit breaker
-            image_processing_circuit_breaker.reset(image.id)
-            
-            # Reset processing status
-            image.processing_status = 'pending'
-            image.thumbnail_status = 'pending'
-            image.variant_status = 'pending'
-            image.processing_error = None
-            
-            # Queue background processing
-            background_tasks.add_task(
-                process_image_background,
-                image.id,
-                image.filename,
-                current_user.id
+        failed_ids = [image_id for image_id, _ in failed_jobs]
+        retry_count = len(failed_ids)
+        
+        # Reset processing status in one statement; commit before queueing so
+        # workers never see stale 'failed' rows
+        db.execute(
+            update(Image)
+            .where(Image.id.in_(failed_ids))
+            .values(
+                processing_status='pending',
+                thumbnail_status='pending',
+                variant_status='pending',
+                processing_error=None
             )
-            
-            retry_count += 1
-        
+        )
         db.commit()
         
+        # Breakers are reset by whichever process runs the jobs
+        _queue_image_processing_many(background_tasks, failed_jobs, current_user.id, reset_breaker=True)
+        
         logger.info(f"Batch retry: queued {retry_count} failed images for processing")
         
         return {
@@ -608,49 +829,64 @@ async def get_processing_queue_status(
         # Check if user is admin (optional - can add role check here)
         # For now, any authenticated user can access
         
-        # Get processing statistics
+        # Get processing statistics and the oldest pending upload in one pass
+        # (MySQL has no COUNT(*) FILTER, so each count is a SUM over a CASE)
         logger.debug("Counting processing statuses...")
-        pending_count = db.query(Image).filter(Image.processing_status == 'pending').count()
-        processing_count = db.query(Image).filter(Image.processing_status == 'processing').count()
-        failed_count = db.query(Image).filter(Image.processing_status == 'failed').count()
-        complete_count = db.query(Image).filter(Image.processing_status == 'complete').count()
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+        
+        stats = db.query(
+            count_where(Image.processing_status == 'pending').label('pending'),
+            count_where(Image.processing_status == 'processing').label('processing'),
+            count_where(Image.processing_status == 'failed').label('failed'),
+            count_where(Image.processing_status == 'complete').label('complete'),
+            count_where(Image.thumbnail_status == 'pending').label('thumbnail_pending'),
+            count_where(Image.thumbnail_status == 'processing').label('thumbnail_processing'),
+            count_where(Image.thumbnail_status == 'failed').label('thumbnail_failed'),
+            count_where(Image.variant_status == 'pending').label('variant_pending'),
+            count_where(Image.variant_status == 'processing').label('variant_processing'),
+            count_where(Image.variant_status == 'failed').label('variant_failed'),
+            func.min(case((Image.processing_status == 'pending', Image.uploaded_at))).label('oldest_pending_uploaded_at'),
+        ).one()
+        
+        pending_count = int(stats.pending)
+        processing_count = int(stats.processing)
+        failed_count = int(stats.failed)
+        complete_count = int(stats.complete)
         logger.debug(f"Counts: pending={pending_count}, processing={processing_count}, failed={failed_count}, complete={complete_count}")
         
-        # Get counts by individual status types
-        thumbnail_pending = db.query(Image).filter(Image.thumbnail_status == 'pending').count()
-        thumbnail_processing = db.query(Image).filter(Image.thumbnail_status == 'processing').count()
-        thumbnail_failed = db.query(Image).filter(Image.thumbnail_status == 'failed').count()
-        
-        variant_pending = db.query(Image).filter(Image.variant_status == 'pending').count()
-        variant_processing = db.query(Image).filter(Image.variant_status == 'processing').count()
-        variant_failed = db.query(Image).filter(Image.variant_status == 'failed').count()
-        
-        # Get recent jobs (last 20 non-complete jobs)
-        # Note: MySQL doesn't support NULLS LAST, so we use COALESCE to handle nulls
-        from sqlalchemy import func, case
-        recent_jobs = db.query(Image)\
-            .filter(Image.processing_status.in_(['pending', 'processing', 'failed']))\
+        # Get recent jobs (last 20 non-complete jobs), loading only the columns
+        # the response uses (skips the exif/dominant_colors JSON blobs)
+        # Note: MySQL doesn't support NULLS LAST, so we sort on a CASE to put nulls last
+        recent_jobs = db.execute(
+            select(
+                Image.id,
+                Image.original_filename,
+                Image.processing_status,
+                Image.thumbnail_status,
+                Image.variant_status,
+                Image.processing_attempts,
+                Image.processing_error,
+                Image.uploaded_at,
+                Image.last_processing_attempt,
+                Image.processing_completed_at
+            )
+            .where(Image.processing_status.in_(['pending', 'processing', 'failed']))
             .order_by(
                 case(
                     (Image.last_processing_attempt.is_(None), 1),
                     else_=0
                 ),
                 Image.last_processing_attempt.desc()
-            )\
-            .limit(20)\
-            .all()
+            )
+            .limit(20)
+        ).all()
         
         # Calculate oldest pending job age
-        oldest_pending = db.query(Image)\
-            .filter(Image.processing_status == 'pending')\
-            .order_by(Image.uploaded_at.asc())\
-            .first()
-        
         oldest_job_age_seconds = None
-        if oldest_pending and oldest_pending.uploaded_at:
-            from datetime import timezone
+        if stats.oldest_pending_uploaded_at:
             now = datetime.now(timezone.utc)
-            uploaded = oldest_pending.uploaded_at
+            uploaded = stats.oldest_pending_uploaded_at
             # Handle both timezone-aware and naive datetimes
             if uploaded.tzinfo is None:
                 uploaded = uploaded.replace(tzinfo=timezone.utc)
@@ -664,14 +900,14 @@ async def get_processing_queue_status(
             "complete_count": complete_count,
             "oldest_job_age_seconds": oldest_job_age_seconds,
             "thumbnail_stats": {
-                "pending": thumbnail_pending,
-                "processing": thumbnail_processing,
-                "failed": thumbnail_failed
+                "pending": int(stats.thumbnail_pending),
+                "processing": int(stats.thumbnail_processing),
+                "failed": int(stats.thumbnail_failed)
             },
             "variant_stats": {
-                "pending": variant_pending,
-                "processing": variant_processing,
-                "failed": variant_failed
+                "pending": int(stats.variant_pending),
+                "processing": int(stats.variant_processing),
+                "failed": int(stats.variant_failed)
             },
             "jobs": [
                 {
@@ -682,9 +918,9 @@ async def get_processing_queue_status(
                     "variant_status": job.variant_status,
                     "attempts": job.processing_attempts,
                     "error": job.processing_error,
-                    "uploaded_at": job.uploaded_at.isoformat() if job.uploaded_at else None,
-                    "last_attempt": job.last_processing_attempt.isoformat() if job.last_processing_attempt else None,
-                    "completed_at": job.processing_completed_at.isoformat() if job.processing_completed_at else None
+                    "uploaded_at": job.uploaded_at,
+                    "last_attempt": job.last_processing_attempt,
+                    "completed_at": job.processing_completed_at
                 }
                 for job in recent_jobs
             ]
@@ -697,15 +933,41 @@ async def get_processing_queue_status(
             detail="Failed to retrieve queue status"
         )
 
+def _list_images(
+    image_service: ImageService,
+    album_id: Optional[int],
+    playlist_id: Optional[int],
+    limit: Optional[int],
+    offset: int
+) -> dict:
+    """
+    Shared body of the / and /public list endpoints.
+    
+    The unfiltered listing is always paginated (default 100). Album and
+    playlist listings are paginated when the client passes limit, and
+    return the whole album/playlist otherwise (display clients rely on it).
+    """
+    if album_id or playlist_id:
+        images = image_service.get_image_dicts(album_id=album_id, playlist_id=playlist_id, limit=limit, offset=offset)
+    else:
+        images = image_service.get_image_dicts(limit=limit or DEFAULT_IMAGE_PAGE_SIZE, offset=offset)
+    
+    return {
+        "message": "Images retrieved successfully",
+        "data": images,
+        "status_code": 200
+    }
+
 # Public endpoint for display devices (must be before / route)
 @router.get("/public")
 async def get_images_public(
     request: Request,
     album_id: Optional[int] = None,
     playlist_id: Optional[int] = None,
-    limit: int = 100,
+    limit: Optional[int] = None,
     offset: int = 0,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    image_service: ImageService = Depends(get_image_service)
 ):
     """Get images with optional filtering (public endpoint for display devices)"""
     try:
@@ -726,21 +988,7 @@ async def get_images_public(
         if device.status != DeviceStatus.AUTHORIZED:
             raise HTTPException(status_code=403, detail="Display device not authorized")
         
-        # Get images
-        image_service = ImageService(db)
-        
-        if album_id:
-            images = image_service.get_images_by_album(album_id)
-        elif playlist_id:
-            images = image_service.get_images_by_playlist(playlist_id)
-        else:
-            images = image_service.get_all_images(limit, offset)
-        
-        return {
-            "message": "Images retrieved successfully",
-            "data": [image.to_dict() for image in images],
-            "status_code": 200
-        }
+        return _list_images(image_service, album_id, playlist_id, limit, offset)
         
     except HTTPException:
         raise
@@ -755,27 +1003,14 @@ async def get_images_public(
 async def get_images(
     album_id: Optional[int] = None,
     playlist_id: Optional[int] = None,
-    limit: int = 100,
+    limit: Optional[int] = None,
     offset: int = 0,
     current_user: User = Depends(require_auth),
-    db: Session = Depends(get_db)
+    image_service: ImageService = Depends(get_image_service)
 ):
     """Get images with optional filtering"""
     try:
-        image_service = ImageService(db)
-        
-        if album_id:
-            images = image_service.get_images_by_album(album_id)
-        elif playlist_id:
-            images = image_service.get_images_by_playlist(playlist_id)
-        else:
-            images = image_service.get_all_images(limit, offset)
-        
-        return {
-            "message": "Images retrieved successfully",
-            "data": [image.to_dict() for image in images],
-            "status_code": 200
-        }
+        return _list_images(image_service, album_id, playlist_id, limit, offset)
         
     except Exception as e:
         logger.error(f"Get images error: {e}")
@@ -788,11 +1023,10 @@ async def get_images(
 async def get_image(
     image_id: int,
     current_user: User = Depends(require_auth),
-    db: Session = Depends(get_db)
+    image_service: ImageService = Depends(get_image_service)
 ):
     """Get a specific image by ID"""
     try:
-        image_service = ImageService(db)
         image = image_service.get_image_by_id(image_id)
         
         if not image:
@@ -834,7 +1068,6 @@ async def get_image_resolutions(
             )
         
         # Get available resolution variants
-        from services.image_storage_service import image_storage_service
         available_resolutions = image_storage_service.get_available_resolutions(image.filename)
         
         return {
@@ -896,6 +1129,9 @@ async def regenerate_image_resolutions(
         
         db.commit()
         
+        # Resolve the configured sizes once for the whole run instead of once per image
+        display_sizes = image_storage_service._load_display_sizes()
+        
         # Queue tasks using Celery or fallback
         queued_count = 0
         if use_celery:
@@ -904,21 +1140,20 @@ async def regenerate_image_resolutions(
                 for image in images:
                     process_variants.apply_async(
                         args=[image.id, image.filename, 1],
+                        kwargs={'display_sizes': display_sizes},
                         queue='low_priority'  # Bulk regeneration is low priority
                     )
                     queued_count += 1
                 logger.info(f"✅ Queued {queued_count} images in Celery (low priority queue)")
             except Exception as celery_error:
                 logger.warning(f"Celery unavailable, falling back to BackgroundTasks: {celery_error}")
-                # Fallback to old method
-                for image in images:
-                    background_tasks.add_task(_process_variants_for_image, image.id, image.filename, 1)
-                    queued_count += 1
+                # Fallback: one background job that fans the images out across processes
+                background_tasks.add_task(_run_variants_batch, [(image.id, image.filename) for image in images], display_sizes)
+                queued_count = len(images)
                 logger.info(f"✅ Queued {queued_count} images in BackgroundTasks (fallback)")
         else:
-            for image in images:
-                background_tasks.add_task(_process_variants_for_image, image.id, image.filename, 1)
-                queued_count += 1
+            background_tasks.add_task(_run_variants_batch, [(image.id, image.filename) for image in images], display_sizes)
+            queued_count = len(images)
             logger.info(f"✅ Queued {queued_count} images in BackgroundTasks")
         
         return {
@@ -940,14 +1175,14 @@ async def regenerate_image_resolutions(
             detail=f"Failed to queue variant regeneration: {str(e)}"
         )
 
-def _process_variants_for_image(image_id: int, filename: str, user_id: int):
+def _process_variants_for_image(image_id: int, filename: str, user_id: int, display_sizes: Optional[List[Tuple[int, int]]] = None):
     """
     Process display variants for a single image using the queue system.
     Called by variant regeneration to use the same pipeline as uploads.
     """
     from models import database as db_module
     db_module.ensure_database_initialized()
-    db = db_module.SessionLocal()
+    db = db_module.SessionLocal(expire_on_commit=False)
     
     try:
         logger.info(f"🔄 Processing variants for image {image_id}: {filename}")
@@ -961,28 +1196,30 @@ def _process_variants_for_image(image_id: int, filename: str, user_id: int):
         image.variant_status = 'processing'
         image.processing_status = 'processing'
         image.processing_attempts += 1
-        image.last_processing_attempt = datetime.now()
+        image.last_processing_attempt = datetime.utcnow()
         db.commit()
         
         # Check circuit breaker
-        if image_processing_circuit_breaker.is_open(image_id):
+        circuit_open, failure_count = image_processing_circuit_breaker.probe(image_id)
+        if circuit_open:
             logger.warning(f"⚠️ Circuit breaker OPEN for image {image_id} - skipping")
             image.variant_status = 'failed'
             image.processing_status = 'failed'
-            image.processing_error = f"Circuit breaker open after {image_processing_circuit_breaker.get_failure_count(image_id)} failures"
+            image.processing_error = f"Circuit breaker open after {failure_count} failures"
             db.commit()
             return
         
         try:
             # Process variants using the storage service
-            image_storage_service.process_variants(filename, user_id)
+            variant_paths = image_storage_service.process_variants(filename, user_id, display_sizes=display_sizes)
+            ImageService(db).record_variants(image_id, variant_paths)
             
             # Update status to complete
             image.variant_status = 'complete'
             # If thumbnails are also complete, mark overall as complete
             if image.thumbnail_status == 'complete':
                 image.processing_status = 'complete'
-                image.processing_completed_at = datetime.now()
+                image.processing_completed_at = datetime.utcnow()
             image.processing_error = None
             db.commit()
             
@@ -1007,27 +1244,60 @@ def _process_variants_for_image(image_id: int, filename: str, user_id: int):
     finally:
         db.close()
 
+def _run_pooled(label: str, fn: Callable, jobs: List[Tuple[int, str]], *extra, user_id: int = 1):
+    """
+    Run fn(image_id, filename, user_id, *extra) for (image_id, filename) jobs across a process pool.
+    
+    Used when Celery is unavailable: a single background task instead of one per
+    image, which BackgroundTasks would run strictly one by one, so the work uses
+    every core. `label` names the work in log lines ("variant regeneration").
+    """
+    if not jobs:
+        return
+    workers = max(1, min(os.cpu_count() or 1, len(jobs)))
+    image_ids, filenames = zip(*jobs)
+    
+    logger.info(f"🔄 Running {label} for {len(jobs)} images across {workers} processes")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_db_worker) as executor:
+            # Each call owns its session and status updates; drain to surface pool errors
+            for _ in executor.map(fn, image_ids, filenames, repeat(user_id), *(repeat(arg) for arg in extra)):
+                pass
+        logger.info(f"✅ {label.capitalize()} finished for {len(jobs)} images")
+    except Exception as e:
+        logger.error(f"❌ {label.capitalize()} batch failed: {e}", exc_info=True)
+
+def _run_variants_batch(jobs: List[Tuple[int, str]], display_sizes: Optional[List[Tuple[int, int]]] = None):
+    """Regenerate variants for (image_id, filename) jobs across a process pool"""
+    _run_pooled("variant regeneration", _process_variants_for_image, jobs, display_sizes)
+
+def _run_processing_batch(jobs: List[Tuple[int, str]], user_id: int):
+    """Fully process (image_id, filename) jobs across a process pool"""
+    _run_pooled("image processing", process_image_background, jobs, user_id=user_id)
+
 def _cleanup_scaled_images():
     """Clean up existing scaled images directory"""
     try:
-        from pathlib import Path
-        from services.image_storage_service import image_storage_service
-        
         scaled_dir = image_storage_service.upload_path / "scaled"
         if scaled_dir.exists():
-            # Count existing files
-            existing_files = list(scaled_dir.glob("*"))
+            # Count existing files (names only - no Path per entry)
+            with os.scandir(scaled_dir) as entries:
+                existing_files = [entry.name for entry in entries if not entry.is_dir(follow_symlinks=False)]
             file_count = len(existing_files)
             
             if file_count > 0:
                 logger.info(f"🗑️ Removing {file_count} existing scaled images...")
                 
-                # Remove all files in scaled directory
-                for file_path in existing_files:
-                    try:
-                        file_path.unlink()
-                    except Exception as e:
-                        logger.warning(f"Failed to delete {file_path}: {e}")
+                # Remove all files relative to one directory fd (unlinkat, no per-file path walk)
+                dir_fd = os.open(scaled_dir, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    for name in existing_files:
+                        try:
+                            os.unlink(name, dir_fd=dir_fd)
+                        except Exception as e:
+                            logger.warning(f"Failed to delete {scaled_dir / name}: {e}")
+                finally:
+                    os.close(dir_fd)
                 
                 logger.info(f"✅ Cleaned up {file_count} scaled images")
             else:
@@ -1085,14 +1355,12 @@ async def regenerate_thumbnails(
                 logger.info(f"✅ Queued {queued_count} images in Celery (low priority queue)")
             except Exception as celery_error:
                 logger.warning(f"Celery unavailable, falling back to BackgroundTasks: {celery_error}")
-                for image in images:
-                    background_tasks.add_task(_process_thumbnails_for_image, image.id, image.filename, 1)
-                    queued_count += 1
+                background_tasks.add_task(_run_thumbnails_batch, [(image.id, image.filename) for image in images])
+                queued_count = len(images)
                 logger.info(f"✅ Queued {queued_count} images in BackgroundTasks (fallback)")
         else:
-            for image in images:
-                background_tasks.add_task(_process_thumbnails_for_image, image.id, image.filename, 1)
-                queued_count += 1
+            background_tasks.add_task(_run_thumbnails_batch, [(image.id, image.filename) for image in images])
+            queued_count = len(images)
             logger.info(f"✅ Queued {queued_count} images in BackgroundTasks")
         
         return {
@@ -1114,6 +1382,10 @@ async def regenerate_thumbnails(
             detail=f"Failed to queue thumbnail regeneration: {str(e)}"
         )
 
+def _run_thumbnails_batch(jobs: List[Tuple[int, str]]):
+    """Regenerate thumbnails for (image_id, filename) jobs across a process pool"""
+    _run_pooled("thumbnail regeneration", _process_thumbnails_for_image, jobs)
+
 def _process_thumbnails_for_image(image_id: int, filename: str, user_id: int):
     """
     Process thumbnails for a single image using the queue system.
@@ -1121,7 +1393,7 @@ def _process_thumbnails_for_image(image_id: int, filename: str, user_id: int):
     """
     from models import database as db_module
     db_module.ensure_database_initialized()
-    db = db_module.SessionLocal()
+    db = db_module.SessionLocal(expire_on_commit=False)
     
     try:
         logger.info(f"🔄 Processing thumbnails for image {image_id}: {filename}")
@@ -1135,15 +1407,16 @@ def _process_thumbnails_for_image(image_id: int, filename: str, user_id: int):
         image.thumbnail_status = 'processing'
         image.processing_status = 'processing'
         image.processing_attempts += 1
-        image.last_processing_attempt = datetime.now()
+        image.last_processing_attempt = datetime.utcnow()
         db.commit()
         
         # Check circuit breaker
-        if image_processing_circuit_breaker.is_open(image_id):
+        circuit_open, failure_count = image_processing_circuit_breaker.probe(image_id)
+        if circuit_open:
             logger.warning(f"⚠️ Circuit breaker OPEN for image {image_id} - skipping")
             image.thumbnail_status = 'failed'
             image.processing_status = 'failed'
-            image.processing_error = f"Circuit breaker open after {image_processing_circuit_breaker.get_failure_count(image_id)} failures"
+            image.processing_error = f"Circuit breaker open after {failure_count} failures"
             db.commit()
             return
         
@@ -1156,7 +1429,7 @@ def _process_thumbnails_for_image(image_id: int, filename: str, user_id: int):
             # If variants are also complete, mark overall as complete
             if image.variant_status == 'complete':
                 image.processing_status = 'complete'
-                image.processing_completed_at = datetime.now()
+                image.processing_completed_at = datetime.utcnow()
             image.processing_error = None
             db.commit()
             
@@ -1197,56 +1470,40 @@ async def get_scaled_versions(
                 detail="Image not found"
             )
         
-        # Get the base filename without extension
-        base_filename = Path(image.filename).stem
-        
-        # Check for scaled versions in the upload directory
-        scaled_versions = []
-        upload_path = Path(image_storage_service.upload_path)
+        # Variants recorded at generation time answer this with one indexed query
+        variants = image_service.get_image_variants(image_id)
+        if variants:
+            return {
+                "image_id": image_id,
+                "original_filename": image.filename,
+                "scaled_versions": [
+                    {
+                        "dimensions": f"{variant.width}x{variant.height}",
+                        "width": variant.width,
+                        "height": variant.height,
+                        "filename": Path(variant.path).name
+                    }
+                    for variant in variants
+                ]
+            }
         
-        # Look through year/month subdirectories
-        for year_dir in upload_path.iterdir():
-            if year_dir.is_dir():
-                for month_dir in year_dir.iterdir():
-                    if month_dir.is_dir():
-                        for user_dir in month_dir.iterdir():
-                            if user_dir.is_dir():
-                                # Look for scaled versions
-                                for file_path in user_dir.glob(f"{base_filename}_*x*.jpg"):
-                                    if file_path.name != image.filename:
-                                        # Extract dimensions from filename
-                                        filename_without_ext = file_path.stem
-                                        if '_' in filename_without_ext:
-                                            size_part = filename_without_ext.split('_')[-1]
-                                            if 'x' in size_part:
-                                                try:
-                                                    width, height = map(int, size_part.split('x'))
-                                                    scaled_versions.append({
-                                                        "dimensions": f"{width}x{height}",
-                                                        "width": width,
-                                                        "height": height,
-                                                        "filename": file_path.name
-                                                    })
-                                                except ValueError:
-                                                    continue
-                        else:
-                            # Also check in month directory (no user subdirectory)
-                            for file_path in month_dir.glob(f"{base_filename}_*x*.jpg"):
-                                if file_path.name != image.filename:
-                                    filename_without_ext = file_path.stem
-                                    if '_' in filename_without_ext:
-                                        size_part = filename_without_ext.split('_')[-1]
-                                        if 'x' in size_part:
-                                            try:
-                                                width, height = map(int, size_part.split('x'))
-                                                scaled_versions.append({
-                                                    "dimensions": f"{width}x{height}",
-                                                    "width": width,
-                                                    "height": height,
-                                                    "filename": file_path.name
-                                                })
-                                            except ValueError:
-                                                continue
+        # Images processed before variants were recorded: check the month directories
+        # written since the upload
+        variant_names = (
+            file_path.name
+            for file_path in image_storage_service.find_scaled_variant_paths(image.filename, since=image.uploaded_at)
+        )
+        # Extract dimensions from filename; names without a WxH suffix don't match
+        scaled_versions = [
+            {
+                "dimensions": f"{match[1]}x{match[2]}",
+                "width": int(match[1]),
+                "height": int(match[2]),
+                "filename": match.string
+            }
+            for match in map(SCALED_DIMENSIONS_RE.search, variant_names)
+            if match
+        ]
         
         return {
             "image_id": image_id,
@@ -1263,16 +1520,100 @@ async def get_scaled_versions(
             detail="Failed to get scaled versions"
         )
 
+def _not_modified(request: Optional[Request], image: _ServedImage, etag: str, headers: dict) -> Optional[Response]:
+    """
+    A bodyless 304 if the client's cached copy is still current, else None.
+    
+    Checked before any filesystem work, so revalidations never locate, stat or
+    open the file. If-None-Match takes precedence over If-Modified-Since.
+    """
+    if request is None:
+        return None
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag not in tags and "*" not in tags:
+            return None
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if not if_modified_since:
+            return None
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.replace(tzinfo=None) < image.last_modified:
+            return None
+    
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+def _image_file_response(image: _ServedImage, size: str = "original", request: Optional[Request] = None):
+    """Build the cached file response (or a 304) for an already-loaded image (original or thumbnail)"""
+    # Cache original images for 1 year (they don't change), thumbnails for 30 days
+    if size == "original":
+        cache_control, cache_days = "public, max-age=31536000, immutable", 365
+    else:
+        cache_control, cache_days = "public, max-age=2592000", 30
+    etag = f'"{image.etag_base}_{size}"'
+    
+    not_modified = _not_modified(request, image, etag, {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept"})
+    if not_modified:
+        return not_modified
+    
+    # Get file path
+    if size == "original":
+        file_path = _cached_file_path(image.id, size, lambda: image_storage_service.get_image_path(image.filename))
+    else:
+        file_path = _cached_file_path(image.id, size, lambda: image_storage_service.get_thumbnail_path(image.filename, size))
+    
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image file not found"
+        )
+    
+    return _build_file_response(image, file_path, etag, cache_control, cache_days)
+
+def _build_file_response(
+    image: _ServedImage,
+    file_path: Path,
+    etag: str,
+    cache_control: str,
+    cache_days: int,
+    extra_headers: Optional[dict] = None
+) -> SendfileResponse:
+    """Wrap an already-resolved file in the standard image headers"""
+    headers = {
+        **BASE_HEADERS,
+        "Cache-Control": cache_control,
+        "Expires": _expires_header(cache_days),
+        "ETag": etag,
+        "Last-Modified": image.last_modified_http,
+        # Ensure inline display in browsers
+        "Content-Disposition": image.content_disposition,
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    
+    # MPO is already normalized to JPEG when the snapshot is built
+    return SendfileResponse(
+        path=str(file_path),
+        media_type=image.media_type,
+        filename=image.original_filename,
+        headers=headers
+    )
+
 @router.get("/{image_id}/file")
 async def get_image_file(
     image_id: int,
+    request: Request,
     size: str = "original",
     db: Session = Depends(get_db)
 ):
     """Get the actual image file"""
     try:
-        image_service = ImageService(db)
-        image = image_service.get_image_by_id(image_id)
+        image = _get_served_image(db, image_id)
         
         if not image:
             raise HTTPException(
@@ -1280,57 +1621,7 @@ async def get_image_file(
                 detail="Image not found"
             )
         
-        # Get file path
-        if size == "original":
-            file_path = image_storage_service.get_image_path(image.filename)
-        else:
-            file_path = image_storage_service.get_thumbnail_path(image.filename, size)
-        
-        if not file_path or not file_path.exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Image file not found"
-            )
-        
-        # Set up enhanced caching headers for home network
-        headers = {}
-        
-        # Cache original images for 1 year (they don't change)
-        if size == "original":
-            headers["Cache-Control"] = "public, max-age=31536000, immutable"
-            headers["Expires"] = (datetime.utcnow() + timedelta(days=365)).strftime("%a, %d %b %Y %H:%M:%S GMT")
-        else:
-            # Cache thumbnails for 30 days
-            headers["Cache-Control"] = "public, max-age=2592000"
-            headers["Expires"] = (datetime.utcnow() + timedelta(days=30)).strftime("%a, %d %b %Y %H:%M:%S GMT")
-        
-        # Add ETag for better caching
-        headers["ETag"] = f'"{image.filename}_{size}_{image.uploaded_at.timestamp()}"'
-        
-        # Add Last-Modified header
-        headers["Last-Modified"] = image.uploaded_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
-        
-        # Add home network specific headers
-        headers["X-Content-Type-Options"] = "nosniff"
-        headers["X-Frame-Options"] = "SAMEORIGIN"
-        headers["X-Cache"] = "HIT"  # Indicate this is served from cache
-        
-        # Add Vary header for format negotiation
-        headers["Vary"] = "Accept"
-        
-        # Ensure inline display in browsers
-        headers["Content-Disposition"] = f'inline; filename="{image.original_filename}"'
-        
-        # Normalize MPO content-type to JPEG to avoid breaking clients
-        media_type = (image.mime_type or "image/jpeg")
-        if media_type.lower() == "image/mpo":
-            media_type = "image/jpeg"
-        return FileResponse(
-            path=str(file_path),
-            media_type=media_type,
-            filename=image.original_filename,
-            headers=headers
-        )
+        return _image_file_response(image, size, request)
         
     except HTTPException:
         raise
@@ -1348,9 +1639,9 @@ async def get_image_smart(
     db: Session = Depends(get_db)
 ):
     """Get image with smart resolution matching based on display device"""
+    image = None
     try:
-        image_service = ImageService(db)
-        image = image_service.get_image_by_id(image_id)
+        image = _get_served_image(db, image_id)
         
         if not image:
             raise HTTPException(
@@ -1367,46 +1658,53 @@ async def get_image_smart(
         if not device_token:
             # No device token provided, serve original image
             logger.info(f"No device token provided for image {image_id}, serving original")
-            return await get_image_file(image_id, "original", db)
+            return _image_file_response(image, request=request)
         
         # Get device information
-        from services.display_device_service import DisplayDeviceService
-        device_service = DisplayDeviceService(db)
-        device = device_service.get_device_by_token(device_token)
+        geometry = _get_device_geometry(db, device_token)
         
-        if not device:
+        if not geometry:
             logger.warning(f"Device token {device_token[:8]}... not found, serving original")
-            return await get_image_file(image_id, "original", db)
-        
-        # Get device resolution
-        display_width = device.screen_width or 1920
-        display_height = device.screen_height or 1080
-        device_pixel_ratio = float(device.device_pixel_ratio or "1.0")
-        
-        # Calculate effective resolution
-        effective_width = int(display_width * device_pixel_ratio)
-        effective_height = int(display_height * device_pixel_ratio)
+            return _image_file_response(image, request=request)
+        
+        # Get device resolution; DPR / Viewport-Width Client Hints only fill in
+        # values the device has not registered (height keeps the aspect ratio)
+        screen_width, screen_height, registered_dpr = geometry
+        display_width = screen_width or 1920
+        display_height = screen_height or 1080
+        if registered_dpr:
+            device_pixel_ratio = float(registered_dpr)
+        else:
+            device_pixel_ratio = _client_hint(request, "DPR") or 1.0
+        
+        if not screen_width:
+            viewport_width = _client_hint(request, "Viewport-Width")
+            if viewport_width:
+                if not screen_height:
+                    display_height = int(display_height * viewport_width / display_width)
+                display_width = int(viewport_width)
+        
+        # Snap to buckets so responses are shared across similar devices
+        display_width, display_height, device_pixel_ratio = bucket_device_geometry(
+            display_width, display_height, device_pixel_ratio
+        )
         
         # Find the best matching playlist variant for this device
-        from services.playlist_variant_service import PlaylistVariantService
         variant_service = PlaylistVariantService(db)
         
         # Get the playlist this image belongs to
-        playlist = db.query(Playlist).filter(Playlist.id == image.playlist_id).first()
-        if not playlist:
+        if not image.playlist_id:
             logger.warning(f"Image {image_id} has no associated playlist, serving original")
-            return await get_image_file(image_id, "original", db)
+            return _image_file_response(image, request=request)
         
-        # Get the best variant for this device
+        # Get the best variant for this device (none if the playlist is gone)
         best_variant = variant_service.get_best_variant_for_device(
-            playlist.id, display_width, display_height, device_pixel_ratio
+            image.playlist_id, display_width, display_height, device_pixel_ratio
         )
         
-        from models.playlist_variant import PlaylistVariantType
-        
         if not best_variant or best_variant.variant_type == PlaylistVariantType.ORIGINAL:
             logger.info(f"No suitable variant found for device {device_token[:8]}..., serving original")
-            return await get_image_file(image_id, "original", db)
+            return _image_file_response(image, request=request)
         
         # Look for the pre-scaled image for this resolution
         target_width = best_variant.target_width
@@ -1414,51 +1712,55 @@ async def get_image_smart(
         
         if not target_width or not target_height:
             logger.warning(f"Variant {best_variant.variant_type.value} has no target resolution, serving original")
-            return await get_image_file(image_id, "original", db)
-        
-        # Construct the expected scaled filename
-        scaled_filename = f"{image.filename.rsplit('.', 1)[0]}_{target_width}x{target_height}.{image.filename.rsplit('.', 1)[1]}"
-        scaled_path = image_storage_service.upload_path / "scaled" / scaled_filename
-        
-        if not scaled_path.exists():
-            logger.warning(f"Pre-scaled image {scaled_filename} not found on disk, serving original")
-            return await get_image_file(image_id, "original", db)
+            return _image_file_response(image, request=request)
+        
+        etag = f'"{image.etag_base}_{target_width}x{target_height}"'
+        not_modified = _not_modified(request, image, etag, {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Vary": "Accept, DPR, Viewport-Width",
+        })
+        if not_modified:
+            return not_modified
+        
+        # Use the recorded variant for this size, else the legacy scaled directory
+        def resolve_scaled_path() -> Path:
+            variant = ImageService(db).get_image_variant(image.id, target_width, target_height)
+            if variant:
+                return Path(variant.path)
+            return image_storage_service.upload_path / "scaled" / f"{image.filename_stem}_{target_width}x{target_height}.{image.filename_ext}"
+        
+        scaled_path = _cached_file_path(image.id, f"{target_width}x{target_height}", resolve_scaled_path)
+        if not scaled_path:
+            logger.warning(f"Pre-scaled {target_width}x{target_height} image for {image.filename} not found on disk, serving original")
+            return _image_file_response(image, request=request)
+        scaled_filename = scaled_path.name
         
         logger.info(f"Serving pre-scaled image {scaled_filename} for device {device_token[:8]}... (variant: {best_variant.variant_type.value}, display: {display_width}x{display_height})")
         
-        # Set up caching headers for scaled images
-        headers = {
-            "Cache-Control": "public, max-age=31536000, immutable",  # Cache scaled images for 1 year
-            "Expires": (datetime.utcnow() + timedelta(days=365)).strftime("%a, %d %b %Y %H:%M:%S GMT"),
-            "ETag": f'"{scaled_filename}_{image.uploaded_at.timestamp()}"',
-            "Last-Modified": image.uploaded_at.strftime("%a, %d %b %Y %H:%M:%S GMT"),
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "SAMEORIGIN",
-            "X-Cache": "HIT",
-            "Vary": "Accept",
-            "X-Resolution-Match": f"{target_width}x{target_height}",
-            "X-Variant-Type": best_variant.variant_type.value
-        }
-        # Ensure inline display in browsers
-        headers["Content-Disposition"] = f'inline; filename="{image.original_filename}"'
-        
-        # Normalize MPO content-type to JPEG for scaled variants
-        media_type = (image.mime_type or "image/jpeg")
-        if media_type.lower() == "image/mpo":
-            media_type = "image/jpeg"
-        return FileResponse(
-            path=str(scaled_path),
-            media_type=media_type,
-            filename=image.original_filename,
-            headers=headers
+        # Cache scaled images for 1 year
+        return _build_file_response(
+            image, scaled_path, etag, "public, max-age=31536000, immutable", 365,
+            extra_headers={
+                "Vary": "Accept, DPR, Viewport-Width",
+                "Content-DPR": str(device_pixel_ratio),
+                "X-Resolution-Match": f"{target_width}x{target_height}",
+                "X-Variant-Type": best_variant.variant_type.value,
+            }
         )
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Smart image serving error: {e}")
-        # Fallback to original image on error
-        return await get_image_file(image_id, "original", db)
+        # Fallback to original image on error; if the image itself couldn't be
+        # loaded there is nothing to fall back to
+        if image is not None:
+            return _image_file_response(image, request=request)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve image file"
+        )
 
 @router.put("/{image_id}")
 async def update_image(
@@ -1580,19 +1882,30 @@ async def find_duplicate_images(
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
-    """Find potential duplicate images"""
+    """Find potential duplicate images (streamed one group at a time)"""
     try:
         image_service = ImageService(db)
-        duplicates = image_service.get_duplicate_images()
+        duplicate_groups = image_service.iter_duplicate_images()
         
-        return {
-            "message": "Duplicate images retrieved successfully",
-            "data": [
-                [image.to_dict() for image in group] 
-                for group in duplicates
-            ],
-            "status_code": 200
-        }
+        def stream_groups():
+            yield b'{"message":"Duplicate images retrieved successfully","status_code":200,"data":['
+            try:
+                for index, group in enumerate(duplicate_groups):
+                    if index:
+                        yield b","
+                    yield orjson.dumps(
+                        [image.to_dict() for image in group],
+                        option=orjson.OPT_NON_STR_KEYS
+                    )
+            except Exception as e:
+                # Headers (200) are already sent - close the JSON but mark it
+                # incomplete so clients don't take the partial list as the result
+                logger.error(f"Find duplicate images stream error: {e}", exc_info=True)
+                yield b'],"complete":false,"error":"Failed to find duplicate images"}'
+                return
+            yield b'],"complete":true}'
+        
+        return StreamingResponse(stream_groups(), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Find duplicate images error: {e}")
@@ -1604,6 +1917,7 @@ async def find_duplicate_images(
 @router.get("/{image_id}/optimized")
 async def get_optimized_image(
     image_id: int,
+    request: Request,
     width: Optional[int] = None,
     height: Optional[int] = None,
     quality: int = 85,
@@ -1612,8 +1926,7 @@ async def get_optimized_image(
 ):
     """Get optimized image with custom dimensions and quality"""
     try:
-        image_service = ImageService(db)
-        image = image_service.get_image_by_id(image_id)
+        image = _get_served_image(db, image_id)
         
         if not image:
             raise HTTPException(
@@ -1621,52 +1934,37 @@ async def get_optimized_image(
                 detail="Image not found"
             )
         
+        # If no custom dimensions requested, serve original with caching
+        if not width and not height:
+            return _image_file_response(image, request=request)
+        
+        etag = f'"{image.etag_base}_optimized_{width}x{height}_{quality}"'
+        not_modified = _not_modified(request, image, etag, {"ETag": etag, "Cache-Control": "public, max-age=2592000"})
+        if not_modified:
+            return not_modified
+        
         # Get original file path
-        file_path = image_storage_service.get_image_path(image.filename)
-        if not file_path or not file_path.exists():
+        file_path = _cached_file_path(image.id, "original", lambda: image_storage_service.get_image_path(image.filename))
+        if not file_path:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Image file not found"
             )
         
-        # If no custom dimensions requested, serve original with caching
-        if not width and not height:
-            headers = {
-                "Cache-Control": "public, max-age=31536000, immutable",
-                "Expires": (datetime.utcnow() + timedelta(days=365)).strftime("%a, %d %b %Y %H:%M:%S GMT"),
-                "ETag": f'"{image.filename}_original_{image.uploaded_at.timestamp()}"',
-                "Last-Modified": image.uploaded_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
-            }
-            
-            media_type = (image.mime_type or "image/jpeg")
-            if media_type.lower() == "image/mpo":
-                media_type = "image/jpeg"
-            # Ensure inline display in browsers
-            headers["Content-Disposition"] = f'inline; filename="{image.original_filename}"'
-            return FileResponse(
-                path=str(file_path),
-                media_type=media_type,
-                filename=image.original_filename,
-                headers=headers
-            )
-        
         # For custom dimensions, we would need to implement on-the-fly resizing
         # For now, return the original with appropriate caching
         headers = {
             "Cache-Control": "public, max-age=2592000",  # 30 days for dynamic content
-            "Expires": (datetime.utcnow() + timedelta(days=30)).strftime("%a, %d %b %Y %H:%M:%S GMT"),
-            "ETag": f'"{image.filename}_optimized_{width}x{height}_{quality}_{image.uploaded_at.timestamp()}"',
-            "Last-Modified": image.uploaded_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
+            "Expires": _expires_header(30),
+            "ETag": etag,
+            "Last-Modified": image.last_modified_http,
+            # Ensure inline display in browsers
+            "Content-Disposition": image.content_disposition,
         }
         
-        media_type = (image.mime_type or "image/jpeg")
-        if media_type.lower() == "image/mpo":
-            media_type = "image/jpeg"
-        # Ensure inline display in browsers
-        headers["Content-Disposition"] = f'inline; filename="{image.original_filename}"'
-        return FileResponse(
+        return SendfileResponse(
             path=str(file_path),
-            media_type=media_type,
+            media_type=image.media_type,
             filename=image.original_filename,
             headers=headers
         )
@@ -1696,9 +1994,10 @@ async def debug_image_info(
                 detail="Image not found"
             )
         
-        # Get file paths
+        # Get file paths (both lookups return None unless the file exists)
         original_path = image_storage_service.get_image_path(image.filename)
         thumbnail_path = image_storage_service.get_thumbnail_path(image.filename, "medium")
+        image_dict = image.to_dict()
         
         return {
             "image_id": image.id,
@@ -1707,14 +2006,14 @@ async def debug_image_info(
             "album_id": image.album_id,
             "file_hash": image.file_hash,
             "paths": {
-                "original_exists": original_path.exists() if original_path else False,
+                "original_exists": original_path is not None,
                 "original_path": str(original_path) if original_path else None,
-                "thumbnail_exists": thumbnail_path.exists() if thumbnail_path else False,
+                "thumbnail_exists": thumbnail_path is not None,
                 "thumbnail_path": str(thumbnail_path) if thumbnail_path else None,
             },
             "urls": {
-                "url": image.to_dict()["url"],
-                "thumbnail_url": image.to_dict()["thumbnail_url"]
+                "url": image_dict["url"],
+                "thumbnail_url": image_dict["thumbnail_url"]
             }
         }
         
@@ -1728,6 +2027,92 @@ async def debug_image_info(
         )
 
 
+def _init_db_worker():
+    """Drop pooled DB connections inherited from the parent process after fork (process pool initializer)"""
+    from models import database as db_module
+    if db_module.engine is not None:
+        db_module.engine.dispose(close=False)
+
+def _extract_colors_chunk(image_ids: List[int]) -> int:
+    """
+    Extract and save dominant colors for a chunk of images.
+    Runs inside a worker process; writes results back in bulk, committing
+    every COLOR_COMMIT_BATCH_SIZE images.
+    """
+    from models import database as db_module
+    
+    db_module.ensure_database_initialized()
+    db = db_module.SessionLocal()
+    saved = 0
+    
+    try:
+        # Fetch the (small) chunk up front - a streaming cursor would hold the
+        # connection and block the interleaved UPDATEs below
+        rows = db.query(Image.id, Image.filename).filter(Image.id.in_(image_ids)).all()
+        
+        # One storage-tree walk for the whole chunk rather than a search per image
+        file_paths = image_storage_service.find_image_paths([filename for _, filename in rows])
+        
+        updates = []
+        for image_id, filename in rows:
+            file_path = file_paths.get(filename)
+            if not file_path:
+                logger.warning(f"File path not found for image {image_id}")
+                continue
+            
+            colors = color_extractor_service.extract_colors(str(file_path), color_count=3, quality=10)
+            if colors:
+                updates.append({"id": image_id, "dominant_colors": colors})
+            else:
+                logger.warning(f"Failed to extract colors for image {image_id}")
+            
+            if len(updates) >= COLOR_COMMIT_BATCH_SIZE:
+                db.bulk_update_mappings(Image, updates)
+                db.commit()
+                saved += len(updates)
+                updates = []
+        
+        if updates:
+            db.bulk_update_mappings(Image, updates)
+            db.commit()
+            saved += len(updates)
+        return saved
+        
+    except Exception as e:
+        logger.error(f"Error in background color extraction for images {image_ids[0]}..{image_ids[-1]}: {e}")
+        db.rollback()
+        return saved
+    finally:
+        db.close()
+
+def _run_color_batch(image_ids: List[int]):
+    """Fan color extraction for all given images across a process pool"""
+    # Claim the images no other running batch has; skip the rest
+    with _colors_in_flight_lock:
+        image_ids = [image_id for image_id in image_ids if image_id not in _colors_in_flight]
+        _colors_in_flight.update(image_ids)
+    try:
+        if image_ids:
+            _extract_colors_pooled(image_ids)
+    finally:
+        # Release the claim; images that still have no colors can be retried
+        with _colors_in_flight_lock:
+            _colors_in_flight.difference_update(image_ids)
+
+def _extract_colors_pooled(image_ids: List[int]):
+    """Split image IDs into chunks and extract their colors across a process pool"""
+    workers = max(1, min(os.cpu_count() or 1, len(image_ids)))
+    chunk_size = min(COLOR_BATCH_CHUNK_SIZE, (len(image_ids) + workers - 1) // workers)
+    chunks = [image_ids[i:i + chunk_size] for i in range(0, len(image_ids), chunk_size)]
+    
+    logger.info(f"🎨 Extracting colors for {len(image_ids)} images in {len(chunks)} chunks across {workers} processes")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_db_worker) as executor:
+            saved = sum(executor.map(_extract_colors_chunk, chunks))
+        logger.info(f"✅ Saved colors for {saved}/{len(image_ids)} images")
+    except Exception as e:
+        logger.error(f"❌ Color extraction batch failed: {e}", exc_info=True)
+
 @router.post("/process-colors")
 async def process_all_image_colors(
     background_tasks: BackgroundTasks,
@@ -1739,60 +2124,27 @@ async def process_all_image_colors(
     Runs asynchronously in background.
     """
     try:
-        from services.color_extractor import color_extractor_service
-        from services.image_storage_service import image_storage_service
-        
-        # Find images without dominant colors
-        images_to_process = db.query(Image).filter(
-            Image.dominant_colors == None
-        ).all()
+        # Find images without dominant colors - only IDs are needed, and the
+        # ISNULL() form matches the ix_images_missing_colors functional index
+        image_ids = [
+            image_id for (image_id,) in db.query(Image.id).filter(
+                func.isnull(Image.dominant_colors) == 1
+            ).yield_per(1000)
+        ]
         
-        logger.info(f"Found {len(images_to_process)} images to process for color extraction")
+        # Skip images a running batch is already extracting (the batch claims its own)
+        with _colors_in_flight_lock:
+            image_ids = [image_id for image_id in image_ids if image_id not in _colors_in_flight]
         
-        # Add background task for each image
-        def extract_and_save_colors(image_id: int):
-            """Background task to extract and save colors for an image"""
-            try:
-                # Get fresh session for background task
-                from models import SessionLocal
-                bg_db = SessionLocal()
-                
-                try:
-                    image = bg_db.query(Image).filter(Image.id == image_id).first()
-                    if not image:
-                        logger.warning(f"Image {image_id} not found during color extraction")
-                        return
-                    
-                    # Get full file path
-                    file_path = image_storage_service.get_image_path(image.filename)
-                    if not file_path:
-                        logger.warning(f"File path not found for image {image_id}")
-                        return
-                    
-                    # Extract colors
-                    colors = color_extractor_service.extract_colors(file_path, color_count=3, quality=10)
-                    
-                    if colors:
-                        # Save to database
-                        image.dominant_colors = colors
-                        bg_db.commit()
-                        logger.info(f"Saved colors for image {image_id}: {colors}")
-                    else:
-                        logger.warning(f"Failed to extract colors for image {image_id}")
-                        
-                finally:
-                    bg_db.close()
-                    
-            except Exception as e:
-                logger.error(f"Error in background color extraction for image {image_id}: {e}")
+        logger.info(f"Found {len(image_ids)} images to process for color extraction")
         
-        # Queue all tasks
-        for image in images_to_process:
-            background_tasks.add_task(extract_and_save_colors, image.id)
+        # Hand the whole batch to a single background job backed by a process pool
+        if image_ids:
+            background_tasks.add_task(_run_color_batch, image_ids)
         
         return {
-            "message": f"Processing colors for {len(images_to_process)} images in background",
-            "images_to_process": len(images_to_process)
+            "message": f"Processing colors for {len(image_ids)} images in background",
+            "images_to_process": len(image_ids)
         }
         
     except Exception as e:
@@ -1805,6 +2157,49 @@ async def process_all_image_colors(
 class BulkDownloadRequest(BaseModel):
     image_ids: List[int]
 
+class _ZipChunkBuffer:
+    """Write-only sink for ZipFile that hands back what was written since the last drain"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _stream_zip(entries: List[Tuple[Path, str]]) -> Iterator[bytes]:
+    """
+    Yield a ZIP_STORED archive of (path, arcname) entries as it is written.
+    
+    The sink has no tell()/seek(), so ZipFile writes data descriptors after each
+    member instead of seeking back. Files are copied in ZIP_COPY_CHUNK_SIZE reads
+    (ZipFile.write uses 8 KiB) and each chunk is yielded as soon as it is read.
+    """
+    buffer = _ZipChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+        for image_path, arcname in entries:
+            try:
+                zip_info = zipfile.ZipInfo.from_file(image_path, arcname)
+                with open(image_path, 'rb') as src, zip_file.open(zip_info, 'w') as dest:
+                    while chunk := src.read(ZIP_COPY_CHUNK_SIZE):
+                        dest.write(chunk)
+                        yield buffer.drain()
+                logger.debug(f"Added {arcname} to zip")
+            except Exception as e:
+                logger.error(f"Error adding {arcname} to zip: {e}")
+                # Continue with other images
+            yield buffer.drain()
+    # Central directory
+    yield buffer.drain()
+
 @router.post("/download-zip")
 async def download_images_as_zip(
     request: BulkDownloadRequest,
@@ -1819,8 +2214,8 @@ async def download_images_as_zip(
                 detail="No image IDs provided"
             )
         
-        # Get images from database
-        images = db.query(Image).filter(Image.id.in_(request.image_ids)).all()
+        # Get images from database - only the two names the archive needs
+        images = db.query(Image.filename, Image.original_filename).filter(Image.id.in_(request.image_ids)).all()
         
         if not images:
             raise HTTPException(
@@ -1828,33 +2223,22 @@ async def download_images_as_zip(
                 detail="No images found"
             )
         
-        # Create zip file in memory
-        zip_buffer = io.BytesIO()
+        # Resolve every file in one directory walk instead of a tree search per image
+        image_paths = image_storage_service.find_image_paths([filename for filename, _ in images])
         
-        # Use ZIP_STORED (no compression) for images since they're already compressed
-        # This significantly speeds up zip creation for large image sets
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zip_file:
-            for image in images:
-                try:
-                    # Get the image file path
-                    image_path = image_storage_service.get_image_path(image.filename)
-                    
-                    if image_path and os.path.exists(image_path):
-                        # Add file to zip with its original filename
-                        zip_file.write(image_path, image.original_filename)
-                        logger.debug(f"Added {image.original_filename} to zip")
-                    else:
-                        logger.warning(f"Image file not found: {image.filename}")
-                except Exception as e:
-                    logger.error(f"Error adding image {image.id} to zip: {e}")
-                    # Continue with other images
-        
-        # Seek to beginning of buffer
-        zip_buffer.seek(0)
-        
-        # Return zip file as streaming response
+        entries = []
+        for filename, original_filename in images:
+            image_path = image_paths.get(filename)
+            if image_path:
+                # Add file to zip with its original filename
+                entries.append((image_path, original_filename))
+            else:
+                logger.warning(f"Image file not found: {filename}")
+        
+        # Stream the archive as it is built rather than buffering it all in memory.
+        # ZIP_STORED (no compression) since images are already compressed.
         return StreamingResponse(
-            zip_buffer,
+            _stream_zip(entries),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename=glowworm-images-{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
@@ -1955,7 +2339,7 @@ async def optimize_database(
         
         # 3. Reset stale processing statuses (stuck in "processing" for >1 hour)
         logger.info("🔄 Resetting stale processing statuses...")
-        stale_threshold = datetime.now() - timedelta(hours=1)
+        stale_threshold = datetime.utcnow() - timedelta(hours=1)
         stale_images = db.query(Image).filter(
             Image.processing_status == 'processing',
             Image.last_processing_attempt < stale_threshold
@@ -2057,7 +2441,7 @@ async def check_system_health(
             })
         
         # Check 2: Stale processing (stuck for >1 hour)
-        stale_threshold = datetime.now() - timedelta(hours=1)
+        stale_threshold = datetime.utcnow() - timedelta(hours=1)
         stale_processing = db.query(Image).filter(
             Image.processing_status == 'processing',
             Image.last_processing_attempt < stale_threshold
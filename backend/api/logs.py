@@ -1,19 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, selectinload
 from typing import List, Optional
+from datetime import datetime
 from pydantic import BaseModel
 import logging
+import re
 
 from models.database import get_db
 from models.user_log import UserLog, UserLogLevel, UserLogAction
 from models.user import User
 from utils.middleware import require_admin, get_current_user
 from utils.file_logger import read_log_file, write_frontend_log
+from services.user_log_writer import user_log_writer
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/logs", tags=["logs"])
 
+# Log line formats written by utils.file_logger (fields separated by " - ")
+# Frontend: 2025-11-03 02:00:00 - LEVEL - message
+_FRONTEND_LINE_RE = re.compile(r"(?P<timestamp>.*?) - (?P<level>.*?) - (?P<message>.*)", re.DOTALL)
+# Backend: 2025-11-03 02:00:00 - logger.name - LEVEL - message
+_BACKEND_LINE_RE = re.compile(
+    r"(?P<timestamp>.*?) - (?P<logger_name>.*?) - (?P<level>.*?) - (?P<message>.*)", re.DOTALL
+)
+
+# Value -> member lookups for request validation, without try/except per call
+_LOG_LEVELS = {level.value: level for level in UserLogLevel}
+_LOG_ACTIONS = {action.value: action for action in UserLogAction}
+
+def _parse_log_lines(log_lines: List[str], pattern: re.Pattern) -> List[dict]:
+    """Split log lines into their fields; lines that don't match keep only a message"""
+    unmatched = dict.fromkeys(pattern.groupindex, "")
+    parsed_logs = []
+    for i, line in enumerate(log_lines, 1):
+        match = pattern.fullmatch(line)
+        if match:
+            parsed_logs.append({"line_number": i, **match.groupdict()})
+        else:
+            parsed_logs.append({"line_number": i, **unmatched, "message": line})
+    return parsed_logs
+
 # Pydantic models
 class FrontendLogRequest(BaseModel):
     log_level: str  # "debug", "info", "warning", "error"
@@ -83,31 +110,7 @@ async def get_frontend_logs(
         log_lines = read_log_file("frontend", lines)
         
         # Parse log lines into structured format
-        parsed_logs = []
-        for i, line in enumerate(log_lines):
-            try:
-                parts = line.strip().split(' - ', 3)
-                if len(parts) >= 3:
-                    parsed_logs.append({
-                        "line_number": i + 1,
-                        "timestamp": parts[0] if len(parts) > 0 else "",
-                        "level": parts[1] if len(parts) > 1 else "",
-                        "message": parts[2] if len(parts) > 2 else line.strip()
-                    })
-                else:
-                    parsed_logs.append({
-                        "line_number": i + 1,
-                        "timestamp": "",
-                        "level": "",
-                        "message": line.strip()
-                    })
-            except Exception:
-                parsed_logs.append({
-                    "line_number": i + 1,
-                    "timestamp": "",
-                    "level": "",
-                    "message": line.strip()
-                })
+        parsed_logs = _parse_log_lines(log_lines, _FRONTEND_LINE_RE)
         
         return {"success": True, "logs": parsed_logs, "total": len(parsed_logs)}
         
@@ -126,35 +129,7 @@ async def get_backend_logs(
         log_lines = read_log_file("backend", lines)
         
         # Parse log lines into structured format
-        parsed_logs = []
-        for i, line in enumerate(log_lines):
-            try:
-                # Format: 2025-11-03 02:00:00 - logger.name - LEVEL - message
-                parts = line.strip().split(' - ', 3)
-                if len(parts) >= 4:
-                    parsed_logs.append({
-                        "line_number": i + 1,
-                        "timestamp": parts[0],
-                        "logger_name": parts[1],
-                        "level": parts[2],
-                        "message": parts[3]
-                    })
-                else:
-                    parsed_logs.append({
-                        "line_number": i + 1,
-                        "timestamp": "",
-                        "logger_name": "",
-                        "level": "",
-                        "message": line.strip()
-                    })
-            except Exception:
-                parsed_logs.append({
-                    "line_number": i + 1,
-                    "timestamp": "",
-                    "logger_name": "",
-                    "level": "",
-                    "message": line.strip()
-                })
+        parsed_logs = _parse_log_lines(log_lines, _BACKEND_LINE_RE)
         
         return {"success": True, "logs": parsed_logs, "total": len(parsed_logs)}
         
@@ -167,46 +142,43 @@ async def get_backend_logs(
 async def submit_user_log(
     request: Request,
     log_data: UserLogRequest,
-    current_user: Optional[User] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Optional[User] = Depends(get_current_user)
 ):
     """Submit a log entry from an authenticated user (or anonymous)"""
     try:
         # Validate log level
-        try:
-            log_level_enum = UserLogLevel(log_data.log_level.upper())
-        except ValueError:
+        log_level_enum = _LOG_LEVELS.get(log_data.log_level.upper())
+        if log_level_enum is None:
             raise HTTPException(status_code=400, detail=f"Invalid log level: {log_data.log_level}")
         
         # Validate action
-        try:
-            action_enum = UserLogAction(log_data.action.upper())
-        except ValueError:
+        action_enum = _LOG_ACTIONS.get(log_data.action.upper())
+        if action_enum is None:
             raise HTTPException(status_code=400, detail=f"Invalid action: {log_data.action}")
         
         # Get client IP
         client_ip = request.client.host if request.client else None
         user_agent = request.headers.get('user-agent')
         
-        # Create log entry
-        user_log = UserLog(
-            user_id=current_user.id if current_user else None,
-            log_level=log_level_enum,
-            action=action_enum,
-            message=log_data.message,
-            context=log_data.context,
-            url=log_data.url,
-            ip_address=client_ip,
-            user_agent=user_agent
-        )
-        
-        db.add(user_log)
-        db.commit()
-        db.refresh(user_log)
+        # Queue log entry; the writer inserts buffered entries in batches
+        queued = user_log_writer.enqueue({
+            "user_id": current_user.id if current_user else None,
+            "log_level": log_level_enum,
+            "action": action_enum,
+            "message": log_data.message,
+            "context": log_data.context,
+            "url": log_data.url,
+            "ip_address": client_ip,
+            "user_agent": user_agent,
+            # Stamped at submit time; the row may be inserted up to a flush later
+            "created_at": datetime.utcnow(),
+        })
+        if not queued:
+            raise HTTPException(status_code=503, detail="Log buffer full, entry dropped")
         
         logger.info(f"User log received [{log_level_enum.value}] [{action_enum.value}]: {log_data.message[:50]}")
         
-        return {"success": True, "message": "Log submitted successfully", "log_id": user_log.id}
+        return {"success": True, "message": "Log submitted successfully"}
         
     except HTTPException:
         raise
@@ -234,25 +206,27 @@ async def get_user_logs(
         if user_id:
             query = query.filter(UserLog.user_id == user_id)
         
+        # to_dict() reads log.user.username, so load users with the logs rather than
+        # one lazy SELECT per row - from the join when filtering by username
         if username:
             from models.user import User
             query = query.join(User, UserLog.user_id == User.id, isouter=True).filter(
                 User.username.like(f"%{username}%")
-            )
+            ).options(contains_eager(UserLog.user))
+        else:
+            query = query.options(selectinload(UserLog.user))
         
         if log_level:
-            try:
-                log_level_enum = UserLogLevel(log_level.upper())
-                query = query.filter(UserLog.log_level == log_level_enum)
-            except ValueError:
+            log_level_enum = _LOG_LEVELS.get(log_level.upper())
+            if log_level_enum is None:
                 raise HTTPException(status_code=400, detail=f"Invalid log level: {log_level}")
+            query = query.filter(UserLog.log_level == log_level_enum)
         
         if action:
-            try:
-                action_enum = UserLogAction(action.upper())
-                query = query.filter(UserLog.action == action_enum)
-            except ValueError:
+            action_enum = _LOG_ACTIONS.get(action.upper())
+            if action_enum is None:
                 raise HTTPException(status_code=400, detail=f"Invalid action: {action}")
+            query = query.filter(UserLog.action == action_enum)
         
         # Order by most recent first
         query = query.order_by(UserLog.created_at.desc())
@@ -10,40 +10,46 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/migration", tags=["migration"])
 
+# Set once the column is known to exist; it is never dropped, so later calls
+# can skip the information_schema lookup
+_auto_sort_column_present = False
+
 @router.post("/add-auto-sort-column")
 async def add_auto_sort_column(
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
     """Add auto_sort column to playlists table"""
+    global _auto_sort_column_present
+    if _auto_sort_column_present:
+        return {"message": "auto_sort column already exists", "success": True}
+    
     try:
         # Check if column already exists
         result = db.execute(text("""
-            SELECT COUNT(*) as count 
-            FROM information_schema.columns 
-            WHERE table_name = 'playlists' 
-            AND column_name = 'auto_sort'
+            SELECT EXISTS(
+                SELECT 1
+                FROM information_schema.columns 
+                WHERE table_schema = DATABASE()
+                AND table_name = 'playlists' 
+                AND column_name = 'auto_sort'
+            )
         """))
         
-        column_exists = result.fetchone()[0] > 0
+        column_exists = bool(result.scalar())
         
         if column_exists:
+            _auto_sort_column_present = True
             return {"message": "auto_sort column already exists", "success": True}
         
-        # Add the column
+        # Add the column (MySQL fills existing rows with the DEFAULT)
         db.execute(text("""
             ALTER TABLE playlists 
             ADD COLUMN auto_sort BOOLEAN DEFAULT FALSE
         """))
         
-        # Set default value for existing records
-        db.execute(text("""
-            UPDATE playlists 
-            SET auto_sort = FALSE 
-            WHERE auto_sort IS NULL
-        """))
-        
         db.commit()
+        _auto_sort_column_present = True
         
         return {"message": "Successfully added auto_sort column", "success": True}
         
@@ -3,9 +3,10 @@ Performance monitoring API endpoints.
 Provides access to application performance metrics and statistics.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import heapq
 import logging
 
 from models import get_db
@@ -75,7 +76,7 @@ async def get_health_check(
             issues.append(f"High memory usage: {system.get('memory_percent', 0)}%")
         
         # Check for errors
-        error_count = sum(stats.get('errors', {}).values())
+        error_count = stats.get('errors_total', 0)
         if error_count > 10:  # More than 10 errors
             health_status = "unhealthy"
             issues.append(f"High error count: {error_count}")
@@ -132,6 +133,7 @@ async def get_slow_queries(
 
 @router.get("/endpoints")
 async def get_endpoint_performance(
+    top: Optional[int] = Query(None, ge=1, le=500, description="Only return the N slowest endpoints"),
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
@@ -140,12 +142,14 @@ async def get_endpoint_performance(
         stats = get_performance_stats()
         endpoint_stats = stats.get('endpoints', {})
         
-        # Sort endpoints by average response time
-        sorted_endpoints = sorted(
-            endpoint_stats.items(),
-            key=lambda x: x[1].get('avg_time', 0),
-            reverse=True
-        )
+        # Sort endpoints by average response time; for top-N a heap avoids sorting them all
+        def avg_time(item):
+            return item[1].get('avg_time', 0)
+        
+        if top:
+            sorted_endpoints = heapq.nlargest(top, endpoint_stats.items(), key=avg_time)
+        else:
+            sorted_endpoints = sorted(endpoint_stats.items(), key=avg_time, reverse=True)
         
         return {
             "success": True,
@@ -177,16 +181,8 @@ async def reset_performance_metrics(
                 detail="Only super admins can reset performance metrics"
             )
         
-        # Reset metrics
-        performance_metrics.response_times.clear()
-        performance_metrics.query_times.clear()
-        performance_metrics.slow_queries.clear()
-        performance_metrics.system_metrics.clear()
-        performance_metrics.error_counts.clear()
-        
-        # Clear endpoint times
-        for endpoint_times in performance_metrics.endpoint_times.values():
-            endpoint_times.clear()
+        # Reset metrics (under the metrics lock, dropping the cached snapshot)
+        performance_metrics.reset()
         
         return {
             "success": True,
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, BackgroundTasks
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Any, Callable, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+import hashlib
 import logging
 import os
+import orjson
 
 from models import get_db, Playlist, Image
 from models.user import User
@@ -12,6 +14,10 @@ from utils.middleware import get_current_user
 from services.playlist_service import PlaylistService
 from services.display_device_service import DisplayDeviceService
 from services.playlist_variant_service import PlaylistVariantService
+from services.caching_service import (
+    cache_service, invalidate_playlist_cache, playlist_response_generation, playlist_response_key,
+    set_playlist_response,
+)
 from utils.csrf import csrf_protection
 from utils.cookies import CookieManager
 from websocket.manager import connection_manager
@@ -19,11 +25,19 @@ import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Longest image_ids list a reorder accepts; rejected during validation, before
+# any database work
+MAX_REORDER_IMAGE_IDS = 100_000
+
 class PlaylistCreateRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+    
     name: str
     is_default: bool = False
 
 class PlaylistUpdateRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+    
     name: Optional[str] = None
     is_default: Optional[bool] = None
     display_time_seconds: Optional[int] = None
@@ -32,7 +46,9 @@ class PlaylistUpdateRequest(BaseModel):
     show_exif_date: Optional[bool] = None
 
 class PlaylistReorderRequest(BaseModel):
-    image_ids: List[int]
+    model_config = ConfigDict(extra='forbid')
+    
+    image_ids: list[int] = Field(max_length=MAX_REORDER_IMAGE_IDS)
 
 class PlaylistRandomizeRequest(BaseModel):
     display_orientation: Optional[str] = 'portrait'
@@ -40,6 +56,94 @@ class PlaylistRandomizeRequest(BaseModel):
 
 router = APIRouter(prefix="/api/playlists", tags=["playlists"])
 
+# Serialized playlist responses are shared by every caller (display devices poll
+# these) and dropped by invalidate_playlist_cache() on any playlist change; the
+# TTLs only bound staleness from writes that bypass the services
+PLAYLIST_LIST_TTL_SECONDS = 15
+PLAYLIST_TTL_SECONDS = 60
+
+def _cached_playlist_payload(name: str, ttl_seconds: int, build: Callable[[], Any]) -> Optional[Tuple[Any, str]]:
+    """
+    Return the cached (payload, etag), building and caching it on a miss.
+    
+    The ETag is a hash of the payload computed once per cache fill, so polls
+    that revalidate cost a dict lookup. A None payload is not cached, and
+    neither is one whose build raced with a write's invalidation.
+    """
+    key = playlist_response_key(name)
+    entry = cache_service.get(key)
+    if entry is None:
+        generation = playlist_response_generation()
+        payload = build()
+        if payload is None:
+            return None
+        entry = _store_playlist_payload(key, payload, ttl_seconds, generation)
+    return entry
+
+def _store_playlist_payload(key: str, payload: Any, ttl_seconds: int, generation: int) -> Tuple[Any, str]:
+    """
+    Cache a payload with its ETag and return the (payload, etag) entry.
+    
+    `generation` is playlist_response_generation() from before the payload
+    was built; if a write invalidated playlist responses since then the
+    entry is still returned but not cached.
+    """
+    etag = f'"{hashlib.blake2b(orjson.dumps(payload), digest_size=8).hexdigest()}"'
+    entry = (payload, etag)
+    set_playlist_response(key, entry, ttl_seconds, generation)
+    return entry
+
+def _playlist_payload(db: Session, playlist_id: int) -> Optional[Tuple[dict, str]]:
+    """One playlist's cached (dict, etag); callers must copy the dict before changing it"""
+    def build():
+        playlist = PlaylistService(db).get_playlist_by_id(playlist_id)
+        return playlist.to_dict() if playlist else None
+    
+    # "playlist_{id}" in the key so invalidate_playlist_cache(id) matches it too
+    return _cached_playlist_payload(f"playlist_{playlist_id}", PLAYLIST_TTL_SECONDS, build)
+
+def _fresh_playlist_payload(playlist: Playlist) -> dict:
+    """
+    Serialize a just-updated playlist once and seed its response cache with it.
+    
+    The same dict is broadcast to devices and returned by the next GET, instead
+    of the mutation, the broadcast and the following reads each re-running
+    to_dict() (which loads the playlist's images to count them).
+    """
+    generation = playlist_response_generation()
+    payload = playlist.to_dict()
+    _store_playlist_payload(playlist_response_key(f"playlist_{playlist.id}"), payload, PLAYLIST_TTL_SECONDS, generation)
+    return payload
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """A bodyless 304 if the client already holds this ETag; otherwise tag the outgoing response"""
+    # no-cache: clients may keep the body but must revalidate on every poll
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+def _playlist_unchanged(playlist: Playlist, changes: dict) -> bool:
+    """True if every requested update field already holds the requested value"""
+    for field, value in changes.items():
+        current = getattr(playlist, field)
+        if field == "display_mode" and current is not None:
+            current = current.value
+        if current != value:
+            return False
+    return True
+
+def _playlist_list_payload(db: Session) -> Tuple[List[dict], str]:
+    """All playlists as dicts plus their ETag, shared by the user and display device list endpoints"""
+    return _cached_playlist_payload(
+        "list", PLAYLIST_LIST_TTL_SECONDS,
+        lambda: PlaylistService(db).get_all_playlist_dicts()
+    )
+
 @router.post("/")
 async def create_playlist(
     request: Request,
@@ -48,184 +152,178 @@ async def create_playlist(
     db: Session = Depends(get_db)
 ):
     """Create a new playlist"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.create_playlist(create_data.name, create_data.is_default)
-        
-        return {
-            "success": True,
-            "message": "Playlist created successfully",
-            "playlist": playlist.to_dict()
-        }
-        
-    except Exception as e:
-        logger.error(f"Create playlist error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create playlist"
-        )
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    playlist_service = PlaylistService(db)
+    playlist = playlist_service.create_playlist(create_data.name, create_data.is_default)
+    
+    return {
+        "success": True,
+        "message": "Playlist created successfully",
+        "playlist": playlist.to_dict()
+    }
 
+# Read-only handlers are plain `def`: FastAPI runs them in its threadpool, so
+# their blocking Session queries don't stall the event loop (and the websocket
+# traffic on it) while many display devices fetch at once
 @router.get("/")
-async def get_playlists(
+def get_playlists(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all playlists"""
-    try:
-        playlist_service = PlaylistService(db)
-        playlists = playlist_service.get_all_playlists()
-        
-        return {
-            "success": True,
-            "playlists": [playlist.to_dict() for playlist in playlists],
-            "count": len(playlists)
-        }
-        
-    except Exception as e:
-        logger.error(f"Get playlists error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlists"
-        )
+    playlists, etag = _playlist_list_payload(db)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return {
+        "success": True,
+        "playlists": playlists,
+        "count": len(playlists)
+    }
 
 @router.get("/default")
-async def get_default_playlist(
+def get_default_playlist(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get the default playlist"""
-    try:
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.get_default_playlist()
-        
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No default playlist found"
-            )
-        
-        return {
-            "success": True,
-            "playlist": playlist.to_dict()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get default playlist error: {e}")
+    def build():
+        playlist = PlaylistService(db).get_default_playlist()
+        return playlist.to_dict() if playlist else None
+    
+    entry = _cached_playlist_payload("default", PLAYLIST_TTL_SECONDS, build)
+    
+    if not entry:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve default playlist"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No default playlist found"
         )
+    
+    playlist, etag = entry
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return {
+        "success": True,
+        "playlist": playlist
+    }
 
 # Public endpoint for display devices (must be before /{playlist_id} route)
 @router.get("/public")
-async def get_playlists_public(
+def get_playlists_public(
     request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Get all playlists (public endpoint for display devices)"""
-    try:
-        # Get device token from cookie
-        cookie_manager = CookieManager()
-        device_token = cookie_manager.get_display_device_cookie(request)
-        
-        if not device_token:
-            raise HTTPException(status_code=401, detail="Display device not authenticated")
-        
-        # Verify device exists and is authorized
-        device_service = DisplayDeviceService(db)
-        device = device_service.get_device_by_token(device_token)
-        
-        if not device:
-            raise HTTPException(status_code=404, detail="Display device not found")
-        
-        if device.status != DeviceStatus.AUTHORIZED:
-            raise HTTPException(status_code=403, detail="Display device not authorized")
-        
-        # Get playlists
-        playlist_service = PlaylistService(db)
-        playlists = playlist_service.get_all_playlists()
-        
-        return {
-            "success": True,
-            "data": [playlist.to_dict() for playlist in playlists],
-            "count": len(playlists)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get public playlists error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlists"
-        )
+    # Get device token from cookie
+    cookie_manager = CookieManager()
+    device_token = cookie_manager.get_display_device_cookie(request)
+    
+    if not device_token:
+        raise HTTPException(status_code=401, detail="Display device not authenticated")
+    
+    # Verify device exists and is authorized (cached id/status lookup)
+    device_service = DisplayDeviceService(db)
+    device_auth = device_service.get_device_auth(device_token)
+    
+    if not device_auth:
+        raise HTTPException(status_code=404, detail="Display device not found")
+    
+    _, device_status = device_auth
+    if device_status != DeviceStatus.AUTHORIZED:
+        raise HTTPException(status_code=403, detail="Display device not authorized")
+    
+    # Get playlists (304 if the device's copy is current)
+    playlists, etag = _playlist_list_payload(db)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return {
+        "success": True,
+        "data": playlists,
+        "count": len(playlists)
+    }
 
 @router.get("/{playlist_id}")
-async def get_playlist(
+def get_playlist(
+    request: Request,
+    response: Response,
     playlist_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific playlist by ID"""
-    try:
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.get_playlist_by_id(playlist_id)
-        
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Playlist not found"
-            )
-        
-        return {
-            "success": True,
-            "playlist": playlist.to_dict()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get playlist error: {e}")
+    entry = _playlist_payload(db, playlist_id)
+    
+    if not entry:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlist"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
         )
+    
+    playlist, etag = entry
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return {
+        "success": True,
+        "playlist": playlist
+    }
+
+@router.head("/{playlist_id}")
+def head_playlist(
+    request: Request,
+    playlist_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Check whether a playlist changed without fetching it.
+    
+    Sends the same ETag as GET /{playlist_id} and no body; served from the
+    response cache, so an unchanged playlist costs no query.
+    """
+    entry = _playlist_payload(db, playlist_id)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
+        )
+    
+    response = Response()
+    return _not_modified(request, response, entry[1]) or response
 
 @router.get("/slug/{slug}")
-async def get_playlist_by_slug(
+def get_playlist_by_slug(
     slug: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific playlist by slug"""
-    try:
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.get_playlist_by_slug(slug)
-        
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Playlist not found"
-            )
-        
-        return {
-            "success": True,
-            "playlist": playlist.to_dict()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get playlist by slug error: {e}")
+    playlist_service = PlaylistService(db)
+    playlist = playlist_service.get_playlist_by_slug(slug)
+    
+    if not playlist:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlist"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
         )
+    
+    return {
+        "success": True,
+        "playlist": playlist.to_dict()
+    }
 
 @router.put("/{playlist_id}")
 async def update_playlist(
@@ -236,50 +334,51 @@ async def update_playlist(
     db: Session = Depends(get_db)
 ):
     """Update playlist"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        playlist_service = PlaylistService(db)
-        
-        # Check if playlist exists
-        playlist = playlist_service.get_playlist_by_id(playlist_id)
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Playlist not found"
-            )
-        
-        updated_playlist = playlist_service.update_playlist(
-            playlist_id, 
-            name=update_data.name, 
-            is_default=update_data.is_default, 
-            display_time_seconds=update_data.display_time_seconds,
-            display_mode=update_data.display_mode,
-            show_image_info=update_data.show_image_info,
-            show_exif_date=update_data.show_exif_date
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    playlist_service = PlaylistService(db)
+    
+    # Check if playlist exists
+    playlist = playlist_service.get_playlist_by_id(playlist_id)
+    if not playlist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
         )
-        
-        # Send WebSocket notification to all connected devices
-        try:
-            await connection_manager.broadcast_playlist_update(updated_playlist.to_dict())
-        except Exception as e:
-            logger.error(f"Failed to broadcast playlist update: {e}")
-        
+    
+    # The service ignores None fields, so compare only the ones it would set;
+    # a no-op update skips the write, cache invalidation and device broadcast
+    if _playlist_unchanged(playlist, update_data.dict(exclude_none=True)):
         return {
             "success": True,
-            "message": "Playlist updated successfully",
-            "playlist": updated_playlist.to_dict()
+            "message": "Playlist unchanged",
+            "playlist": _playlist_payload(db, playlist_id)[0]
         }
-        
-    except HTTPException:
-        raise
+    
+    updated_playlist = playlist_service.update_playlist(
+        playlist_id, 
+        name=update_data.name, 
+        is_default=update_data.is_default, 
+        display_time_seconds=update_data.display_time_seconds,
+        display_mode=update_data.display_mode,
+        show_image_info=update_data.show_image_info,
+        show_exif_date=update_data.show_exif_date
+    )
+    
+    playlist_dict = _fresh_playlist_payload(updated_playlist)
+    
+    # Send WebSocket notification to all connected devices
+    try:
+        await connection_manager.broadcast_playlist_update(playlist_dict)
     except Exception as e:
-        logger.error(f"Update playlist error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update playlist"
-        )
+        logger.error("Failed to broadcast playlist update: %s", e)
+    
+    return {
+        "success": True,
+        "message": "Playlist updated successfully",
+        "playlist": playlist_dict
+    }
 
 @router.delete("/{playlist_id}")
 async def delete_playlist(
@@ -289,37 +388,29 @@ async def delete_playlist(
     db: Session = Depends(get_db)
 ):
     """Delete a playlist"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        playlist_service = PlaylistService(db)
-        
-        # Check if playlist exists
-        playlist = playlist_service.get_playlist_by_id(playlist_id)
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Playlist not found"
-            )
-        
-        success = playlist_service.delete_playlist(playlist_id)
-        
-        if success:
-            return {
-                "success": True,
-                "message": "Playlist deleted successfully"
-            }
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete playlist"
-            )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Delete playlist error: {e}")
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    playlist_service = PlaylistService(db)
+    
+    # Check if playlist exists
+    playlist = playlist_service.get_playlist_by_id(playlist_id)
+    if not playlist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
+        )
+    
+    success = playlist_service.delete_playlist(playlist_id)
+    
+    if success:
+        # Its devices were unassigned; stop routing by the deleted playlist
+        connection_manager.close_playlist_room(playlist_id)
+        return {
+            "success": True,
+            "message": "Playlist deleted successfully"
+        }
+    else:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete playlist"
@@ -335,38 +426,26 @@ async def add_image_to_playlist(
     db: Session = Depends(get_db)
 ):
     """Add image to playlist"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        playlist_service = PlaylistService(db)
-        success = playlist_service.add_image_to_playlist(playlist_id, image_id, position)
-        
-        if success:
-            # Get updated playlist data and send WebSocket notification
-            updated_playlist = playlist_service.get_playlist_by_id(playlist_id)
-            if updated_playlist:
-                try:
-                    await connection_manager.broadcast_playlist_update(updated_playlist.to_dict())
-                except Exception as e:
-                    logger.error(f"Failed to broadcast playlist update: {e}")
-            
-            return {
-                "success": True,
-                "message": "Image added to playlist successfully"
-            }
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to add image to playlist"
-            )
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    playlist_service = PlaylistService(db)
+    updated_playlist = playlist_service.add_image_to_playlist(playlist_id, image_id, position)
+    
+    if updated_playlist:
+        # Send WebSocket notification
+        try:
+            await connection_manager.broadcast_playlist_update(_fresh_playlist_payload(updated_playlist))
+        except Exception as e:
+            logger.error("Failed to broadcast playlist update: %s", e)
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Add image to playlist error: {e}")
+        return {
+            "success": True,
+            "message": "Image added to playlist successfully"
+        }
+    else:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to add image to playlist"
         )
 
@@ -379,38 +458,26 @@ async def remove_image_from_playlist(
     db: Session = Depends(get_db)
 ):
     """Remove image from playlist"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        playlist_service = PlaylistService(db)
-        success = playlist_service.remove_image_from_playlist(playlist_id, image_id)
-        
-        if success:
-            # Get updated playlist data and send WebSocket notification
-            updated_playlist = playlist_service.get_playlist_by_id(playlist_id)
-            if updated_playlist:
-                try:
-                    await connection_manager.broadcast_playlist_update(updated_playlist.to_dict())
-                except Exception as e:
-                    logger.error(f"Failed to broadcast playlist update: {e}")
-            
-            return {
-                "success": True,
-                "message": "Image removed from playlist successfully"
-            }
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to remove image from playlist"
-            )
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    playlist_service = PlaylistService(db)
+    updated_playlist = playlist_service.remove_image_from_playlist(playlist_id, image_id)
+    
+    if updated_playlist:
+        # Send WebSocket notification
+        try:
+            await connection_manager.broadcast_playlist_update(_fresh_playlist_payload(updated_playlist))
+        except Exception as e:
+            logger.error("Failed to broadcast playlist update: %s", e)
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Remove image from playlist error: {e}")
+        return {
+            "success": True,
+            "message": "Image removed from playlist successfully"
+        }
+    else:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to remove image from playlist"
         )
 
@@ -423,91 +490,78 @@ async def reorder_playlist(
     db: Session = Depends(get_db)
 ):
     """Reorder images in playlist and compute pairing sequence"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        from services.image_pairing_service import image_classification_service
-        from models.image import Image
-        from models.display_device import DisplayDevice
-        
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.get_playlist_by_id(playlist_id)
-        
-        if not playlist:
-            raise HTTPException(status_code=404, detail="Playlist not found")
-        
-        # Reorder playlist
-        success = playlist_service.reorder_playlist(playlist_id, reorder_data.image_ids)
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to reorder playlist"
-            )
-        
-        # Get display orientation from assigned device (if any)
-        display_orientation = 'portrait'  # Default
-        if playlist.id:
-            # Find device(s) using this playlist
-            device = db.query(DisplayDevice).filter(DisplayDevice.playlist_id == playlist.id).first()
-            if device and device.orientation:
-                display_orientation = device.orientation
-        
-        # Compute pairing sequence
-        images = db.query(Image).filter(Image.playlist_id == playlist_id).all()
-        image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
-        
-        # Create ordered image data based on reorder_data
-        image_map = {img['id']: img for img in image_data}
-        ordered_images = [image_map[img_id] for img_id in reorder_data.image_ids if img_id in image_map]
-        
-        computed = image_classification_service.compute_sequence(ordered_images, display_orientation)
-        playlist.computed_sequence = computed
-        
-        db.commit()
-        db.refresh(playlist)
-        
-        # Auto-generate variants after sequence change (in background)
-        import os
-        use_celery = os.getenv('USE_CELERY', 'true').lower() == 'true'
-        try:
-            if use_celery:
-                from tasks.image_processing import generate_playlist_variants
-                generate_playlist_variants.apply_async(args=[playlist_id], queue='normal_priority')
-                logger.info(f"Queued playlist variant generation for playlist {playlist_id}")
-            else:
-                # Fallback to synchronous (not recommended for production)
-                from services.playlist_variant_service import PlaylistVariantService
-                variant_service = PlaylistVariantService(db)
-                variant_result = variant_service.generate_variants_for_playlist(playlist_id)
-                logger.info(f"Auto-generated {variant_result.get('count', 0)} variants after reorder")
-        except Exception as e:
-            logger.error(f"Auto variant generation failed (non-fatal): {e}")
-            # Don't fail the reorder if variant generation fails
-        
-        # Send WebSocket notification
-        updated_playlist = playlist_service.get_playlist_by_id(playlist_id)
-        if updated_playlist:
-            try:
-                await connection_manager.broadcast_playlist_update(updated_playlist.to_dict())
-            except Exception as e:
-                logger.error(f"Failed to broadcast playlist update: {e}")
-        
-        return {
-            "success": True,
-            "message": "Playlist reordered successfully",
-            "computed_sequence": computed
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Reorder playlist error: {e}")
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    from services.image_pairing_service import image_classification_service
+    from models.image import Image
+    from models.display_device import DisplayDevice
+    
+    playlist_service = PlaylistService(db)
+    playlist = playlist_service.get_playlist_by_id(playlist_id)
+    
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    # Reorder playlist
+    success = playlist_service.reorder_playlist(playlist_id, reorder_data.image_ids)
+    
+    if not success:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to reorder playlist"
         )
+    
+    # Get display orientation from an assigned device (if any), reading just that column
+    display_orientation = db.query(DisplayDevice.orientation).filter(
+        DisplayDevice.playlist_id == playlist.id,
+        DisplayDevice.orientation.isnot(None)
+    ).limit(1).scalar() or 'portrait'  # Default
+    
+    # Compute pairing sequence
+    images = db.query(Image.id, Image.width, Image.height).filter(Image.playlist_id == playlist_id).all()
+    image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
+    
+    # Create ordered image data based on reorder_data
+    image_map = {img['id']: img for img in image_data}
+    ordered_images = [image_map[img_id] for img_id in reorder_data.image_ids if img_id in image_map]
+    
+    computed = image_classification_service.compute_sequence(ordered_images, display_orientation)
+    playlist.computed_sequence = computed
+    
+    db.commit()
+    db.refresh(playlist)
+    invalidate_playlist_cache(playlist_id)
+    
+    # Auto-generate variants after sequence change (in background)
+    import os
+    use_celery = os.getenv('USE_CELERY', 'true').lower() == 'true'
+    try:
+        if use_celery:
+            from tasks.image_processing import generate_playlist_variants
+            generate_playlist_variants.apply_async(args=[playlist_id], queue='normal_priority')
+            logger.info("Queued playlist variant generation for playlist %s", playlist_id)
+        else:
+            # Fallback to synchronous (not recommended for production)
+            from services.playlist_variant_service import PlaylistVariantService
+            variant_service = PlaylistVariantService(db)
+            variant_result = variant_service.generate_variants_for_playlist(playlist_id)
+            logger.info("Auto-generated %s variants after reorder", variant_result.get('count', 0))
+    except Exception as e:
+        logger.error("Auto variant generation failed (non-fatal): %s", e)
+        # Don't fail the reorder if variant generation fails
+    
+    # Send WebSocket notification (playlist was refreshed after the commit above)
+    try:
+        await connection_manager.broadcast_playlist_update(_fresh_playlist_payload(playlist))
+    except Exception as e:
+        logger.error("Failed to broadcast playlist update: %s", e)
+    
+    return {
+        "success": True,
+        "message": "Playlist reordered successfully",
+        "computed_sequence": computed
+    }
 
 @router.post("/{playlist_id}/validate-order")
 async def validate_playlist_order(
@@ -517,55 +571,45 @@ async def validate_playlist_order(
     db: Session = Depends(get_db)
 ):
     """Validate playlist order for optimal pairing"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
-        
-        # Get request body
-        body = await request.json()
-        sequence = body.get('sequence')
-        display_orientation = body.get('display_orientation', 'portrait')
-        
-        if not sequence:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Sequence is required"
-            )
-        
-        # Get playlist and images
-        from services.image_pairing_service import image_classification_service
-        from models.image import Image
-        
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.get_playlist_by_id(playlist_id)
-        
-        if not playlist:
-            raise HTTPException(status_code=404, detail="Playlist not found")
-        
-        # Get image metadata
-        images = db.query(Image).filter(Image.playlist_id == playlist_id).all()
-        image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
-        
-        # Validate sequence
-        validation = image_classification_service.validate_sequence_consistency(
-            sequence, image_data, display_orientation
-        )
-        
-        return {
-            "is_valid": validation['is_valid'],
-            "errors": validation['errors'],
-            "optimal_sequence": validation['optimal_sequence'],
-            "optimal_computed": validation['optimal_computed']
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Validate playlist order error: {e}")
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    # Get request body
+    body = await request.json()
+    sequence = body.get('sequence')
+    display_orientation = body.get('display_orientation', 'portrait')
+    
+    if not sequence:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to validate playlist order"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sequence is required"
         )
+    
+    # Get playlist and images
+    from services.image_pairing_service import image_classification_service
+    from models.image import Image
+    
+    playlist_service = PlaylistService(db)
+    playlist = playlist_service.get_playlist_by_id(playlist_id)
+    
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    # Get image metadata
+    images = db.query(Image.id, Image.width, Image.height).filter(Image.playlist_id == playlist_id).all()
+    image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
+    
+    # Validate sequence
+    validation = image_classification_service.validate_sequence_consistency(
+        sequence, image_data, display_orientation
+    )
+    
+    return {
+        "is_valid": validation['is_valid'],
+        "errors": validation['errors'],
+        "optimal_sequence": validation['optimal_sequence'],
+        "optimal_computed": validation['optimal_computed']
+    }
 
 @router.post("/{playlist_id}/randomize")
 async def randomize_playlist(
@@ -576,127 +620,108 @@ async def randomize_playlist(
     db: Session = Depends(get_db)
 ):
     """Randomize the order of images in playlist with smart pairing preservation"""
-    try:
-        # CSRF protection
-        csrf_protection.require_csrf_token(request)
+    # CSRF protection
+    csrf_protection.require_csrf_token(request)
+    
+    display_orientation = randomize_data.display_orientation
+    preserve_pairing = randomize_data.preserve_pairing
+    
+    from services.image_pairing_service import image_classification_service
+    from models.image import Image
+    import random
+    
+    playlist_service = PlaylistService(db)
+    playlist = playlist_service.get_playlist_by_id(playlist_id)
+    
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    if preserve_pairing:
+        # Smart randomize: shuffle while preserving optimal pairing
+        images = db.query(Image.id, Image.width, Image.height).filter(Image.playlist_id == playlist_id).all()
         
-        display_orientation = randomize_data.display_orientation
-        preserve_pairing = randomize_data.preserve_pairing
+        image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
         
-        from services.image_pairing_service import image_classification_service
-        from models.image import Image
-        import random
+        # Separate by orientation
+        landscapes, portraits = image_classification_service.split_by_orientation(image_data)
         
-        playlist_service = PlaylistService(db)
-        playlist = playlist_service.get_playlist_by_id(playlist_id)
+        # Shuffle each group
+        random.shuffle(landscapes)
+        random.shuffle(portraits)
         
-        if not playlist:
-            raise HTTPException(status_code=404, detail="Playlist not found")
+        # Combine and shuffle again for variety
+        all_shuffled = landscapes + portraits
+        random.shuffle(all_shuffled)
         
-        # Get all images for this playlist
-        images = db.query(Image).filter(Image.playlist_id == playlist_id).all()
+        # Compute optimal sequence from shuffled images
+        computed = image_classification_service.compute_sequence(all_shuffled, display_orientation)
+        new_sequence = [img_id for entry in computed for img_id in entry['images']]
         
-        if preserve_pairing:
-            # Smart randomize: shuffle while preserving optimal pairing
-            image_data = [{'id': img.id, 'width': img.width, 'height': img.height} for img in images]
-            
-            # Separate by orientation
-            landscapes = [img for img in image_data if image_classification_service.classify_image(img['width'], img['height']) == 'landscape']
-            portraits = [img for img in image_data if image_classification_service.classify_image(img['width'], img['height']) == 'portrait']
-            
-            # Shuffle each group
-            random.shuffle(landscapes)
-            random.shuffle(portraits)
-            
-            # Combine and shuffle again for variety
-            all_shuffled = landscapes + portraits
-            random.shuffle(all_shuffled)
-            
-            # Compute optimal sequence from shuffled images
-            computed = image_classification_service.compute_sequence(all_shuffled, display_orientation)
-            new_sequence = [img_id for entry in computed for img_id in entry['images']]
-            
-            # Update playlist
-            playlist.sequence = new_sequence
-            playlist.computed_sequence = computed
+        # Update playlist
+        playlist.sequence = new_sequence
+        playlist.computed_sequence = computed
+    else:
+        # Simple randomize without pairing preservation
+        success = playlist_service.randomize_playlist(playlist_id)
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to randomize playlist"
+            )
+    
+    db.commit()
+    db.refresh(playlist)
+    invalidate_playlist_cache(playlist_id)
+    
+    # Auto-generate variants after sequence change (in background)
+    import os
+    use_celery = os.getenv('USE_CELERY', 'true').lower() == 'true'
+    try:
+        if use_celery:
+            from tasks.image_processing import generate_playlist_variants
+            generate_playlist_variants.apply_async(args=[playlist_id], queue='normal_priority')
+            logger.info("Queued playlist variant generation for playlist %s", playlist_id)
         else:
-            # Simple randomize without pairing preservation
-            success = playlist_service.randomize_playlist(playlist_id)
-            if not success:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to randomize playlist"
-                )
-        
-        db.commit()
-        db.refresh(playlist)
-        
-        # Auto-generate variants after sequence change (in background)
-        import os
-        use_celery = os.getenv('USE_CELERY', 'true').lower() == 'true'
-        try:
-            if use_celery:
-                from tasks.image_processing import generate_playlist_variants
-                generate_playlist_variants.apply_async(args=[playlist_id], queue='normal_priority')
-                logger.info(f"Queued playlist variant generation for playlist {playlist_id}")
-            else:
-                # Fallback to synchronous (not recommended for production)
-                from services.playlist_variant_service import PlaylistVariantService
-                variant_service = PlaylistVariantService(db)
-                variant_result = variant_service.generate_variants_for_playlist(playlist_id)
-                logger.info(f"Auto-generated {variant_result.get('count', 0)} variants after randomize")
-        except Exception as e:
-            logger.error(f"Auto variant generation failed (non-fatal): {e}")
-            # Don't fail the randomize if variant generation fails
-        
-        # Send WebSocket notification
-        try:
-            await connection_manager.broadcast_playlist_update(playlist.to_dict())
-        except Exception as e:
-            logger.error(f"Failed to broadcast playlist update: {e}")
-        
-        return {
-            "success": True,
-            "message": "Playlist randomized successfully",
-            "new_sequence": playlist.sequence,
-            "computed_sequence": playlist.computed_sequence
-        }
-        
-    except HTTPException:
-        raise
+            # Fallback to synchronous (not recommended for production)
+            from services.playlist_variant_service import PlaylistVariantService
+            variant_service = PlaylistVariantService(db)
+            variant_result = variant_service.generate_variants_for_playlist(playlist_id)
+            logger.info("Auto-generated %s variants after randomize", variant_result.get('count', 0))
     except Exception as e:
-        logger.error(f"Randomize playlist error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to randomize playlist"
-        )
+        logger.error("Auto variant generation failed (non-fatal): %s", e)
+        # Don't fail the randomize if variant generation fails
+    
+    # Send WebSocket notification
+    try:
+        await connection_manager.broadcast_playlist_update(_fresh_playlist_payload(playlist))
+    except Exception as e:
+        logger.error("Failed to broadcast playlist update: %s", e)
+    
+    return {
+        "success": True,
+        "message": "Playlist randomized successfully",
+        "new_sequence": playlist.sequence,
+        "computed_sequence": playlist.computed_sequence
+    }
 
 @router.get("/{playlist_id}/images")
-async def get_playlist_images(
+def get_playlist_images(
     playlist_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get playlist images in order"""
-    try:
-        playlist_service = PlaylistService(db)
-        images = playlist_service.get_playlist_images_ordered(playlist_id)
-        
-        return {
-            "success": True,
-            "images": [image.to_dict() for image in images],
-            "count": len(images)
-        }
-        
-    except Exception as e:
-        logger.error(f"Get playlist images error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlist images"
-        )
+    playlist_service = PlaylistService(db)
+    images = playlist_service.get_playlist_images_ordered(playlist_id)
+    
+    return {
+        "success": True,
+        "images": [image.to_dict() for image in images],
+        "count": len(images)
+    }
 
 @router.get("/{playlist_id}/images/manifest")
-async def get_playlist_images_manifest(
+def get_playlist_images_manifest(
     playlist_id: int,
     request: Request,
     db: Session = Depends(get_db)
@@ -709,85 +734,63 @@ async def get_playlist_images_manifest(
     
     Response includes: id, url, filename, mime_type, file_size
     """
-    try:
-        # Check if playlist exists
-        playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Playlist {playlist_id} not found"
-            )
-        
-        # Get ordered images
-        playlist_service = PlaylistService(db)
-        images = playlist_service.get_playlist_images_ordered(playlist_id)
-        
-        # Build lightweight manifest using API smart image endpoint
-        manifest = []
-        for image in images:
-            # Use smart image API endpoint (matches the URL pattern used by the slideshow)
-            # This endpoint automatically handles device resolution and returns optimized images
-            image_url = f"/api/images/{image.id}/smart"
-            
-            manifest.append({
-                "id": str(image.id),  # String for IndexedDB key
-                "url": image_url,
-                "filename": image.filename,
-                "mime_type": image.mime_type or "image/jpeg",
-                "file_size": image.file_size or 0,
-                "checksum": image.file_hash,  # MD5 hash for cache invalidation
-                "updated_at": image.uploaded_at.isoformat() if image.uploaded_at else None,
-            })
-        
-        logger.info(
-            f"Generated manifest for playlist {playlist_id} ({playlist.name}): "
-            f"{len(manifest)} images, "
-            f"~{sum(img['file_size'] for img in manifest) / (1024*1024):.1f}MB total"
-        )
-        
-        return {
-            "success": True,
-            "playlist_id": playlist_id,
-            "playlist_name": playlist.name,
-            "manifest": manifest,
-            "count": len(manifest),
-            "total_size": sum(img["file_size"] for img in manifest),
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"MANIFEST ERROR: {e}")
-        print(f"TRACEBACK:\n{error_details}")
-        logger.error(f"Get playlist manifest error: {e}", exc_info=True)
+    # Check if playlist exists
+    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+    if not playlist:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve playlist manifest: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Playlist {playlist_id} not found"
         )
+    
+    # Get ordered images
+    playlist_service = PlaylistService(db)
+    images = playlist_service.get_playlist_images_ordered(playlist_id)
+    
+    # Build lightweight manifest using API smart image endpoint
+    manifest = []
+    for image in images:
+        # Use smart image API endpoint (matches the URL pattern used by the slideshow)
+        # This endpoint automatically handles device resolution and returns optimized images
+        image_url = f"/api/images/{image.id}/smart"
+        
+        manifest.append({
+            "id": str(image.id),  # String for IndexedDB key
+            "url": image_url,
+            "filename": image.filename,
+            "mime_type": image.mime_type or "image/jpeg",
+            "file_size": image.file_size or 0,
+            "checksum": image.file_hash,  # MD5 hash for cache invalidation
+            "updated_at": image.uploaded_at.isoformat() if image.uploaded_at else None,
+        })
+    
+    total_size = sum(img["file_size"] for img in manifest)
+    logger.info(
+        "Generated manifest for playlist %s (%s): %s images, ~%.1fMB total",
+        playlist_id, playlist.name, len(manifest), total_size / (1024*1024)
+    )
+    
+    return {
+        "success": True,
+        "playlist_id": playlist_id,
+        "playlist_name": playlist.name,
+        "manifest": manifest,
+        "count": len(manifest),
+        "total_size": total_size,
+    }
 
 @router.get("/stats/overview")
-async def get_playlist_statistics(
+def get_playlist_statistics(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get playlist statistics"""
-    try:
-        playlist_service = PlaylistService(db)
-        stats = playlist_service.get_playlist_statistics()
-        
-        return {
-            "success": True,
-            "statistics": stats
-        }
-        
-    except Exception as e:
-        logger.error(f"Get playlist statistics error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlist statistics"
-        )
+    playlist_service = PlaylistService(db)
+    stats = playlist_service.get_playlist_statistics()
+    
+    return {
+        "success": True,
+        "statistics": stats
+    }
 
 # Playlist Variant Endpoints
 
@@ -798,52 +801,42 @@ async def generate_playlist_variants(
     db: Session = Depends(get_db)
 ):
     """Generate resolution-specific variants for a playlist"""
-    try:
-        # Check if playlist exists
-        playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Playlist not found"
-            )
-        
-        # Get configured display sizes for diagnostics
-        from services.image_storage_service import image_storage_service
-        configured_sizes = image_storage_service._load_display_sizes()
-        logger.info(f"🎯 Variant generation request for '{playlist.name}'")
-        logger.info(f"📐 Configured display sizes from database: {configured_sizes}")
-        
-        # Generate variants
-        variant_service = PlaylistVariantService(db)
-        variants = variant_service.generate_variants_for_playlist(playlist_id)
-        
-        # Get generation errors if any
-        generation_errors = getattr(variant_service, '_last_generation_errors', [])
-        
-        # Enhanced response with diagnostic info
-        return {
-            "success": True,
-            "message": f"Generated {len(variants)} variants for playlist {playlist.name}",
-            "playlist_id": playlist_id,
-            "playlist_name": playlist.name,
-            "variants": [variant.to_dict() for variant in variants],
-            "count": len(variants),
-            "diagnostic": {
-                "configured_display_sizes": [f"{w}x{h}" for w, h in configured_sizes],
-                "configured_count": len(configured_sizes),
-                "variants_generated": len(variants),
-                "errors": generation_errors
-            }
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Generate playlist variants error: {e}")
+    # Check if playlist exists
+    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+    if not playlist:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate playlist variants: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
         )
+    
+    # Get configured display sizes for diagnostics
+    from services.image_storage_service import image_storage_service
+    configured_sizes = image_storage_service._load_display_sizes()
+    logger.info("🎯 Variant generation request for '%s'", playlist.name)
+    logger.info("📐 Configured display sizes from database: %s", configured_sizes)
+    
+    # Generate variants
+    variant_service = PlaylistVariantService(db)
+    variants = variant_service.generate_variants_for_playlist(playlist_id)
+    
+    # Get generation errors if any
+    generation_errors = getattr(variant_service, '_last_generation_errors', [])
+    
+    # Enhanced response with diagnostic info
+    return {
+        "success": True,
+        "message": f"Generated {len(variants)} variants for playlist {playlist.name}",
+        "playlist_id": playlist_id,
+        "playlist_name": playlist.name,
+        "variants": [variant.to_dict() for variant in variants],
+        "count": len(variants),
+        "diagnostic": {
+            "configured_display_sizes": [f"{w}x{h}" for w, h in configured_sizes],
+            "configured_count": len(configured_sizes),
+            "variants_generated": len(variants),
+            "errors": generation_errors
+        }
+    }
 
 @router.post("/generate-all-variants")
 async def generate_all_playlist_variants(
@@ -886,6 +879,10 @@ async def generate_all_playlist_variants(
         db.commit()
         print("🔄 [DEBUG] Commit successful", flush=True)
         
+        # Resolve the configured sizes once for the whole run instead of once per image
+        from services.image_storage_service import image_storage_service
+        display_sizes = image_storage_service._load_display_sizes()
+        
         # Queue tasks using Celery or fallback
         queued_count = 0
         if use_celery:
@@ -894,23 +891,22 @@ async def generate_all_playlist_variants(
                 for image in images_in_playlists:
                     process_variants.apply_async(
                         args=[image.id, image.filename, 1],
+                        kwargs={'display_sizes': display_sizes},
                         queue='low_priority'  # Bulk regeneration is low priority
                     )
                     queued_count += 1
-                logger.info(f"✅ Queued {queued_count} playlist images in Celery (low priority queue)")
+                logger.info("✅ Queued %s playlist images in Celery (low priority queue)", queued_count)
             except Exception as celery_error:
-                logger.warning(f"Celery unavailable, falling back to BackgroundTasks: {celery_error}")
-                from api.images import _process_variants_for_image
-                for image in images_in_playlists:
-                    background_tasks.add_task(_process_variants_for_image, image.id, image.filename, 1)
-                    queued_count += 1
-                logger.info(f"✅ Queued {queued_count} playlist images in BackgroundTasks (fallback)")
+                logger.warning("Celery unavailable, falling back to BackgroundTasks: %s", celery_error)
+                from api.images import _run_variants_batch
+                background_tasks.add_task(_run_variants_batch, [(image.id, image.filename) for image in images_in_playlists], display_sizes)
+                queued_count = len(images_in_playlists)
+                logger.info("✅ Queued %s playlist images in BackgroundTasks (fallback)", queued_count)
         else:
-            from api.images import _process_variants_for_image
-            for image in images_in_playlists:
-                background_tasks.add_task(_process_variants_for_image, image.id, image.filename, 1)
-                queued_count += 1
-            logger.info(f"✅ Queued {queued_count} playlist images in BackgroundTasks")
+            from api.images import _run_variants_batch
+            background_tasks.add_task(_run_variants_batch, [(image.id, image.filename) for image in images_in_playlists], display_sizes)
+            queued_count = len(images_in_playlists)
+            logger.info("✅ Queued %s playlist images in BackgroundTasks", queued_count)
         
         return {
             "message": f"Queued {queued_count} playlist images for variant regeneration",
@@ -928,8 +924,8 @@ async def generate_all_playlist_variants(
         error_trace = traceback.format_exc()
         print(f"❌ [DEBUG] Exception in generate-all-variants: {e}", flush=True)
         print(f"❌ [DEBUG] Traceback:\n{error_trace}", flush=True)
-        logger.error(f"Generate all playlist variants error: {e}")
-        logger.error(f"Traceback: {error_trace}")
+        logger.error("Generate all playlist variants error: %s", e)
+        logger.error("Traceback: %s", error_trace)
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -937,150 +933,133 @@ async def generate_all_playlist_variants(
         )
 
 @router.get("/{playlist_id}/variants")
-async def get_playlist_variants(
+def get_playlist_variants(
     playlist_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all variants for a playlist"""
-    try:
-        from models.playlist_variant import PlaylistVariant
-        
-        # Check if playlist exists
-        playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-        if not playlist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Playlist not found"
-            )
-        
-        # Get variants
-        variants = db.query(PlaylistVariant).filter(PlaylistVariant.playlist_id == playlist_id).all()
-        
-        return {
-            "message": f"Retrieved {len(variants)} variants for playlist {playlist.name}",
-            "playlist_id": playlist_id,
-            "variants": [variant.to_dict() for variant in variants],
-            "count": len(variants)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get playlist variants error: {e}")
+    from models.playlist_variant import PlaylistVariant
+    
+    # Check if playlist exists
+    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+    if not playlist:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve playlist variants"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
         )
+    
+    # Get variants
+    variants = db.query(PlaylistVariant).filter(PlaylistVariant.playlist_id == playlist_id).all()
+    
+    return {
+        "message": f"Retrieved {len(variants)} variants for playlist {playlist.name}",
+        "playlist_id": playlist_id,
+        "variants": [variant.to_dict() for variant in variants],
+        "count": len(variants)
+    }
 
 @router.get("/{playlist_id}/smart")
-async def get_playlist_smart(
+def get_playlist_smart(
     playlist_id: int,
     request: Request,
     db: Session = Depends(get_db)
 ):
     """Get playlist optimized for device resolution (public endpoint for display devices)"""
-    try:
-        from models.playlist_variant import PlaylistVariant
-        from services.database_config_service import DatabaseConfigService
-        
-        # Get global show_image_info setting
-        config_service = DatabaseConfigService(db)
-        show_image_info = config_service.get_setting("show_image_info", False)
-        
-        # Get device token from cookie
-        cookie_manager = CookieManager()
-        device_token = cookie_manager.get_display_device_cookie(request)
-        
-        if not device_token:
-            raise HTTPException(status_code=401, detail="Display device not authenticated")
-        
-        # Verify device exists and is authorized
-        device_service = DisplayDeviceService(db)
-        device = device_service.get_device_by_token(device_token)
-        
-        if not device:
-            raise HTTPException(status_code=404, detail="Display device not found")
-        
-        if device.status != DeviceStatus.AUTHORIZED:
-            raise HTTPException(status_code=403, detail="Display device not authorized")
-        
-        # Get device resolution
-        device_width = device.screen_width or 1920
-        device_height = device.screen_height or 1080
-        device_pixel_ratio = float(device.device_pixel_ratio or "1.0")
-        
-        # Get all available variants for this playlist
-        all_variants = db.query(PlaylistVariant).filter(PlaylistVariant.playlist_id == playlist_id).all()
-        available_variants_list = [
-            {
-                "id": v.id,
-                "type": v.variant_type.value,
-                "target": f"{v.target_width}x{v.target_height}",
-                "image_count": v.image_count
-            } for v in all_variants
-        ]
-        
-        # Log variant selection process
-        logger.info(f"Smart playlist request for playlist {playlist_id}, device: {device_token[:8]}...")
-        logger.info(f"Device resolution: {device_width}x{device_height} (DPR: {device_pixel_ratio})")
-        logger.info(f"Available variants: {len(all_variants)}")
+    from models.playlist_variant import PlaylistVariant
+    from services.database_config_service import DatabaseConfigService
+    
+    # Get global show_image_info setting
+    config_service = DatabaseConfigService(db)
+    show_image_info = config_service.get_setting("show_image_info", False)
+    
+    # Get device token from cookie
+    cookie_manager = CookieManager()
+    device_token = cookie_manager.get_display_device_cookie(request)
+    
+    if not device_token:
+        raise HTTPException(status_code=401, detail="Display device not authenticated")
+    
+    # Verify device exists and is authorized
+    device_service = DisplayDeviceService(db)
+    device = device_service.get_device_by_token(device_token)
+    
+    if not device:
+        raise HTTPException(status_code=404, detail="Display device not found")
+    
+    if device.status != DeviceStatus.AUTHORIZED:
+        raise HTTPException(status_code=403, detail="Display device not authorized")
+    
+    # Get device resolution
+    device_width = device.screen_width or 1920
+    device_height = device.screen_height or 1080
+    device_pixel_ratio = float(device.device_pixel_ratio or "1.0")
+    
+    # Get all available variants for this playlist
+    all_variants = db.query(PlaylistVariant).filter(PlaylistVariant.playlist_id == playlist_id).all()
+    available_variants_list = [
+        {
+            "id": v.id,
+            "type": v.variant_type.value,
+            "target": f"{v.target_width}x{v.target_height}",
+            "image_count": v.image_count
+        } for v in all_variants
+    ]
+    
+    # Log variant selection process
+    logger.info("Smart playlist request for playlist %s, device: %s...", playlist_id, device_token[:8])
+    logger.info("Device resolution: %sx%s (DPR: %s)", device_width, device_height, device_pixel_ratio)
+    logger.info("Available variants: %s", len(all_variants))
+    if logger.isEnabledFor(logging.INFO):
         for v in all_variants:
-            logger.info(f"  - {v.variant_type.value}: {v.target_width}x{v.target_height} ({v.image_count} images)")
-        
-        # Get best variant for this device
-        variant_service = PlaylistVariantService(db)
-        best_variant = variant_service.get_best_variant_for_device(
-            playlist_id, device_width, device_height, device_pixel_ratio
-        )
-        
-        if not best_variant:
-            # Fallback to original playlist
-            playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-            if not playlist:
-                raise HTTPException(status_code=404, detail="Playlist not found")
-            
-            logger.warning(f"No variant found for {device_width}x{device_height}, using original")
-            
-            # Add global show_image_info setting to playlist
-            playlist_dict = playlist.to_dict()
-            playlist_dict["show_image_info"] = show_image_info
-            
-            return {
-                "message": "Using original playlist (no variants available)",
-                "playlist": playlist_dict,
-                "variant_type": "original",
-                "device_resolution": f"{device_width}x{device_height}",
-                "effective_resolution": f"{int(device_width * device_pixel_ratio)}x{int(device_height * device_pixel_ratio)}",
-                "available_variants": available_variants_list
-            }
-        
-        # Get playlist details
-        playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+            logger.info("  - %s: %sx%s (%s images)", v.variant_type.value, v.target_width, v.target_height, v.image_count)
+    
+    # Get best variant for this device
+    variant_service = PlaylistVariantService(db)
+    best_variant = variant_service.get_best_variant_for_device(
+        playlist_id, device_width, device_height, device_pixel_ratio
+    )
+    
+    # Cached playlist dict shared with GET /{id}; copied before adding per-device fields
+    entry = _playlist_payload(db, playlist_id)
+    
+    if not best_variant:
+        # Fallback to original playlist
+        if not entry:
+            raise HTTPException(status_code=404, detail="Playlist not found")
         
-        # Create optimized playlist response
-        optimized_playlist = playlist.to_dict()
-        optimized_playlist["sequence"] = best_variant.optimized_sequence
-        optimized_playlist["image_count"] = best_variant.image_count
-        optimized_playlist["show_image_info"] = show_image_info  # Add global setting
+        logger.warning("No variant found for %sx%s, using original", device_width, device_height)
         
-        logger.info(f"Selected variant: {best_variant.variant_type.value} ({best_variant.target_width}x{best_variant.target_height})")
+        # Add global show_image_info setting to playlist
+        playlist_dict = dict(entry[0])
+        playlist_dict["show_image_info"] = show_image_info
         
         return {
-            "message": f"Using {best_variant.variant_type.value} variant for device",
-            "playlist": optimized_playlist,
-            "variant": best_variant.to_dict(),
+            "message": "Using original playlist (no variants available)",
+            "playlist": playlist_dict,
+            "variant_type": "original",
             "device_resolution": f"{device_width}x{device_height}",
             "effective_resolution": f"{int(device_width * device_pixel_ratio)}x{int(device_height * device_pixel_ratio)}",
             "available_variants": available_variants_list
         }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get smart playlist error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve optimized playlist"
-        )
+    
+    if not entry:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    # Create optimized playlist response
+    optimized_playlist = dict(entry[0])
+    optimized_playlist["sequence"] = best_variant.optimized_sequence
+    optimized_playlist["image_count"] = best_variant.image_count
+    optimized_playlist["show_image_info"] = show_image_info  # Add global setting
+    
+    logger.info("Selected variant: %s (%sx%s)", best_variant.variant_type.value, best_variant.target_width, best_variant.target_height)
+    
+    return {
+        "message": f"Using {best_variant.variant_type.value} variant for device",
+        "playlist": optimized_playlist,
+        "variant": best_variant.to_dict(),
+        "device_resolution": f"{device_width}x{device_height}",
+        "effective_resolution": f"{int(device_width * device_pixel_ratio)}x{int(device_height * device_pixel_ratio)}",
+        "available_variants": available_variants_list
+    }
 
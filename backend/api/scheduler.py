@@ -15,6 +15,7 @@ from services.scheduler_service import SchedulerService
 from utils.csrf import csrf_protection
 from websocket.scheduler_events import schedule_created_event, schedule_updated_event, schedule_deleted_event
 from websocket.redis_bridge import publish_processing_update
+from websocket.manager import connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -535,6 +536,8 @@ async def evaluate_now(
         # Call the function directly (not via Celery) for immediate result
         scheduler_service = SchedulerService(db)
         result = scheduler_service.evaluate_all_devices()
+        for change in result['changes']:
+            connection_manager.move_device(change['device_id'], change['new_playlist_id'])
         
         logger.info(f"Manual schedule evaluation triggered by {current_user.username}")
         
@@ -6,6 +6,7 @@ including thumbnail generation, variant creation, and bulk regeneration jobs.
 """
 
 from celery import Celery
+from celery.signals import worker_process_init
 import os
 import logging
 
@@ -15,6 +16,10 @@ logger = logging.getLogger(__name__)
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+# Database pool per worker child process (prefork children run one task at a time)
+CELERY_DB_POOL_SIZE = int(os.getenv('CELERY_DB_POOL_SIZE', '2'))
+CELERY_DB_MAX_OVERFLOW = int(os.getenv('CELERY_DB_MAX_OVERFLOW', '3'))
+
 # Create Celery app instance
 celery_app = Celery(
     'glowworm',
@@ -91,6 +96,12 @@ celery_app.conf.beat_schedule = {
     },
 }
 
+@worker_process_init.connect
+def configure_worker_database_pool(**kwargs):
+    """Give each worker child its own small connection pool instead of the API-sized one"""
+    from models import database as db_module
+    db_module.configure_pool(pool_size=CELERY_DB_POOL_SIZE, max_overflow=CELERY_DB_MAX_OVERFLOW)
+
 logger.info(f"📋 Celery app initialized with broker: {CELERY_BROKER_URL}")
 logger.info(f"📋 Result backend: {CELERY_RESULT_BACKEND}")
 logger.info(f"📋 Task queues configured: high_priority, normal_priority, low_priority")
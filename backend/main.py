@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, ORJSONResponse
 import os
 import logging
 from contextlib import asynccontextmanager
@@ -33,6 +33,7 @@ from websocket.manager import connection_manager
 from models.database import create_tables
 from utils.security_headers import add_security_headers
 from utils.performance_middleware import PerformanceMonitoringMiddleware
+from utils.error_middleware import ErrorCatchMiddleware
 
 # Configure logging
 from utils.logger import get_logger
@@ -65,6 +66,10 @@ async def lifespan(app: FastAPI):
     import asyncio
     heartbeat_task = asyncio.create_task(connection_manager.start_heartbeat_cleanup())
     
+    # Start batched user log writer
+    from services.user_log_writer import user_log_writer
+    user_log_task = asyncio.create_task(user_log_writer.run())
+    
     # Start Redis subscriber for cross-process WebSocket notifications
     redis_subscriber_task = None
     try:
@@ -85,6 +90,13 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
     
+    # Stop user log writer (flushes buffered entries)
+    user_log_task.cancel()
+    try:
+        await user_log_task
+    except asyncio.CancelledError:
+        pass
+    
     # Stop Redis subscriber
     try:
         if redis_subscriber_task:
@@ -96,9 +108,13 @@ app = FastAPI(
     title="GlowWorm API",
     description="Digital photo display application API",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Turn unhandled route errors into a JSON 500 (added first, so it sits innermost)
+app.add_middleware(ErrorCatchMiddleware)
+
 # Add security headers middleware
 add_security_headers(app)
 
@@ -202,4 +218,5 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=settings.backend_port)
+    from utils.http_protocol import SendBufferHttpToolsProtocol
+    uvicorn.run(app, host="0.0.0.0", port=settings.backend_port, http=SendBufferHttpToolsProtocol)
@@ -3,6 +3,7 @@ from .database import Base, engine, SessionLocal, get_db, create_tables, drop_ta
 from .user import User, UserRole
 from .session import UserSession
 from .image import Image
+from .image_variant import ImageVariant
 from .album import Album
 from .playlist import Playlist, DisplayMode
 from .playlist_variant import PlaylistVariant, PlaylistVariantType
@@ -26,6 +27,7 @@ __all__ = [
     "UserRole",
     "UserSession",
     "Image",
+    "ImageVariant",
     "Album", 
     "Playlist",
     "DisplayMode",
@@ -3,9 +3,18 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config.settings import settings, get_fresh_settings
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing. The defaults suit the API process serving many
+# concurrent image requests; Celery worker children run one task at a time
+# and shrink this via configure_pool() (see celery_app.py).
+_pool_settings = {
+    "pool_size": int(os.getenv('DB_POOL_SIZE', '30')),
+    "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', '70')),
+}
+
 # Create database engine
 def create_database_engine():
     """Create database engine with MySQL connection"""
@@ -18,8 +27,8 @@ def create_database_engine():
             echo=False,  # Set to True for SQL debugging
             pool_pre_ping=True,  # Verify connections before use
             pool_recycle=3600,   # Recycle connections every hour
-            pool_size=30,        # Increase pool to handle concurrent image requests
-            max_overflow=70,     # Allow up to 100 total connections for bursts
+            pool_timeout=30,     # Fail fast instead of queueing forever when the pool is exhausted
+            **_pool_settings,
         )
         return engine
     except Exception as e:
@@ -68,6 +77,25 @@ def ensure_database_initialized():
         logger.error("Database initialization failed - engine or SessionLocal still None")
         raise RuntimeError("Database not initialized - setup may not be complete")
 
+def configure_pool(pool_size: int, max_overflow: int):
+    """
+    Set connection pool sizing for engines created from now on.
+    
+    If an engine was inherited (e.g. across a fork), its pooled connections
+    are dropped without closing the parent's sockets and the engine is
+    rebuilt lazily with the new sizing.
+    """
+    global engine, SessionLocal
+    _pool_settings["pool_size"] = pool_size
+    _pool_settings["max_overflow"] = max_overflow
+    
+    if engine is not None:
+        engine.dispose(close=False)
+        engine = None
+        SessionLocal = None
+    
+    logger.info(f"🔧 Database pool configured: pool_size={pool_size}, max_overflow={max_overflow}")
+
 def refresh_database_connection():
     """Refresh database connection with updated settings"""
     global engine, SessionLocal
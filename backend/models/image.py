@@ -1,10 +1,28 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Enum, Text
+from functools import cached_property
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Enum, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
 
+# Stored mime types that are served under a different Content-Type
+_SERVED_MIME_OVERRIDES = {"image/mpo": "image/jpeg"}
+
+def served_mime_for(mime_type):
+    """Content-Type to serve for a stored mime type (MPO is served as JPEG)"""
+    if not mime_type:
+        return "image/jpeg"
+    return _SERVED_MIME_OVERRIDES.get(mime_type.lower(), mime_type)
+
+def _default_served_mime(context):
+    """Column default: derive served_mime from the mime_type being inserted"""
+    return served_mime_for(context.get_current_parameters().get("mime_type"))
+
 class Image(Base):
     __tablename__ = "images"
+    __table_args__ = (
+        # Oldest-pending and retry queries filter by status and order by upload time
+        Index('ix_images_proc_status_uploaded', 'processing_status', 'uploaded_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(256), nullable=False, index=True)
@@ -14,6 +32,7 @@ class Image(Base):
     height = Column(Integer, nullable=True)
     file_size = Column(Integer, nullable=True)
     mime_type = Column(String(64), nullable=True)
+    served_mime = Column(String(64), nullable=True, default=_default_served_mime)  # Normalized Content-Type for responses
     file_hash = Column(String(64), nullable=True, index=True)  # MD5 hash for duplicate detection
     exif = Column(JSON, nullable=True)
     dominant_colors = Column(JSON, nullable=True)  # Array of hex color strings ["#FF5733", "#33FF57", "#3357FF"]
@@ -52,7 +71,8 @@ class Image(Base):
     def __repr__(self):
         return f"<Image(id={self.id}, filename='{self.filename}', original_filename='{self.original_filename}')>"
 
-    def _get_upload_directory(self):
+    @staticmethod
+    def _get_upload_directory():
         """Get upload directory from settings"""
         try:
             from services.config_service import config_service
@@ -62,44 +82,90 @@ class Image(Base):
 
     def to_dict(self):
         """Convert image to dictionary"""
-        # Return relative URLs - let the frontend construct full URLs based on protocol
-        # This prevents mixed content errors when accessing via HTTPS reverse proxy
+        return Image.row_to_dict(self)
+
+    def to_summary_dict(self):
+        """
+        Lightweight image dict for duplicate checks: identity, size and URLs,
+        without EXIF/color JSON, processing details or the on-disk path lookup
+        """
         return {
             "id": self.id,
             "filename": self.filename,
             "original_filename": self.original_filename,
-            "file_path": self.file_path,
             "album_id": self.album_id,
             "width": self.width,
             "height": self.height,
             "file_size": self.file_size,
             "mime_type": self.mime_type,
             "file_hash": self.file_hash,
-            "exif": self.exif,
-            "dominant_colors": self.dominant_colors,
             "uploaded_at": self.uploaded_at.isoformat() if self.uploaded_at else None,
             "playlist_id": self.playlist_id,
             "url": f"/api/images/{self.id}/file",
             "thumbnail_url": f"/api/images/{self.id}/file?size=medium&v={self.id}_{self.album_id or 0}",
+            "processing_status": self.processing_status
+        }
+
+    @staticmethod
+    def row_to_dict(row):
+        """
+        Serialize an image from anything exposing the images columns as
+        attributes: an Image instance or a plain column Row from select(),
+        so list endpoints can skip ORM instantiation.
+        """
+        # Return relative URLs - let the frontend construct full URLs based on protocol
+        # This prevents mixed content errors when accessing via HTTPS reverse proxy
+        return {
+            "id": row.id,
+            "filename": row.filename,
+            "original_filename": row.original_filename,
+            "file_path": Image.file_path_for(row.filename),
+            "album_id": row.album_id,
+            "width": row.width,
+            "height": row.height,
+            "file_size": row.file_size,
+            "mime_type": row.mime_type,
+            "file_hash": row.file_hash,
+            "exif": row.exif,
+            "dominant_colors": row.dominant_colors,
+            "uploaded_at": row.uploaded_at.isoformat() if row.uploaded_at else None,
+            "playlist_id": row.playlist_id,
+            "url": f"/api/images/{row.id}/file",
+            "thumbnail_url": f"/api/images/{row.id}/file?size=medium&v={row.id}_{row.album_id or 0}",
             # Processing status fields
-            "processing_status": self.processing_status,
-            "thumbnail_status": self.thumbnail_status,
-            "variant_status": self.variant_status,
-            "processing_error": self.processing_error,
-            "processing_attempts": self.processing_attempts,
-            "last_processing_attempt": self.last_processing_attempt.isoformat() if self.last_processing_attempt else None,
-            "processing_completed_at": self.processing_completed_at.isoformat() if self.processing_completed_at else None
+            "processing_status": row.processing_status,
+            "thumbnail_status": row.thumbnail_status,
+            "variant_status": row.variant_status,
+            "processing_error": row.processing_error,
+            "processing_attempts": row.processing_attempts,
+            "last_processing_attempt": row.last_processing_attempt.isoformat() if row.last_processing_attempt else None,
+            "processing_completed_at": row.processing_completed_at.isoformat() if row.processing_completed_at else None
         }
 
+    @cached_property
+    def etag_base(self) -> str:
+        """Stable part of this image's ETags (filename + upload time), built once per instance"""
+        return f"{self.filename}_{self.uploaded_at.timestamp()}"
+
+    @cached_property
+    def last_modified_http(self) -> str:
+        """Upload time formatted as an HTTP date for Last-Modified headers"""
+        return self.uploaded_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
     @property
     def file_path(self):
         """Get the file path for this image"""
+        return Image.file_path_for(self.filename)
+
+    @staticmethod
+    def file_path_for(filename):
+        """Get the file path for a stored image filename"""
         from services.image_storage_service import image_storage_service
-        actual_path = image_storage_service.get_image_path(self.filename)
+        actual_path = image_storage_service.get_image_path(filename)
         if actual_path:
             # Return relative path from project root
             return str(actual_path.relative_to(actual_path.parts[0]))
-        return f"{self._get_upload_directory()}/{self.filename}"
+        return f"{Image._get_upload_directory()}/{filename}"
 
     @property
     def thumbnail_path(self):
@@ -0,0 +1,25 @@
+"""
+Image variant model - one row per scaled display-size file on disk
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from .database import Base
+
+class ImageVariant(Base):
+    """A scaled display-size file generated for an image"""
+    __tablename__ = "image_variants"
+    __table_args__ = (
+        # Also serves the (image_id) and (image_id, width, height) lookups
+        UniqueConstraint('image_id', 'width', 'height', name='uq_image_variants_image_size'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    image_id = Column(Integer, ForeignKey('images.id', ondelete='CASCADE'), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    path = Column(String(500), nullable=False)  # Absolute path of the scaled file
+    file_size = Column(Integer, nullable=True)  # Size in bytes when it was written
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ImageVariant(image_id={self.image_id}, size={self.width}x{self.height})>"
@@ -45,33 +45,42 @@ class Playlist(Base):
         except Exception:
             return 30  # Fallback to hardcoded value if settings not available
 
+    @staticmethod
+    def row_to_dict(row, image_count: int):
+        """
+        Serialize a playlist from anything exposing the playlists columns as
+        attributes: a Playlist instance or a plain column Row from select(),
+        so list endpoints can skip ORM instantiation and loading images.
+        """
+        # Handle display_mode safely - if it's None or invalid, default to DEFAULT
+        display_mode_value = DisplayMode.DEFAULT.value  # Use .value for lowercase
+        if row.display_mode:
+            if hasattr(row.display_mode, 'value'):
+                display_mode_value = row.display_mode.value
+            else:
+                # If it's a string, convert to lowercase
+                display_mode_value = str(row.display_mode).lower()
+        
+        return {
+            "id": row.id,
+            "name": row.name,
+            "slug": row.slug,
+            "is_default": row.is_default,
+            "sequence": row.sequence,
+            "computed_sequence": row.computed_sequence,
+            "display_time_seconds": row.display_time_seconds,
+            "display_mode": display_mode_value,
+            "show_image_info": row.show_image_info or False,
+            "show_exif_date": row.show_exif_date or False,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            "image_count": image_count or 0
+        }
+
     def to_dict(self):
         """Convert playlist to dictionary"""
         try:
-            # Handle display_mode safely - if it's None or invalid, default to DEFAULT
-            display_mode_value = DisplayMode.DEFAULT.value  # Use .value for lowercase
-            if self.display_mode:
-                if hasattr(self.display_mode, 'value'):
-                    display_mode_value = self.display_mode.value
-                else:
-                    # If it's a string, convert to lowercase
-                    display_mode_value = str(self.display_mode).lower()
-            
-            return {
-                "id": self.id,
-                "name": self.name,
-                "slug": self.slug,
-                "is_default": self.is_default,
-                "sequence": self.sequence,
-                "computed_sequence": self.computed_sequence,
-                "display_time_seconds": self.display_time_seconds,
-                "display_mode": display_mode_value,
-                "show_image_info": self.show_image_info or False,
-                "show_exif_date": self.show_exif_date or False,
-                "created_at": self.created_at.isoformat() if self.created_at else None,
-                "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-                "image_count": len(self.images) if self.images else 0
-            }
+            return Playlist.row_to_dict(self, len(self.images) if self.images else 0)
         except Exception as e:
             # Log the error and return a safe default
             import logging
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -27,6 +27,11 @@ class UserLogAction(str, enum.Enum):
 class UserLog(Base):
     """Logs from authenticated users in the webapp"""
     __tablename__ = "user_logs"
+    __table_args__ = (
+        # Admin listing orders by created_at and filters by level/action; the index
+        # is walked backwards for newest-first with the filters checked in the index
+        Index('ix_user_logs_created_level_action', 'created_at', 'log_level', 'action'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=True, index=True)  # Nullable for anonymous actions
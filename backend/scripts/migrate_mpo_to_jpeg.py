@@ -112,6 +112,7 @@ def migrate_one(db, image: Image) -> bool:
     # Update database record
     image.filename = new_filename
     image.mime_type = "image/jpeg"
+    image.served_mime = "image/jpeg"
     db.add(image)
 
     # Optionally remove the old .mpo file and thumbnails
@@ -237,6 +237,28 @@ def playlist_images_key(playlist_id: int) -> str:
     """Generate cache key for playlist images"""
     return cache_service._generate_key("playlist_images", playlist_id)
 
+def playlist_response_key(name: str) -> str:
+    """Generate cache key for a serialized playlist API response"""
+    return f"playlists_response_{name}"
+
+# Playlist responses are built in threadpool handlers without holding a lock.
+# Every invalidation drops all of them and bumps this generation, so a build
+# that started before a write can tell and skip caching its stale payload.
+_playlist_response_lock = threading.Lock()
+_playlist_response_generation = 0
+
+def playlist_response_generation() -> int:
+    """Current playlist response generation; read it before building a payload"""
+    return _playlist_response_generation
+
+def set_playlist_response(key: str, value: Any, ttl_seconds: int, generation: int) -> bool:
+    """Cache a playlist response unless it was invalidated since `generation`"""
+    with _playlist_response_lock:
+        if generation != _playlist_response_generation:
+            return False
+        cache_service.set(key, value, ttl_seconds)
+        return True
+
 def duplicate_images_key() -> str:
     """Generate cache key for duplicate images"""
     return "duplicate_images"
@@ -257,17 +279,26 @@ def invalidate_image_cache(image_id: Optional[int] = None) -> int:
 
 def invalidate_playlist_cache(playlist_id: Optional[int] = None) -> int:
     """Invalidate playlist-related cache entries"""
+    global _playlist_response_generation
+    # Playlist list/default responses and the statistics cover every playlist, so they always go
+    with _playlist_response_lock:
+        _playlist_response_generation += 1
+        total_invalidated = invalidate_cache_pattern("playlists_response")
+    total_invalidated += invalidate_cache_pattern("playlist_stats")
     if playlist_id:
         # Invalidate specific playlist caches
-        return invalidate_cache_pattern(f"playlist_{playlist_id}")
+        return total_invalidated + invalidate_cache_pattern(f"playlist_{playlist_id}")
     else:
         # Invalidate all playlist-related caches
-        patterns = ["playlist_images", "playlist_stats"]
-        total_invalidated = 0
+        patterns = ["playlist_images"]
         for pattern in patterns:
             total_invalidated += invalidate_cache_pattern(pattern)
         return total_invalidated
 
+def invalidate_device_cache(device_token: str) -> int:
+    """Invalidate cached auth lookups for a display device token"""
+    return invalidate_cache_pattern(f"device_auth_{device_token}")
+
 def invalidate_album_cache(album_id: Optional[int] = None) -> int:
     """Invalidate album-related cache entries"""
     if album_id:
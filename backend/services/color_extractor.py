@@ -2,17 +2,26 @@
 Color Extraction Service
 
 Extracts dominant colors from images for use in display modes like Color Harmony.
-Uses ColorThief library for efficient color palette generation.
+Uses a vectorized NumPy k-means over a downscaled copy of the image.
 """
 
+import io
 import logging
-from typing import List, Optional
-from colorthief import ColorThief
+from typing import List, Optional, Tuple
+import numpy as np
 from PIL import Image as PILImage
 import os
 
 logger = logging.getLogger(__name__)
 
+# Images are downscaled to fit this box before clustering - dominant colors
+# are stable far below full resolution
+SAMPLE_SIZE = (150, 150)
+KMEANS_ITERATIONS = 10
+
+# ITU-R BT.601 luma weights, used to spread the initial centroids
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
 
 def rgb_to_hex(rgb: tuple) -> str:
     """Convert RGB tuple to hex color string"""
@@ -20,6 +29,71 @@ def rgb_to_hex(rgb: tuple) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
+def _load_pixels(img: PILImage.Image, quality: int) -> np.ndarray:
+    """
+    Decode an image into an (N, 3) uint8 array of RGB pixels.
+    
+    Transparent images are composited onto white. Every `quality`-th pixel
+    of the downscaled image is kept, matching ColorThief's sampling knob.
+    """
+    # Let the JPEG decoder downscale in the DCT domain before full decode
+    img.draft('RGB', (SAMPLE_SIZE[0] * 2, SAMPLE_SIZE[1] * 2))
+    
+    if img.mode in ('RGBA', 'LA', 'P'):
+        rgba = img.convert('RGBA')
+        img = PILImage.new('RGB', rgba.size, (255, 255, 255))
+        img.paste(rgba, mask=rgba.split()[-1])
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    img.thumbnail(SAMPLE_SIZE, PILImage.Resampling.BILINEAR)
+    pixels = np.asarray(img, dtype=np.uint8).reshape(-1, 3)
+    return pixels[::max(1, quality)]
+
+
+def _kmeans_palette(pixels: np.ndarray, color_count: int) -> List[Tuple[int, int, int]]:
+    """
+    Cluster pixels with k-means and return centroids, most populous first.
+    
+    Distances are computed in integers: channel deltas fit in int16 and
+    squared sums in int32, so the pixel scan never widens to float.
+    """
+    k = min(color_count, len(pixels))
+    deltas_in = pixels.astype(np.int16)[:, None, :]
+    
+    # Deterministic init: centroids spread evenly across the luminance range
+    by_luma = np.argsort(pixels @ LUMA_WEIGHTS)
+    centroids = pixels[by_luma[np.linspace(0, len(pixels) - 1, k).astype(np.intp)]].astype(np.int16)
+    
+    for _ in range(KMEANS_ITERATIONS):
+        deltas = deltas_in - centroids[None, :, :]
+        distances = np.square(deltas, dtype=np.int32).sum(axis=-1, dtype=np.int32)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack(
+            [np.bincount(labels, weights=pixels[:, channel], minlength=k) for channel in range(3)],
+            axis=1
+        )
+        # Empty clusters keep their previous centroid
+        populated = counts > 0
+        centroids[populated] = np.rint(sums[populated] / counts[populated, None]).astype(np.int16)
+    
+    order = np.argsort(-counts, kind='stable')
+    return [
+        tuple(int(v) for v in centroids[index])
+        for index in order
+        if counts[index] > 0
+    ]
+
+
+def _extract_from_image(img: PILImage.Image, color_count: int, quality: int) -> Optional[List[str]]:
+    """Run palette extraction on an opened PIL image"""
+    pixels = _load_pixels(img, quality)
+    if len(pixels) == 0:
+        return None
+    return [rgb_to_hex(color) for color in _kmeans_palette(pixels, color_count)]
+
+
 def extract_dominant_colors(
     image_path: str,
     color_count: int = 3,
@@ -48,44 +122,10 @@ def extract_dominant_colors(
             logger.error(f"Image file not found: {image_path}")
             return None
         
-        # Verify it's a valid image
-        try:
-            with PILImage.open(image_path) as img:
-                # Convert RGBA to RGB if needed
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Create white background
-                    background = PILImage.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    # Save temporarily for ColorThief
-                    temp_path = image_path + '.temp.jpg'
-                    background.save(temp_path, 'JPEG')
-                    image_path = temp_path
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                    temp_path = image_path + '.temp.jpg'
-                    img.save(temp_path, 'JPEG')
-                    image_path = temp_path
-        except Exception as e:
-            logger.error(f"Error validating image: {e}")
-            return None
-        
-        # Extract color palette
-        color_thief = ColorThief(image_path)
-        palette = color_thief.get_palette(color_count=color_count, quality=quality)
-        
-        # Clean up temp file if created
-        if image_path.endswith('.temp.jpg'):
-            try:
-                os.remove(image_path)
-            except:
-                pass
+        with PILImage.open(image_path) as img:
+            hex_colors = _extract_from_image(img, color_count, quality)
         
-        # Convert to hex strings
-        hex_colors = [rgb_to_hex(color) for color in palette]
-        
-        logger.info(f"Extracted {len(hex_colors)} colors from {image_path}: {hex_colors}")
+        logger.info(f"Extracted {len(hex_colors or [])} colors from {image_path}: {hex_colors}")
         return hex_colors
         
     except Exception as e:
@@ -109,24 +149,9 @@ def extract_dominant_colors_from_bytes(
     Returns:
         List of hex color strings or None if extraction fails
     """
-    import tempfile
-    
     try:
-        # Write bytes to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-            tmp_file.write(image_bytes)
-            tmp_path = tmp_file.name
-        
-        # Extract colors
-        colors = extract_dominant_colors(tmp_path, color_count, quality)
-        
-        # Clean up temp file
-        try:
-            os.remove(tmp_path)
-        except:
-            pass
-        
-        return colors
+        with PILImage.open(io.BytesIO(image_bytes)) as img:
+            return _extract_from_image(img, color_count, quality)
         
     except Exception as e:
         logger.error(f"Error extracting colors from bytes: {e}")
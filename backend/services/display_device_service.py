@@ -1,13 +1,18 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 import logging
 
 from models.display_device import DisplayDevice, DeviceStatus
 from models.user import User
+from services.caching_service import cache_service, invalidate_device_cache
 
 logger = logging.getLogger(__name__)
 
+# How long a token -> (id, status) lookup is trusted; status changes made here
+# invalidate it straight away
+DEVICE_AUTH_TTL_SECONDS = 60
+
 class DisplayDeviceService:
     """Service for managing display devices and their authorization"""
     
@@ -57,6 +62,23 @@ class DisplayDeviceService:
             DisplayDevice.device_token == device_token
         ).first()
     
+    def get_device_auth(self, device_token: str) -> Optional[Tuple[int, DeviceStatus]]:
+        """Get (device id, status) for a token, cached for the per-poll authorization checks"""
+        cache_key = f"device_auth_{device_token}"
+        cached_auth = cache_service.get(cache_key)
+        if cached_auth is not None:
+            return cached_auth
+        
+        row = self.db.query(DisplayDevice.id, DisplayDevice.status).filter(
+            DisplayDevice.device_token == device_token
+        ).first()
+        if not row:
+            return None
+        
+        auth = (row.id, row.status)
+        cache_service.set(cache_key, auth, DEVICE_AUTH_TTL_SECONDS)
+        return auth
+    
     def get_device_by_id(self, device_id: int) -> Optional[DisplayDevice]:
         """Get a display device by its ID"""
         return self.db.query(DisplayDevice).filter(DisplayDevice.id == device_id).first()
@@ -119,6 +141,7 @@ class DisplayDeviceService:
         
         self.db.commit()
         self.db.refresh(device)
+        invalidate_device_cache(device.device_token)
         
         logger.info(f"Authorized device {device_id} by user {authorized_by_user.username}")
         return device
@@ -135,6 +158,7 @@ class DisplayDeviceService:
         
         self.db.commit()
         self.db.refresh(device)
+        invalidate_device_cache(device.device_token)
         
         logger.info(f"Rejected device {device_id} by user {rejected_by_user.username}")
         return device
@@ -168,8 +192,10 @@ class DisplayDeviceService:
         logs_count = self.db.query(DeviceLog).filter(DeviceLog.device_id == device_id).delete()
         logger.info(f"Deleted {logs_count} logs for device {device_id}")
         
+        device_token = device.device_token
         self.db.delete(device)
         self.db.commit()
+        invalidate_device_cache(device_token)
         
         logger.info(f"Deleted device {device_id}")
         return True
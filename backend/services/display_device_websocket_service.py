@@ -7,6 +7,7 @@ import asyncio
 from models.display_device import DisplayDevice, DeviceStatus
 from models.user import User
 from websocket.manager import connection_manager
+from services.caching_service import invalidate_device_cache
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +113,7 @@ class DisplayDeviceWebSocketService:
         
         self.db.commit()
         self.db.refresh(device)
+        invalidate_device_cache(device.device_token)
         
         logger.info(f"Authorized device {device_id} by user {authorized_by_user.username}")
         
@@ -135,6 +137,7 @@ class DisplayDeviceWebSocketService:
         
         self.db.commit()
         self.db.refresh(device)
+        invalidate_device_cache(device.device_token)
         
         logger.info(f"Rejected device {device_id} by user {rejected_by_user.username}")
         
@@ -178,6 +181,7 @@ class DisplayDeviceWebSocketService:
         
         self.db.delete(device)
         self.db.commit()
+        invalidate_device_cache(device_token)
         
         logger.info(f"Deleted device {device_id}")
         
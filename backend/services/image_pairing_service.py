@@ -5,7 +5,7 @@ Provides utilities for classifying images by orientation and computing
 optimal pairing sequences based on display orientation.
 """
 
-from typing import List, Dict, Literal, TypedDict
+from typing import List, Dict, Literal, Tuple, TypedDict
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,6 +48,22 @@ class ImageClassificationService:
         # Both portrait and square (0.9-1.1) are treated as portrait
         return 'portrait'
     
+    @classmethod
+    def split_by_orientation(cls, images: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Partition images into (landscapes, portraits), keeping their order.
+        
+        Each image is classified once, in a single pass.
+        """
+        landscapes = []
+        portraits = []
+        for image in images:
+            if cls.classify_image(image['width'], image['height']) == 'landscape':
+                landscapes.append(image)
+            else:
+                portraits.append(image)
+        return landscapes, portraits
+    
     @classmethod
     def compute_portrait_sequence(cls, images: List[Dict]) -> List[PairingEntry]:
         """
@@ -214,8 +230,7 @@ class ImageClassificationService:
         
         # Compute globally optimal by grouping pairable orientations
         # Separate by orientation
-        landscapes = [img for img in ordered_images if cls.classify_image(img['width'], img['height']) == 'landscape']
-        portraits = [img for img in ordered_images if cls.classify_image(img['width'], img['height']) == 'portrait']
+        landscapes, portraits = cls.split_by_orientation(ordered_images)
         
         # Create optimal order: group images of pairable orientation together
         if display_orientation == 'portrait':
@@ -1,11 +1,13 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional, Dict, Any
-from models import Image, Album, Playlist
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import and_, or_, select, delete, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from typing import List, Optional, Dict, Any, Iterator
+from models import Image, ImageVariant, Album, Playlist
 from services.image_storage_service import image_storage_service
 from services.query_optimization_service import QueryOptimizationService
-from services.caching_service import cached, invalidate_image_cache
+from services.caching_service import cached, invalidate_image_cache, invalidate_playlist_cache
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,8 @@ class ImageService:
             
             # Invalidate related caches
             invalidate_image_cache()
+            if playlist_id:
+                invalidate_playlist_cache(playlist_id)
             
             logger.info(f"Created image record: {image.id}")
             return image
@@ -68,20 +72,106 @@ class ImageService:
         return self.db.query(Image).filter(Image.filename == filename).first()
     
     def get_image_by_hash(self, file_hash: str) -> Optional[Image]:
-        """Get image by file hash for duplicate detection"""
-        return self.db.query(Image).filter(Image.file_hash == file_hash).first()
+        """Get image by file hash for duplicate detection (EXIF/color JSON deferred)"""
+        return self.db.query(Image)\
+            .options(defer(Image.exif), defer(Image.dominant_colors))\
+            .filter(Image.file_hash == file_hash)\
+            .first()
+    
+    def get_images_by_hashes(self, file_hashes: List[str]) -> List[Image]:
+        """Get images matching any of the given hashes (EXIF/color JSON deferred)"""
+        return self.db.query(Image)\
+            .options(defer(Image.exif), defer(Image.dominant_colors))\
+            .filter(Image.file_hash.in_(file_hashes))\
+            .all()
     
     def check_duplicate_by_hash(self, file_hash: str) -> bool:
         """Check if an image with the given hash already exists"""
-        return self.get_image_by_hash(file_hash) is not None
+        return self.db.query(Image.id).filter(Image.file_hash == file_hash).first() is not None
+    
+    def get_image_variants(self, image_id: int) -> List[ImageVariant]:
+        """Get the recorded display variants of an image"""
+        return self.db.query(ImageVariant)\
+            .filter(ImageVariant.image_id == image_id)\
+            .order_by(ImageVariant.width, ImageVariant.height)\
+            .all()
+    
+    def get_image_variant(self, image_id: int, width: int, height: int) -> Optional[ImageVariant]:
+        """Get one recorded display variant of an image by size"""
+        return self.db.query(ImageVariant).filter(
+            ImageVariant.image_id == image_id,
+            ImageVariant.width == width,
+            ImageVariant.height == height
+        ).first()
+    
+    def record_variants(self, image_id: int, variant_paths: Dict[str, str]) -> None:
+        """
+        Replace an image's variant rows with the sizes process_variants just produced.
+        
+        Upserts on the (image_id, width, height) unique key so two jobs recording
+        the same image concurrently don't collide on it, then drops sizes that
+        were not produced this time.
+        
+        Does not commit - callers commit together with the image's variant_status.
+        """
+        rows = []
+        for size, path in variant_paths.items():
+            width, height = map(int, size.split('x'))
+            try:
+                file_size = os.path.getsize(path)
+            except OSError:
+                file_size = None
+            rows.append({"image_id": image_id, "width": width, "height": height, "path": path, "file_size": file_size})
+        
+        stale = delete(ImageVariant).where(ImageVariant.image_id == image_id)
+        if rows:
+            stmt = mysql_insert(ImageVariant).values(rows)
+            self.db.execute(stmt.on_duplicate_key_update(path=stmt.inserted.path, file_size=stmt.inserted.file_size))
+            stale = stale.where(
+                tuple_(ImageVariant.width, ImageVariant.height).notin_([(row["width"], row["height"]) for row in rows])
+            )
+        self.db.execute(stale)
     
-    def get_images_by_album(self, album_id: int) -> List[Image]:
-        """Get all images in an album"""
-        return self.db.query(Image).filter(Image.album_id == album_id).all()
+    def get_images_by_album(self, album_id: int, limit: Optional[int] = None, offset: int = 0) -> List[Image]:
+        """Get images in an album (all of them unless limit is given)"""
+        query = self.db.query(Image).filter(Image.album_id == album_id).order_by(Image.id)
+        if limit is not None:
+            query = query.limit(limit).offset(offset)
+        return query.all()
     
-    def get_images_by_playlist(self, playlist_id: int) -> List[Image]:
-        """Get all images in a playlist"""
-        return self.db.query(Image).filter(Image.playlist_id == playlist_id).all()
+    def get_images_by_playlist(self, playlist_id: int, limit: Optional[int] = None, offset: int = 0) -> List[Image]:
+        """Get images in a playlist (all of them unless limit is given)"""
+        query = self.db.query(Image).filter(Image.playlist_id == playlist_id).order_by(Image.id)
+        if limit is not None:
+            query = query.limit(limit).offset(offset)
+        return query.all()
+    
+    def get_image_dicts(
+        self,
+        album_id: Optional[int] = None,
+        playlist_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Serialized images for list endpoints, built from plain column rows
+        (no ORM instances, identity map or attribute instrumentation).
+        
+        Album/playlist filters are ordered by id (the album_id/playlist_id
+        index already yields that order); the unfiltered listing is newest
+        first like get_all_images(). limit=None returns every match.
+        """
+        query = select(*Image.__table__.columns)
+        if album_id:
+            query = query.where(Image.album_id == album_id).order_by(Image.id)
+        elif playlist_id:
+            query = query.where(Image.playlist_id == playlist_id).order_by(Image.id)
+        else:
+            query = query.order_by(Image.uploaded_at.desc())
+        if limit is not None:
+            query = query.limit(limit).offset(offset)
+        
+        return [Image.row_to_dict(row) for row in self.db.execute(query)]
     
     @cached("image_list", ttl_seconds=300)
     def get_all_images(self, limit: int = 100, offset: int = 0) -> List[Image]:
@@ -109,6 +199,8 @@ class ImageService:
             
             # Invalidate related caches
             invalidate_image_cache(image.id)
+            if 'playlist_id' in kwargs:
+                invalidate_playlist_cache()
             
             logger.info(f"Updated image record: {image.id}")
             return image
@@ -131,11 +223,14 @@ class ImageService:
                 logger.warning(f"Failed to delete physical files for image {image_id}")
             
             # Delete database record
+            playlist_id = image.playlist_id
             self.db.delete(image)
             self.db.commit()
             
             # Invalidate related caches
             invalidate_image_cache(image_id)
+            if playlist_id:
+                invalidate_playlist_cache(playlist_id)
             
             logger.info(f"Deleted image record: {image_id}")
             return True
@@ -154,3 +249,12 @@ class ImageService:
     def get_duplicate_images(self) -> List[List[Image]]:
         """Find potential duplicate images based on file size and dimensions - using optimized query with caching"""
         return self.query_optimizer.get_duplicate_images_optimized()
+    
+    def iter_duplicate_images(self) -> Iterator[List[Image]]:
+        """
+        Stream duplicate image groups without materializing them all.
+        The grouping query runs immediately; images are loaded in batches as
+        the iterator is consumed.
+        """
+        id_groups = self.query_optimizer.get_duplicate_image_id_groups()
+        return self.query_optimizer.iter_image_groups(id_groups)
@@ -2,13 +2,15 @@ import os
 import uuid
 import hashlib
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Union, BinaryIO
 from PIL import Image as PILImage
 from PIL.ExifTags import TAGS
 import io
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from config.settings import settings
 from utils.retry import retry_with_backoff
 
@@ -21,6 +23,9 @@ class ImageStorageService:
     SUPPORTED_FORMATS = {'JPEG', 'PNG', 'GIF', 'WEBP', 'AVIF', 'MPO'}
     SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.mpo'}
     
+    # Chunk size for hashing/copying uploaded file streams
+    STREAM_CHUNK_SIZE = 1 << 20
+    
     # Thumbnail sizes
     THUMBNAIL_SIZES = {
         'small': (150, 150),
@@ -149,9 +154,65 @@ class ImageStorageService:
         
         return exif_data
     
-    def _calculate_file_hash(self, file_bytes: bytes) -> str:
-        """Calculate MD5 hash of file bytes"""
-        return hashlib.md5(file_bytes).hexdigest()
+    def _calculate_file_hash(self, file_bytes: Union[bytes, BinaryIO]) -> str:
+        """Calculate MD5 hash of file bytes or of a binary stream (read in chunks)"""
+        if isinstance(file_bytes, (bytes, bytearray)):
+            return hashlib.md5(file_bytes).hexdigest()
+        
+        file_hash = hashlib.md5()
+        file_bytes.seek(0)
+        while chunk := file_bytes.read(self.STREAM_CHUNK_SIZE):
+            file_hash.update(chunk)
+        file_bytes.seek(0)
+        return file_hash.hexdigest()
+    
+    def calculate_file_hash(self, file_bytes: Union[bytes, BinaryIO]) -> str:
+        """Public duplicate-detection hash for an upload, matching Image.file_hash"""
+        return self._calculate_file_hash(file_bytes)
+    
+    def _temp_path(self, path: Path) -> Path:
+        """
+        Hidden temp name next to `path`, unique per writer (pid plus a random suffix)
+        so concurrent writers of the same output never share or unlink each other's
+        file. Unlike mkstemp, files created under it keep umask-derived permissions.
+        """
+        return path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:12]}.tmp")
+    
+    def _write_file_atomic(self, path: Path, data: bytes) -> None:
+        """
+        Write bytes to a temp name and rename, so an existing output is always complete.
+        
+        Uses a raw fd rather than open(): the whole buffer is already in memory, so
+        the buffered file object's fstat/isatty/seek calls are pure overhead.
+        """
+        tmp_path = self._temp_path(path)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    def _open_source(self, file_bytes: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Return a rewound binary stream over in-memory bytes or an upload stream"""
+        if isinstance(file_bytes, (bytes, bytearray)):
+            return io.BytesIO(file_bytes)
+        file_bytes.seek(0)
+        return file_bytes
+    
+    def _source_size(self, file_bytes: Union[bytes, BinaryIO]) -> int:
+        """Size in bytes of in-memory bytes or a seekable binary stream"""
+        if isinstance(file_bytes, (bytes, bytearray)):
+            return len(file_bytes)
+        size = file_bytes.seek(0, os.SEEK_END)
+        file_bytes.seek(0)
+        return size
     
     def _serialize_exif_value(self, value):
         """Convert EXIF values to JSON-serializable types"""
@@ -244,128 +305,150 @@ class ImageStorageService:
         """Generate thumbnail from image bytes with EXIF orientation handling"""
         try:
             with PILImage.open(io.BytesIO(image_bytes)) as img:
-                # Handle EXIF orientation for mobile photos
-                img = self._apply_exif_orientation(img)
-                
-                # Convert to RGB if necessary (for JPEG compatibility)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                
-                # Generate thumbnail
-                thumbnail_size = self.THUMBNAIL_SIZES[size]
-                img.thumbnail(thumbnail_size, PILImage.Resampling.LANCZOS)
-                
-                # Save to bytes
-                output = io.BytesIO()
-                img.save(output, format='JPEG', quality=85, optimize=True)
-                return output.getvalue()
+                img = self._prepare_for_scaling(img)
+                return self._thumbnail_decoded_image(img, size)
         except Exception as e:
             logger.error(f"Failed to generate thumbnail: {e}")
             raise
     
+    def _thumbnail_decoded_image(self, img: PILImage.Image, size: str = 'medium') -> bytes:
+        """Encode one thumbnail size from an already decoded (oriented, RGB) image, leaving it untouched"""
+        thumbnail = img.copy()
+        thumbnail.thumbnail(self.THUMBNAIL_SIZES[size], PILImage.Resampling.LANCZOS)
+        
+        # Save to bytes
+        output = io.BytesIO()
+        thumbnail.save(output, format='JPEG', quality=85, optimize=True)
+        return output.getvalue()
+    
     def _generate_scaled_image(self, image_bytes: bytes, target_width: int, target_height: int) -> bytes:
         """Generate a scaled version of the image optimized for target dimensions with movement support"""
+        with PILImage.open(io.BytesIO(image_bytes)) as img:
+            img = self._prepare_for_scaling(img)
+            return self._scale_decoded_image(img, target_width, target_height)
+    
+    def _prepare_for_scaling(self, img: PILImage.Image, draft_bound: Optional[int] = None) -> PILImage.Image:
+        """
+        Decode an opened image once so every output size can be scaled from it.
+        
+        When draft_bound is given, JPEG originals are decoded with draft() at the
+        smallest 1/2, 1/4 or 1/8 scale that keeps both sides at least that many
+        pixels, which skips most of the IDCT work for large camera originals. The
+        bound is square so it holds whichever way EXIF orientation rotates the image.
+        """
+        if draft_bound:
+            img.draft('RGB', (draft_bound, draft_bound))
+        
+        # Handle EXIF orientation for mobile photos
+        img = self._apply_exif_orientation(img)
+        
+        # Convert to RGB if necessary
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGB')
+        
+        img.load()
+        return img
+    
+    def _scale_decoded_image(self, img: PILImage.Image, target_width: int, target_height: int) -> bytes:
+        """Scale an already decoded (oriented, RGB) image to the target dimensions with movement support"""
         try:
-            with PILImage.open(io.BytesIO(image_bytes)) as img:
-                # Handle EXIF orientation for mobile photos
-                img = self._apply_exif_orientation(img)
-                
-                # Convert to RGB if necessary
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                
-                original_width, original_height = img.size
-                original_ratio = original_width / original_height
-                target_ratio = target_width / target_height
-                
-                # Determine image orientation
-                is_original_portrait = original_height > original_width
-                is_target_portrait = target_height > target_width
-                
-                logger.info(f"Original: {original_width}x{original_height} ({'portrait' if is_original_portrait else 'landscape'}), "
-                           f"Target: {target_width}x{target_height} ({'portrait' if is_target_portrait else 'landscape'})")
+            original_width, original_height = img.size
+            original_ratio = original_width / original_height
+            target_ratio = target_width / target_height
+            
+            # Determine image orientation
+            is_original_portrait = original_height > original_width
+            is_target_portrait = target_height > target_width
+            
+            logger.info(f"Original: {original_width}x{original_height} ({'portrait' if is_original_portrait else 'landscape'}), "
+                       f"Target: {target_width}x{target_height} ({'portrait' if is_target_portrait else 'landscape'})")
+            
+            # Smart scaling with movement support
+            if is_original_portrait and is_target_portrait:
+                # Both portrait - scale to fit height, allow some width cropping if needed
+                scale = target_height / original_height
+                new_width = int(original_width * scale)
+                new_height = target_height
                 
-                # Smart scaling with movement support
-                if is_original_portrait and is_target_portrait:
-                    # Both portrait - scale to fit height, allow some width cropping if needed
-                    scale = target_height / original_height
-                    new_width = int(original_width * scale)
-                    new_height = target_height
-                    
-                    if new_width > target_width:
-                        # Image is too wide, scale down to fit width instead
-                        scale = target_width / original_width
-                        new_width = target_width
-                        new_height = int(original_height * scale)
-                    
-                elif not is_original_portrait and not is_target_portrait:
-                    # Both landscape - scale to fit width, allow some height cropping if needed
+                if new_width > target_width:
+                    # Image is too wide, scale down to fit width instead
                     scale = target_width / original_width
                     new_width = target_width
                     new_height = int(original_height * scale)
-                    
-                    if new_height > target_height:
-                        # Image is too tall, scale down to fit height instead
-                        scale = target_height / original_height
-                        new_width = int(original_width * scale)
-                        new_height = target_height
                 
-                else:
-                    # Orientation mismatch - prioritize movement effect for landscape images
-                    if is_original_portrait and not is_target_portrait:
-                        # Portrait image for landscape target - scale to fit height
-                        scale = target_height / original_height
-                        new_width = int(original_width * scale)
-                        new_height = target_height
-                    else:
-                        # Landscape image for portrait target - scale to enable movement effect
-                        # Scale to fit height first, then ensure width is wide enough for movement
-                        scale = target_height / original_height
-                        new_width = int(original_width * scale)
-                        new_height = target_height
-                        
-                        # For landscape images on portrait displays, ensure width is larger than target
-                        # to enable the movement effect (5% pan in each direction = 10% extra width needed)
-                        min_width_for_movement = int(target_width * 1.15)  # 15% extra for movement
-                        if new_width < min_width_for_movement:
-                            # Scale up width while keeping height at target
-                            scale = min_width_for_movement / original_width
-                            new_width = min_width_for_movement
-                            new_height = target_height  # Keep height constrained to target
+            elif not is_original_portrait and not is_target_portrait:
+                # Both landscape - scale to fit width, allow some height cropping if needed
+                scale = target_width / original_width
+                new_width = target_width
+                new_height = int(original_height * scale)
                 
-                # Resize image
-                resized_img = img.resize((new_width, new_height), PILImage.Resampling.LANCZOS)
-                
-                # Create final image
-                if new_width == target_width and new_height == target_height:
-                    # Perfect fit
-                    final_img = resized_img
-                elif new_width > target_width or new_height > target_height:
-                    # Image is larger than target (good for movement) - use as-is
-                    final_img = resized_img
+                if new_height > target_height:
+                    # Image is too tall, scale down to fit height instead
+                    scale = target_height / original_height
+                    new_width = int(original_width * scale)
+                    new_height = target_height
+            
+            else:
+                # Orientation mismatch - prioritize movement effect for landscape images
+                if is_original_portrait and not is_target_portrait:
+                    # Portrait image for landscape target - scale to fit height
+                    scale = target_height / original_height
+                    new_width = int(original_width * scale)
+                    new_height = target_height
                 else:
-                    # Image is smaller than target - create background and center the image
-                    final_img = PILImage.new('RGB', (target_width, target_height), (255, 255, 255))
-                    
-                    # Calculate position to center the image
-                    x_offset = (target_width - new_width) // 2
-                    y_offset = (target_height - new_height) // 2
+                    # Landscape image for portrait target - scale to enable movement effect
+                    # Scale to fit height first, then ensure width is wide enough for movement
+                    scale = target_height / original_height
+                    new_width = int(original_width * scale)
+                    new_height = target_height
                     
-                    # Paste the resized image onto the background
-                    final_img.paste(resized_img, (x_offset, y_offset))
+                    # For landscape images on portrait displays, ensure width is larger than target
+                    # to enable the movement effect (5% pan in each direction = 10% extra width needed)
+                    min_width_for_movement = int(target_width * 1.15)  # 15% extra for movement
+                    if new_width < min_width_for_movement:
+                        # Scale up width while keeping height at target
+                        scale = min_width_for_movement / original_width
+                        new_width = min_width_for_movement
+                        new_height = target_height  # Keep height constrained to target
+            
+            # Resize image. reducing_gap box-reduces by an integer factor before the
+            # Lanczos pass, which matters for PNG/WebP originals that draft() can't shrink.
+            resized_img = img.resize(
+                (new_width, new_height),
+                PILImage.Resampling.LANCZOS,
+                reducing_gap=3.0,
+            )
+            
+            # Create final image
+            if new_width == target_width and new_height == target_height:
+                # Perfect fit
+                final_img = resized_img
+            elif new_width > target_width or new_height > target_height:
+                # Image is larger than target (good for movement) - use as-is
+                final_img = resized_img
+            else:
+                # Image is smaller than target - create background and center the image
+                final_img = PILImage.new('RGB', (target_width, target_height), (255, 255, 255))
                 
-                logger.info(f"Scaled to: {new_width}x{new_height}, final: {target_width}x{target_height}")
+                # Calculate position to center the image
+                x_offset = (target_width - new_width) // 2
+                y_offset = (target_height - new_height) // 2
                 
-                # Save to bytes
-                output = io.BytesIO()
-                final_img.save(output, format='JPEG', quality=90, optimize=True)
-                return output.getvalue()
+                # Paste the resized image onto the background
+                final_img.paste(resized_img, (x_offset, y_offset))
+            
+            logger.info(f"Scaled to: {new_width}x{new_height}, final: {target_width}x{target_height}")
+            
+            # Save to bytes
+            output = io.BytesIO()
+            final_img.save(output, format='JPEG', quality=90, optimize=True)
+            return output.getvalue()
         except Exception as e:
             logger.error(f"Failed to generate scaled image {target_width}x{target_height}: {e}")
             raise
     
-    def validate_image(self, file_bytes: bytes, filename: str) -> Tuple[bool, str]:
-        """Validate image file"""
+    def validate_image(self, file_bytes: Union[bytes, BinaryIO], filename: str) -> Tuple[bool, str]:
+        """Validate image file (bytes or a seekable binary stream)"""
         try:
             # Check file extension
             ext = Path(filename).suffix.lower()
@@ -373,11 +456,11 @@ class ImageStorageService:
                 return False, f"Unsupported file extension: {ext}"
             
             # Check file size
-            if len(file_bytes) > settings.max_file_size:
+            if self._source_size(file_bytes) > settings.max_file_size:
                 return False, f"File too large. Maximum size: {settings.max_file_size} bytes"
             
             # Validate image content
-            with PILImage.open(io.BytesIO(file_bytes)) as img:
+            with PILImage.open(self._open_source(file_bytes)) as img:
                 # Check format (case insensitive)
                 if img.format and img.format.upper() not in {f.upper() for f in self.SUPPORTED_FORMATS}:
                     return False, f"Unsupported image format: {img.format}"
@@ -397,14 +480,20 @@ class ImageStorageService:
     
     def validate_and_store_original(
         self,
-        file_bytes: bytes,
+        file_bytes: Union[bytes, BinaryIO],
         original_filename: str,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        file_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Validate image, extract metadata, apply orientation correction, and store original file.
         This function handles only the fast operations needed before background processing.
         
+        file_bytes may be the raw bytes or a seekable binary stream (e.g. the
+        spooled temp file behind an UploadFile), which avoids holding a second
+        full copy of the upload in memory. Pass file_hash when the caller already
+        computed it (e.g. for a duplicate check) to skip hashing again.
+        
         Returns dict with image metadata and processing status set to 'pending'.
         """
         # Validate image
@@ -413,7 +502,8 @@ class ImageStorageService:
             raise ValueError(message)
         
         # Calculate file hash for duplicate detection
-        file_hash = self._calculate_file_hash(file_bytes)
+        if file_hash is None:
+            file_hash = self._calculate_file_hash(file_bytes)
         
         # Generate unique filename
         filename = self._generate_unique_filename(original_filename)
@@ -422,11 +512,12 @@ class ImageStorageService:
         storage_path = self._get_storage_path(filename, user_id)
         
         # Process image
-        original_file_bytes = file_bytes  # Keep original for fallback
+        source = file_bytes  # Keep original for fallback
+        processed_bytes = None  # None means store the original upload unchanged
         processed_image = None
         
         try:
-            with PILImage.open(io.BytesIO(file_bytes)) as img:
+            with PILImage.open(self._open_source(source)) as img:
                 # Extract EXIF data BEFORE applying orientation (need original orientation tag)
                 exif_data = self._extract_exif_data(img)
                 
@@ -448,7 +539,7 @@ class ImageStorageService:
             logger.error(f"Failed to open/process image: {e}")
             # Fallback: process without EXIF orientation
             logger.info("Falling back to processing without EXIF orientation")
-            with PILImage.open(io.BytesIO(original_file_bytes)) as img:
+            with PILImage.open(self._open_source(source)) as img:
                 exif_data = self._extract_exif_data(img)
                 processed_image = img.copy()
                 width, height = processed_image.size
@@ -492,27 +583,38 @@ class ImageStorageService:
             
             try:
                 img.save(output, **save_kwargs)
-                file_bytes = output.getvalue()
+                processed_bytes = output.getvalue()
             except Exception as e:
                 logger.error(f"Failed to save processed image: {e}")
                 logger.info("Falling back to original image bytes")
-                file_bytes = original_file_bytes
-                with PILImage.open(io.BytesIO(original_file_bytes)) as fallback_img:
+                with PILImage.open(self._open_source(source)) as fallback_img:
                     width, height = fallback_img.size
                     format_name = fallback_img.format or 'JPEG'
                     mode = fallback_img.mode
         except Exception as e:
             logger.error(f"Failed to process image after EXIF orientation: {e}")
             logger.info("Falling back to original image bytes completely")
-            file_bytes = original_file_bytes
-            with PILImage.open(io.BytesIO(original_file_bytes)) as fallback_img:
+            processed_bytes = None
+            with PILImage.open(self._open_source(source)) as fallback_img:
                 width, height = fallback_img.size
                 format_name = fallback_img.format or 'JPEG'
                 mode = fallback_img.mode
         
-        # Save corrected image
-        with open(storage_path, 'wb') as f:
-            f.write(file_bytes)
+        # Save corrected image (or stream the original upload straight to disk).
+        # Write to a temp name and rename so a partial file never appears at storage_path
+        tmp_path = self._temp_path(storage_path)
+        try:
+            with open(tmp_path, 'xb') as f:
+                if processed_bytes is not None:
+                    f.write(processed_bytes)
+                    file_size = len(processed_bytes)
+                else:
+                    shutil.copyfileobj(self._open_source(source), f, self.STREAM_CHUNK_SIZE)
+                    file_size = self._source_size(source)
+            os.replace(tmp_path, storage_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
         
         # Return metadata - thumbnails and variants will be generated in background
         return {
@@ -521,7 +623,7 @@ class ImageStorageService:
             'storage_path': str(storage_path),
             'width': width,
             'height': height,
-            'file_size': len(file_bytes),
+            'file_size': file_size,
             'mime_type': f"image/{format_name.lower()}",
             'file_hash': file_hash,
             'exif': exif_data,
@@ -537,7 +639,8 @@ class ImageStorageService:
     def process_thumbnails(
         self,
         filename: str,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        skip_existing: bool = False
     ) -> Dict[str, str]:
         """
         Generate all thumbnail sizes for an image.
@@ -547,6 +650,8 @@ class ImageStorageService:
         Args:
             filename: The stored filename of the original image
             user_id: Optional user ID (deprecated, not used - kept for compatibility)
+            skip_existing: Reuse thumbnails already on disk instead of re-encoding them
+                (outputs are written atomically and derive from the immutable original)
             
         Returns:
             Dict mapping size names to thumbnail file paths
@@ -561,19 +666,30 @@ class ImageStorageService:
         if not storage_path or not storage_path.exists():
             raise FileNotFoundError(f"Original image not found: {filename}")
         
-        # Read the original image
-        with open(storage_path, 'rb') as f:
-            file_bytes = f.read()
-        
-        # Generate thumbnails for all sizes
+        # Work out which thumbnails still need to be generated
         thumbnail_paths = {}
+        pending = []
         for size_name in self.THUMBNAIL_SIZES.keys():
+            thumbnail_path = self._get_thumbnail_path(filename, size_name)
+            if skip_existing and thumbnail_path.exists():
+                thumbnail_paths[size_name] = str(thumbnail_path)
+                logger.info(f"⏭️  Reusing existing {size_name} thumbnail for {filename}")
+                continue
+            pending.append((size_name, thumbnail_path))
+        
+        if not pending:
+            return thumbnail_paths
+        
+        # Decode the original once, draft-scaled to the largest missing thumbnail, and
+        # cut every size from it (a 24MP JPEG decodes at 1/4 or 1/8 scale here)
+        with PILImage.open(storage_path) as original:
+            draft_bound = max(max(self.THUMBNAIL_SIZES[size_name]) for size_name, _ in pending)
+            img = self._prepare_for_scaling(original, draft_bound)
+        
+        for size_name, thumbnail_path in pending:
             try:
-                thumbnail_bytes = self._generate_thumbnail(file_bytes, size_name)
-                thumbnail_path = self._get_thumbnail_path(filename, size_name)
-                
-                with open(thumbnail_path, 'wb') as f:
-                    f.write(thumbnail_bytes)
+                thumbnail_bytes = self._thumbnail_decoded_image(img, size_name)
+                self._write_file_atomic(thumbnail_path, thumbnail_bytes)
                 
                 thumbnail_paths[size_name] = str(thumbnail_path)
                 logger.info(f"✅ Generated {size_name} thumbnail for {filename}")
@@ -587,7 +703,9 @@ class ImageStorageService:
     def process_variants(
         self,
         filename: str,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        skip_existing: bool = False,
+        display_sizes: Optional[List[Tuple[int, int]]] = None
     ) -> Dict[str, str]:
         """
         Generate all scaled variants for an image based on display sizes.
@@ -597,6 +715,9 @@ class ImageStorageService:
         Args:
             filename: The stored filename of the original image
             user_id: Optional user ID (deprecated, not used - kept for compatibility)
+            skip_existing: Reuse variants already on disk instead of re-encoding them
+            display_sizes: Pre-parsed display sizes; bulk regeneration loads them once
+                and passes them in so each image doesn't re-read the setting
             
         Returns:
             Dict mapping size strings (e.g. "1920x1080") to scaled file paths
@@ -611,31 +732,57 @@ class ImageStorageService:
         if not storage_path or not storage_path.exists():
             raise FileNotFoundError(f"Original image not found: {filename}")
         
-        # Read the original image
-        with open(storage_path, 'rb') as f:
-            file_bytes = f.read()
-        
-        # Load display sizes from configuration
-        display_sizes = self._load_display_sizes()
+        # Load display sizes from configuration unless the caller already did
+        if display_sizes is None:
+            display_sizes = self._load_display_sizes()
         logger.info(f"Generating scaled variants for display sizes: {display_sizes}")
         
-        # Generate scaled versions for each display size
+        # Resolve the output directory and name parts once, largest size first
+        storage_dir = self._get_storage_path(filename, user_id).parent
+        stem, suffix = Path(filename).stem, Path(filename).suffix
+        
+        # Work out which variants still need to be generated
         scaled_paths = {}
-        for target_width, target_height in display_sizes:
+        pending = []
+        for target_width, target_height in sorted(display_sizes, key=lambda s: s[0] * s[1], reverse=True):
+            scaled_filename = f"{stem}_{target_width}x{target_height}{suffix}"
+            scaled_path = storage_dir / scaled_filename
+            if skip_existing and scaled_path.exists():
+                scaled_paths[f"{target_width}x{target_height}"] = str(scaled_path)
+                logger.info(f"⏭️  Reusing existing scaled image: {scaled_filename}")
+                continue
+            pending.append((target_width, target_height, scaled_filename, scaled_path))
+        
+        if not pending:
+            return scaled_paths
+        
+        # Decode the original once (draft-scaled for JPEGs) and scale every missing size from it
+        with PILImage.open(storage_path) as original:
+            # Cover every pending target, including the extra width reserved for the movement effect
+            draft_bound = max(max(int(w * 1.15) + 1, h) for w, h, _, _ in pending)
+            img = self._prepare_for_scaling(original, draft_bound)
+        
+        # Hand each encoded variant to a writer thread so the disk write of one size
+        # overlaps the resize/encode of the next (both release the GIL)
+        writes = []
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            for target_width, target_height, scaled_filename, scaled_path in pending:
+                try:
+                    logger.info(f"Generating scaled image: {target_width}x{target_height} for {filename}")
+                    scaled_bytes = self._scale_decoded_image(img, target_width, target_height)
+                    writes.append((target_width, target_height, scaled_filename, scaled_path,
+                                   writer.submit(self._write_file_atomic, scaled_path, scaled_bytes)))
+                except Exception as e:
+                    logger.error(f"❌ Failed to generate scaled image {target_width}x{target_height} for {filename}: {e}")
+                    # Continue with other sizes even if one fails
+        
+        for target_width, target_height, scaled_filename, scaled_path, write in writes:
             try:
-                logger.info(f"Generating scaled image: {target_width}x{target_height} for {filename}")
-                scaled_bytes = self._generate_scaled_image(file_bytes, target_width, target_height)
-                scaled_filename = f"{Path(filename).stem}_{target_width}x{target_height}{Path(filename).suffix}"
-                scaled_path = self._get_storage_path(scaled_filename, user_id)
-                
-                with open(scaled_path, 'wb') as f:
-                    f.write(scaled_bytes)
-                
+                write.result()
                 scaled_paths[f"{target_width}x{target_height}"] = str(scaled_path)
                 logger.info(f"✅ Successfully created scaled image: {scaled_filename}")
             except Exception as e:
-                logger.error(f"❌ Failed to generate scaled image {target_width}x{target_height} for {filename}: {e}")
-                # Continue with other sizes even if one fails
+                logger.error(f"❌ Failed to write scaled image {target_width}x{target_height} for {filename}: {e}")
         
         return scaled_paths
     
@@ -882,6 +1029,81 @@ class ImageStorageService:
                                 return image_path
         return None
     
+    def find_image_paths(self, filenames: List[str]) -> Dict[str, Path]:
+        """
+        Locate many image files with a single walk of the year/month(/user) tree.
+        
+        get_image_path walks the tree and stats candidates for every call; this lists
+        each storage directory once with os.scandir and picks out the wanted names,
+        stopping as soon as all of them are found. Missing files are left out.
+        """
+        wanted = set(filenames)
+        found: Dict[str, Path] = {}
+        
+        def scan(directory: str) -> List[str]:
+            subdirs = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                    elif entry.name in wanted and entry.name not in found:
+                        found[entry.name] = Path(entry.path)
+            return subdirs
+        
+        with os.scandir(self.upload_path) as years:
+            year_dirs = [e.path for e in years if e.is_dir() and e.name.isdigit()]
+        for year_path in year_dirs:
+            with os.scandir(year_path) as months:
+                month_dirs = [e.path for e in months if e.is_dir() and e.name.isdigit()]
+            for month_path in month_dirs:
+                for user_dir in scan(month_path):
+                    scan(user_dir)
+                if len(found) == len(wanted):
+                    return found
+        return found
+    
+    def find_scaled_variant_paths(self, filename: str, since: Optional[datetime] = None) -> List[Path]:
+        """
+        Find the scaled variants of an image in the year/month(/user) storage tree.
+        
+        Variants are written to the storage directory of the month they were generated
+        in, which is never earlier than the upload, so month directories before `since`
+        are skipped (with a day of slack, as directories are named in local time).
+        Each remaining directory is listed once with os.scandir and names
+        are matched by prefix/suffix instead of a glob per directory.
+        """
+        stem, suffix = Path(filename).stem, Path(filename).suffix
+        prefix = f"{stem}_"
+        if since:
+            since = since - timedelta(days=1)
+        earliest = (since.year, since.month) if since else (0, 0)
+        matches: List[Path] = []
+        
+        def scan(directory: str) -> List[str]:
+            subdirs = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                    elif name.startswith(prefix) and name.endswith(suffix) and name != filename:
+                        matches.append(Path(entry.path))
+            return subdirs
+        
+        with os.scandir(self.upload_path) as years:
+            year_dirs = [(e.name, e.path) for e in years if e.is_dir() and e.name.isdigit()]
+        for year_name, year_path in year_dirs:
+            if int(year_name) < earliest[0]:
+                continue
+            with os.scandir(year_path) as months:
+                month_dirs = [(e.name, e.path) for e in months if e.is_dir() and e.name.isdigit()]
+            for month_name, month_path in month_dirs:
+                if (int(year_name), int(month_name)) < earliest:
+                    continue
+                for user_dir in scan(month_path):
+                    scan(user_dir)
+        return matches
+    
     def get_thumbnail_path(self, filename: str, size: str = 'medium') -> Optional[Path]:
         """Get the full path to a thumbnail"""
         thumbnail_path = self._get_thumbnail_path(filename, size)
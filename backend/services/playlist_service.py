@@ -1,9 +1,9 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, select
 from typing import List, Optional, Dict, Any
 from models import Playlist, Image
 from services.query_optimization_service import QueryOptimizationService
-from services.caching_service import cached, invalidate_playlist_cache
+from services.caching_service import cached, invalidate_image_cache, invalidate_playlist_cache
 import re
 from utils.logger import get_logger
 
@@ -78,6 +78,12 @@ class PlaylistService:
         """Get playlist by ID"""
         return self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
     
+    def _reload_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        """Re-read a playlist after a commit, with just the image IDs to_dict() needs"""
+        return self.db.query(Playlist).options(
+            selectinload(Playlist.images).load_only(Image.id)
+        ).filter(Playlist.id == playlist_id).first()
+    
     def get_playlist_by_slug(self, slug: str) -> Optional[Playlist]:
         """Get playlist by slug"""
         return self.db.query(Playlist).filter(Playlist.slug == slug).first()
@@ -87,8 +93,29 @@ class PlaylistService:
         return self.db.query(Playlist).filter(Playlist.is_default == True).first()
     
     def get_all_playlists(self) -> List[Playlist]:
-        """Get all playlists"""
-        return self.db.query(Playlist).all()
+        """
+        Get all playlists.
+        
+        Playlist.to_dict() counts each playlist's images, so their IDs are loaded
+        for every playlist in one extra IN query instead of a lazy load per playlist.
+        """
+        return self.db.query(Playlist).options(
+            selectinload(Playlist.images).load_only(Image.id)
+        ).all()
+    
+    def get_all_playlist_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Get all playlists serialized as by Playlist.to_dict(), for list endpoints.
+        
+        One query of plain column rows with each playlist's image count as a
+        correlated COUNT (served by the images.playlist_id index), so no Playlist
+        or Image objects are built.
+        """
+        image_count = select(func.count(Image.id)).where(
+            Image.playlist_id == Playlist.id
+        ).correlate(Playlist).scalar_subquery()
+        query = select(*Playlist.__table__.columns, image_count.label("image_count"))
+        return [Playlist.row_to_dict(row, row.image_count) for row in self.db.execute(query)]
     
     def update_playlist(self, playlist_id: int, name: Optional[str] = None, 
                        is_default: Optional[bool] = None, display_time_seconds: Optional[int] = None, 
@@ -169,8 +196,10 @@ class PlaylistService:
                 return False
             
             # Remove images from playlist (but don't delete the images)
+            image_ids = []
             for image in playlist.images:
                 image.playlist_id = None
+                image_ids.append(image.id)
             
             # Unassign any display devices from this playlist
             from models.display_device import DisplayDevice
@@ -183,8 +212,10 @@ class PlaylistService:
             self.db.delete(playlist)
             self.db.commit()
             
-            # Invalidate related caches
+            # Invalidate related caches; served-image snapshots carry playlist_id
             invalidate_playlist_cache(playlist_id)
+            for image_id in image_ids:
+                invalidate_image_cache(image_id)
             
             logger.info(f"Deleted playlist: {playlist_id}")
             return True
@@ -194,16 +225,16 @@ class PlaylistService:
             logger.error(f"Failed to delete playlist: {e}")
             raise
     
-    def add_image_to_playlist(self, playlist_id: int, image_id: int, position: Optional[int] = None) -> bool:
-        """Add image to playlist with optional position"""
+    def add_image_to_playlist(self, playlist_id: int, image_id: int, position: Optional[int] = None) -> Optional[Playlist]:
+        """Add image to playlist with optional position; returns the updated playlist"""
         try:
             playlist = self.get_playlist_by_id(playlist_id)
             if not playlist:
-                return False
+                return None
             
             image = self.db.query(Image).filter(Image.id == image_id).first()
             if not image:
-                return False
+                return None
             
             # Add to playlist
             image.playlist_id = playlist_id
@@ -218,27 +249,31 @@ class PlaylistService:
             playlist.sequence = sequence
             self.db.commit()
             
+            # Invalidate related caches; served-image snapshots carry playlist_id
+            invalidate_playlist_cache(playlist_id)
+            invalidate_image_cache(image_id)
+            
             logger.info(f"Added image {image_id} to playlist {playlist_id}")
-            return True
+            return self._reload_playlist(playlist_id)
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to add image to playlist: {e}")
             raise
     
-    def remove_image_from_playlist(self, playlist_id: int, image_id: int) -> bool:
-        """Remove image from playlist"""
+    def remove_image_from_playlist(self, playlist_id: int, image_id: int) -> Optional[Playlist]:
+        """Remove image from playlist; returns the updated playlist"""
         try:
             playlist = self.get_playlist_by_id(playlist_id)
             if not playlist:
-                return False
+                return None
             
             image = self.db.query(Image).filter(
                 and_(Image.id == image_id, Image.playlist_id == playlist_id)
             ).first()
             
             if not image:
-                return False
+                return None
             
             # Remove from playlist
             image.playlist_id = None
@@ -251,25 +286,31 @@ class PlaylistService:
             
             self.db.commit()
             
+            # Invalidate related caches; served-image snapshots carry playlist_id
+            invalidate_playlist_cache(playlist_id)
+            invalidate_image_cache(image_id)
+            
             logger.info(f"Removed image {image_id} from playlist {playlist_id}")
-            return True
+            return self._reload_playlist(playlist_id)
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to remove image from playlist: {e}")
             raise
     
-    def reorder_playlist(self, playlist_id: int, image_ids: List[int]) -> bool:
-        """Reorder images in playlist"""
+    def reorder_playlist(self, playlist_id: int, image_ids: List[int]) -> Optional[Playlist]:
+        """Reorder images in playlist; returns the updated playlist"""
         try:
             playlist = self.get_playlist_by_id(playlist_id)
             if not playlist:
-                return False
+                return None
             
-            # Validate that all image IDs belong to this playlist
-            playlist_image_ids = [img.id for img in playlist.images]
-            if not all(img_id in playlist_image_ids for img_id in image_ids):
-                return False
+            # Validate that all image IDs belong to this playlist (IDs only, as a set)
+            playlist_image_ids = set(self.db.scalars(
+                select(Image.id).where(Image.playlist_id == playlist_id)
+            ))
+            if not playlist_image_ids.issuperset(image_ids):
+                return None
             
             # Update sequence
             playlist.sequence = image_ids
@@ -279,22 +320,22 @@ class PlaylistService:
             invalidate_playlist_cache(playlist_id)
             
             logger.info(f"Reordered playlist {playlist_id}")
-            return True
+            return self._reload_playlist(playlist_id)
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to reorder playlist: {e}")
             raise
     
-    def randomize_playlist(self, playlist_id: int) -> bool:
-        """Randomize the order of images in playlist"""
+    def randomize_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        """Randomize the order of images in playlist; returns the updated playlist"""
         try:
             import random
             
             playlist = self.get_playlist_by_id(playlist_id)
             if not playlist or not playlist.images:
                 logger.warning(f"Playlist {playlist_id} not found or has no images")
-                return False
+                return None
             
             # Get all image IDs and shuffle them
             image_ids = [img.id for img in playlist.images]
@@ -337,7 +378,9 @@ class PlaylistService:
         
         return ordered_images
     
-    @cached("playlist_stats", ttl_seconds=1800)  # Cache for 30 minutes
+    # Fixed key: the default key hashes the service instance, so it never hit, and
+    # a readable key is what invalidate_playlist_cache's pattern match can find
+    @cached("playlist_stats", ttl_seconds=1800, key_func=lambda self: "playlist_stats")  # Cache for 30 minutes
     def get_playlist_statistics(self) -> Dict[str, Any]:
         """Get playlist statistics - using optimized query with caching"""
         return self.query_optimizer.get_playlist_statistics_optimized()
@@ -7,10 +7,35 @@ from models.playlist import Playlist
 from models.playlist_variant import PlaylistVariant, PlaylistVariantType
 from models.image import Image
 from services.image_storage_service import image_storage_service
+from services.caching_service import cache_service, invalidate_cache_pattern
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Selected variant IDs are cached per (playlist, bucketed device resolution)
+VARIANT_SELECTION_CACHE_PREFIX = "variant_selection"
+VARIANT_SELECTION_TTL_SECONDS = 300
+
+# Device geometry is snapped to these buckets before variant selection so
+# caches see one entry per bucket rather than per exact device geometry
+RESOLUTION_BUCKET_PX = 64
+DPR_BUCKETS = (1.0, 1.5, 2.0, 3.0)
+
+def bucket_device_geometry(width: int, height: int, device_pixel_ratio: float) -> Tuple[int, int, float]:
+    """Snap a device resolution and DPR to the shared buckets (idempotent)"""
+    width = max(RESOLUTION_BUCKET_PX, round(width / RESOLUTION_BUCKET_PX) * RESOLUTION_BUCKET_PX)
+    height = max(RESOLUTION_BUCKET_PX, round(height / RESOLUTION_BUCKET_PX) * RESOLUTION_BUCKET_PX)
+    device_pixel_ratio = min(DPR_BUCKETS, key=lambda bucket: abs(bucket - device_pixel_ratio))
+    return width, height, device_pixel_ratio
+
+def _variant_selection_key(playlist_id: int, device_width: int, device_height: int, device_pixel_ratio: float) -> str:
+    """Cache key for a variant selection; inputs must already be bucketed"""
+    return f"{VARIANT_SELECTION_CACHE_PREFIX}_{playlist_id}_{device_width}x{device_height}@{device_pixel_ratio}"
+
+def invalidate_variant_selection_cache(playlist_id: int) -> int:
+    """Drop cached variant selections for a playlist"""
+    return invalidate_cache_pattern(f"{VARIANT_SELECTION_CACHE_PREFIX}_{playlist_id}_")
+
 class PlaylistVariantService:
     """Service for creating and managing resolution-specific playlist variants"""
     
@@ -39,6 +64,7 @@ class PlaylistVariantService:
             
             # Clear existing variants
             self.db.query(PlaylistVariant).filter(PlaylistVariant.playlist_id == playlist_id).delete()
+            invalidate_variant_selection_cache(playlist_id)
             
             # Generate variants for each display size
             variants = []
@@ -274,7 +300,33 @@ class PlaylistVariantService:
     
     
     def get_best_variant_for_device(self, playlist_id: int, device_width: int, device_height: int, device_pixel_ratio: float = 1.0) -> Optional[PlaylistVariant]:
-        """Get the best playlist variant for a specific device resolution"""
+        """
+        Get the best playlist variant for a specific device resolution.
+        
+        Inputs go through bucket_device_geometry so a fleet of devices shares
+        a handful of cached selections instead of re-scoring every variant on
+        each request.
+        """
+        device_width, device_height, device_pixel_ratio = bucket_device_geometry(
+            device_width, device_height, device_pixel_ratio
+        )
+        
+        cache_key = _variant_selection_key(playlist_id, device_width, device_height, device_pixel_ratio)
+        cached_variant_id = cache_service.get(cache_key)
+        if cached_variant_id is not None:
+            variant = self.db.get(PlaylistVariant, cached_variant_id)
+            if variant is not None:
+                return variant
+            # Variant was regenerated elsewhere (e.g. by a Celery worker) - recompute
+            cache_service.delete(cache_key)
+        
+        best_variant = self._select_best_variant(playlist_id, device_width, device_height, device_pixel_ratio)
+        if best_variant is not None:
+            cache_service.set(cache_key, best_variant.id, VARIANT_SELECTION_TTL_SECONDS)
+        return best_variant
+    
+    def _select_best_variant(self, playlist_id: int, device_width: int, device_height: int, device_pixel_ratio: float) -> Optional[PlaylistVariant]:
+        """Score all variants of a playlist against a device resolution"""
         try:
             # Calculate effective resolution
             effective_width = int(device_width * device_pixel_ratio)
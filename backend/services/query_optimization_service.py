@@ -5,7 +5,7 @@ Provides optimized database queries and integrates with performance monitoring.
 
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, text
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from models import Image, Album, Playlist
 import logging
 from utils.performance_middleware import profile_query
@@ -110,6 +110,10 @@ class QueryOptimizationService:
     
     def get_duplicate_images_optimized(self) -> List[List[Image]]:
         """Optimized duplicate detection using SQL aggregation"""
+        return list(self.iter_image_groups(self.get_duplicate_image_id_groups()))
+    
+    def get_duplicate_image_id_groups(self) -> List[List[int]]:
+        """Group IDs of images sharing file size and dimensions (largest groups first)"""
         
         query = """
         SELECT file_size, width, height, COUNT(*) as count, GROUP_CONCAT(id) as image_ids
@@ -122,29 +126,52 @@ class QueryOptimizationService:
         ORDER BY count DESC
         """
         
-        with profile_query("get_duplicate_images_optimized"):
+        with profile_query("get_duplicate_image_id_groups"):
             result = self.db.execute(text(query))
-            duplicates = []
-            
-            for row in result:
-                image_ids = [int(id_str) for id_str in row.image_ids.split(',')]
-                
-                # Get the actual image objects
-                placeholders = ",".join([f":id_{i}" for i in range(len(image_ids))])
-                images_query = f"SELECT * FROM images WHERE id IN ({placeholders})"
-                param_dict = {f"id_{i}": img_id for i, img_id in enumerate(image_ids)}
-                images_result = self.db.execute(text(images_query), param_dict)
-                
-                image_group = []
-                for img_row in images_result:
-                    image = Image()
-                    for key, value in img_row._mapping.items():
-                        setattr(image, key, value)
-                    image_group.append(image)
-                
-                duplicates.append(image_group)
-            
-            return duplicates
+            return [
+                [int(id_str) for id_str in row.image_ids.split(',')]
+                for row in result
+            ]
+    
+    def iter_image_groups(self, id_groups: List[List[int]], batch_size: int = 500) -> Iterator[List[Image]]:
+        """
+        Lazily load groups of images, fetching about batch_size images per query
+        instead of one query per group.
+        """
+        batch: List[List[int]] = []
+        batch_count = 0
+        
+        for group in id_groups:
+            batch.append(group)
+            batch_count += len(group)
+            if batch_count >= batch_size:
+                yield from self._load_image_groups(batch)
+                batch = []
+                batch_count = 0
+        
+        if batch:
+            yield from self._load_image_groups(batch)
+    
+    def _load_image_groups(self, id_groups: List[List[int]]) -> List[List[Image]]:
+        """Load the images for several groups in one query, preserving group order"""
+        
+        image_ids = [img_id for group in id_groups for img_id in group]
+        placeholders = ",".join([f":id_{i}" for i in range(len(image_ids))])
+        images_query = f"SELECT * FROM images WHERE id IN ({placeholders})"
+        param_dict = {f"id_{i}": img_id for i, img_id in enumerate(image_ids)}
+        
+        with profile_query(f"load_image_groups: {len(image_ids)} images"):
+            images_by_id = {}
+            for img_row in self.db.execute(text(images_query), param_dict):
+                image = Image()
+                for key, value in img_row._mapping.items():
+                    setattr(image, key, value)
+                images_by_id[image.id] = image
+        
+        return [
+            [images_by_id[img_id] for img_id in group if img_id in images_by_id]
+            for group in id_groups
+        ]
     
     def get_image_statistics_optimized(self) -> Dict[str, Any]:
         """Optimized statistics using SQL aggregation"""
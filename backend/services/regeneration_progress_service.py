@@ -4,12 +4,16 @@ Service for tracking regeneration progress and providing real-time updates
 import asyncio
 import json
 import logging
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between websocket pushes for one task (4 Hz)
+PROGRESS_BROADCAST_INTERVAL = 0.25
+
 @dataclass
 class RegenerationProgress:
     """Progress data for regeneration task"""
@@ -47,6 +51,7 @@ class RegenerationProgressService:
     def __init__(self):
         self._active_tasks: Dict[str, RegenerationProgress] = {}
         self._websocket_connections: Dict[str, Any] = {}  # task_id -> websocket
+        self._last_broadcast: Dict[str, float] = {}  # task_id -> monotonic time of last push
     
     def start_task(self, task_id: str, total_images: int, display_sizes: list) -> RegenerationProgress:
         """Start tracking a new regeneration task"""
@@ -96,8 +101,13 @@ class RegenerationProgressService:
         if processed_images % 10 == 0 or processed_images == progress.total_images:
             logger.info(f"📊 Task {task_id}: {processed_images}/{progress.total_images} images processed ({progress.progress_percentage:.1f}%)")
         
-        # Broadcast to websocket
-        await self._broadcast_progress(task_id)
+        # Broadcast to websocket, at most every PROGRESS_BROADCAST_INTERVAL;
+        # the final image always goes out so the client sees 100%
+        now = time.monotonic()
+        if (processed_images == progress.total_images or
+                now - self._last_broadcast.get(task_id, 0.0) >= PROGRESS_BROADCAST_INTERVAL):
+            self._last_broadcast[task_id] = now
+            await self._broadcast_progress(task_id)
     
     def complete_task_sync(self, task_id: str, success: bool = True, error_message: str = None):
         """Mark a task as completed (synchronous version without WebSocket broadcast)"""
@@ -168,6 +178,7 @@ class RegenerationProgressService:
     async def _cleanup_task(self, task_id: str):
         """Clean up completed task after delay"""
         await asyncio.sleep(300)  # 5 minutes
+        self._last_broadcast.pop(task_id, None)
         if task_id in self._active_tasks:
             del self._active_tasks[task_id]
             logger.info(f"🧹 Cleaned up completed task {task_id}")
@@ -0,0 +1,93 @@
+"""
+Buffered writer for user logs submitted from the webapp.
+
+Log submissions are queued in memory and inserted in batches by a single
+background task, instead of one transaction per request.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from models.user_log import UserLog
+
+logger = logging.getLogger(__name__)
+
+# Queue bound; submissions beyond this are dropped (logging is best effort)
+USER_LOG_QUEUE_SIZE = 10000
+# Rows per INSERT batch
+USER_LOG_BATCH_SIZE = 500
+# Longest a queued row waits before it is written
+USER_LOG_FLUSH_INTERVAL = 1.0
+
+
+class UserLogWriter:
+    """Batches user log rows into bulk inserts"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = None
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue a user log row for insertion; False if the buffer is full"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=USER_LOG_QUEUE_SIZE)
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("User log buffer full, dropping log entry")
+            return False
+
+    async def run(self):
+        """Drain the queue forever, writing up to USER_LOG_BATCH_SIZE rows per flush"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=USER_LOG_QUEUE_SIZE)
+        # Rows taken off the queue but not yet written; flushed on cancel too
+        rows: List[Dict[str, Any]] = []
+        try:
+            while True:
+                rows = [await self._queue.get()]
+                deadline = asyncio.get_running_loop().time() + USER_LOG_FLUSH_INTERVAL
+                while len(rows) < USER_LOG_BATCH_SIZE:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                batch, rows = rows, []
+                try:
+                    await asyncio.to_thread(self._write, batch)
+                except Exception as e:
+                    # Lose this batch only; the writer must keep draining
+                    logger.error(f"Failed to write {len(batch)} user logs: {e}")
+        except asyncio.CancelledError:
+            # Flush the batch being collected and whatever is still queued
+            pending = rows
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            if pending:
+                self._write(pending)
+            raise
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        """Insert a batch of rows in one transaction"""
+        from models import database as db_module
+
+        db = None
+        try:
+            # Raises until setup has configured the DB; that only costs this batch
+            db_module.ensure_database_initialized()
+            db = db_module.SessionLocal()
+            db.bulk_insert_mappings(UserLog, rows)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} user logs: {e}")
+            if db is not None:
+                db.rollback()
+        finally:
+            if db is not None:
+                db.close()
+
+# Global instance
+user_log_writer = UserLogWriter()
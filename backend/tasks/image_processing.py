@@ -15,6 +15,7 @@ if '/app' not in sys.path:
 from celery import Task
 from celery_app import celery_app
 from datetime import datetime
+from typing import Optional
 import logging
 from websocket.processing_notifier import (
     notify_thumbnail_complete,
@@ -40,7 +41,8 @@ class DatabaseTask(Task):
         if self._db is None:
             from models import database as db_module
             db_module.ensure_database_initialized()
-            self._db = db_module.SessionLocal()
+            # Tasks commit status between stages and keep using the same rows
+            self._db = db_module.SessionLocal(expire_on_commit=False)
         return self._db
     
     def after_return(self, *args, **kwargs):
@@ -85,12 +87,13 @@ def process_thumbnails(self, image_id: int, filename: str, user_id: int):
         image.thumbnail_status = 'processing'
         image.processing_status = 'processing'
         image.processing_attempts += 1
-        image.last_processing_attempt = datetime.now()
+        image.last_processing_attempt = datetime.utcnow()
         self.db.commit()
         
         # Check circuit breaker
-        if image_processing_circuit_breaker.is_open(image_id):
-            error_msg = f"Circuit breaker open after {image_processing_circuit_breaker.get_failure_count(image_id)} failures"
+        circuit_open, failure_count = image_processing_circuit_breaker.probe(image_id)
+        if circuit_open:
+            error_msg = f"Circuit breaker open after {failure_count} failures"
             logger.warning(f"⚠️ {error_msg} for image {image_id}")
             image.thumbnail_status = 'failed'
             image.processing_status = 'failed'
@@ -107,7 +110,7 @@ def process_thumbnails(self, image_id: int, filename: str, user_id: int):
             # Mark overall as complete only if variants are also done
             if image.variant_status == 'complete':
                 image.processing_status = 'complete'
-                image.processing_completed_at = datetime.now()
+                image.processing_completed_at = datetime.utcnow()
             image.processing_error = None
             self.db.commit()
             
@@ -136,7 +139,7 @@ def process_thumbnails(self, image_id: int, filename: str, user_id: int):
 
 
 @celery_app.task(base=DatabaseTask, bind=True, name='tasks.image_processing.process_variants')
-def process_variants(self, image_id: int, filename: str, user_id: int):
+def process_variants(self, image_id: int, filename: str, user_id: int, display_sizes: Optional[list] = None):
     """
     Generate display-sized variants for an image.
     
@@ -146,6 +149,7 @@ def process_variants(self, image_id: int, filename: str, user_id: int):
         image_id: Database ID of the image
         filename: Stored filename (hash-based)
         user_id: User who owns the image
+        display_sizes: Optional [width, height] pairs loaded once by bulk regeneration
         
     Returns:
         dict: Status and result information
@@ -157,6 +161,7 @@ def process_variants(self, image_id: int, filename: str, user_id: int):
     
     from models import Image
     from services.image_storage_service import image_storage_service
+    from services.image_service import ImageService
     from utils.retry import image_processing_circuit_breaker
     
     logger.info(f"🔄 [Task] Processing variants for image {image_id}: {filename}")
@@ -172,12 +177,13 @@ def process_variants(self, image_id: int, filename: str, user_id: int):
         image.variant_status = 'processing'
         image.processing_status = 'processing'
         image.processing_attempts += 1
-        image.last_processing_attempt = datetime.now()
+        image.last_processing_attempt = datetime.utcnow()
         self.db.commit()
         
         # Check circuit breaker
-        if image_processing_circuit_breaker.is_open(image_id):
-            error_msg = f"Circuit breaker open after {image_processing_circuit_breaker.get_failure_count(image_id)} failures"
+        circuit_open, failure_count = image_processing_circuit_breaker.probe(image_id)
+        if circuit_open:
+            error_msg = f"Circuit breaker open after {failure_count} failures"
             logger.warning(f"⚠️ {error_msg} for image {image_id}")
             image.variant_status = 'failed'
             image.processing_status = 'failed'
@@ -187,14 +193,17 @@ def process_variants(self, image_id: int, filename: str, user_id: int):
         
         # Process variants
         try:
-            image_storage_service.process_variants(filename, user_id)
+            if display_sizes is not None:
+                display_sizes = [tuple(size) for size in display_sizes]
+            variant_paths = image_storage_service.process_variants(filename, user_id, display_sizes=display_sizes)
+            ImageService(self.db).record_variants(image_id, variant_paths)
             
             # Update status to complete
             image.variant_status = 'complete'
             # Mark overall as complete only if thumbnails are also done
             if image.thumbnail_status == 'complete':
                 image.processing_status = 'complete'
-                image.processing_completed_at = datetime.now()
+                image.processing_completed_at = datetime.utcnow()
             image.processing_error = None
             self.db.commit()
             
@@ -223,7 +232,7 @@ def process_variants(self, image_id: int, filename: str, user_id: int):
 
 
 @celery_app.task(base=DatabaseTask, bind=True, name='tasks.image_processing.process_full_image')
-def process_full_image(self, image_id: int, filename: str, user_id: int):
+def process_full_image(self, image_id: int, filename: str, user_id: int, reset_breaker: bool = False):
     """
     Process both thumbnails AND variants for an image.
     
@@ -233,6 +242,8 @@ def process_full_image(self, image_id: int, filename: str, user_id: int):
         image_id: Database ID of the image
         filename: Stored filename (hash-based)
         user_id: User who owns the image
+        reset_breaker: Clear this worker's circuit breaker for the image first
+            (manual retries; the API process can't reach the worker's breaker)
         
     Returns:
         dict: Status and result information
@@ -244,6 +255,7 @@ def process_full_image(self, image_id: int, filename: str, user_id: int):
     
     from models import Image
     from services.image_storage_service import image_storage_service
+    from services.image_service import ImageService
     from utils.retry import image_processing_circuit_breaker
     
     logger.info(f"🔄 [Task] Full processing for image {image_id}: {filename}")
@@ -260,12 +272,16 @@ def process_full_image(self, image_id: int, filename: str, user_id: int):
         image.variant_status = 'processing'
         image.processing_status = 'processing'
         image.processing_attempts += 1
-        image.last_processing_attempt = datetime.now()
+        image.last_processing_attempt = datetime.utcnow()
         self.db.commit()
         
+        if reset_breaker:
+            image_processing_circuit_breaker.reset(image_id)
+        
         # Check circuit breaker
-        if image_processing_circuit_breaker.is_open(image_id):
-            error_msg = f"Circuit breaker open after {image_processing_circuit_breaker.get_failure_count(image_id)} failures"
+        circuit_open, failure_count = image_processing_circuit_breaker.probe(image_id)
+        if circuit_open:
+            error_msg = f"Circuit breaker open after {failure_count} failures"
             logger.warning(f"⚠️ {error_msg} for image {image_id}")
             image.thumbnail_status = 'failed'
             image.variant_status = 'failed'
@@ -277,7 +293,7 @@ def process_full_image(self, image_id: int, filename: str, user_id: int):
         # Process both thumbnails and variants
         try:
             # Step 1: Thumbnails
-            thumbnail_paths = image_storage_service.process_thumbnails(filename, user_id)
+            thumbnail_paths = image_storage_service.process_thumbnails(filename, user_id, skip_existing=True)
             image.thumbnail_status = 'complete'
             self.db.commit()
             logger.info(f"✅ [Task] Thumbnails complete for image {image_id}")
@@ -286,10 +302,11 @@ def process_full_image(self, image_id: int, filename: str, user_id: int):
             notify_thumbnail_complete(image_id, len(thumbnail_paths))
             
             # Step 2: Variants
-            variant_paths = image_storage_service.process_variants(filename, user_id)
+            variant_paths = image_storage_service.process_variants(filename, user_id, skip_existing=True)
+            ImageService(self.db).record_variants(image_id, variant_paths)
             image.variant_status = 'complete'
             image.processing_status = 'complete'
-            image.processing_completed_at = datetime.now()
+            image.processing_completed_at = datetime.utcnow()
             image.processing_error = None
             self.db.commit()
             logger.info(f"✅ [Task] Variants complete for image {image_id}")
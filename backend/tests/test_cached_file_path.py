@@ -0,0 +1,28 @@
+"""Cached file paths are re-checked so a removed file is re-resolved"""
+from api.images import _cached_file_path
+from services.caching_service import cache_service
+
+IMAGE_ID = 4343
+
+
+def test_missing_cached_path_is_resolved_again(tmp_path):
+    cache_service.invalidate_pattern(f"image_{IMAGE_ID}_")
+    first = tmp_path / "first.jpg"
+    second = tmp_path / "second.jpg"
+    first.write_bytes(b"a")
+    second.write_bytes(b"b")
+
+    assert _cached_file_path(IMAGE_ID, "original", lambda: first) == first
+
+    first.unlink()
+    assert _cached_file_path(IMAGE_ID, "original", lambda: second) == second
+
+
+def test_missing_file_with_nothing_to_resolve_returns_none(tmp_path):
+    cache_service.invalidate_pattern(f"image_{IMAGE_ID}_")
+    path = tmp_path / "gone.jpg"
+    path.write_bytes(b"a")
+    assert _cached_file_path(IMAGE_ID, "medium", lambda: path) == path
+
+    path.unlink()
+    assert _cached_file_path(IMAGE_ID, "medium", lambda: path) is None
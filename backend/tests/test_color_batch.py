@@ -0,0 +1,46 @@
+"""Color batch claims its images while it runs and always releases them"""
+import pytest
+
+from api import images as images_api
+
+
+@pytest.fixture(autouse=True)
+def clean_claims():
+    images_api._colors_in_flight.clear()
+    yield
+    images_api._colors_in_flight.clear()
+
+
+def test_batch_claims_while_running_and_releases(monkeypatch):
+    seen = []
+    monkeypatch.setattr(images_api, "_extract_colors_pooled",
+                        lambda ids: seen.append((list(ids), set(images_api._colors_in_flight))))
+
+    images_api._run_color_batch([1, 2, 3])
+
+    assert seen == [([1, 2, 3], {1, 2, 3})]
+    assert images_api._colors_in_flight == set()
+
+
+def test_batch_skips_images_claimed_by_a_running_batch(monkeypatch):
+    images_api._colors_in_flight.update({2})
+    seen = []
+    monkeypatch.setattr(images_api, "_extract_colors_pooled", lambda ids: seen.append(list(ids)))
+
+    images_api._run_color_batch([1, 2, 3])
+
+    assert seen == [[1, 3]]
+    # The other batch's claim is left alone
+    assert images_api._colors_in_flight == {2}
+
+
+def test_batch_releases_claims_when_extraction_fails(monkeypatch):
+    def boom(ids):
+        raise RuntimeError("pool died")
+
+    monkeypatch.setattr(images_api, "_extract_colors_pooled", boom)
+
+    with pytest.raises(RuntimeError):
+        images_api._run_color_batch([1, 2])
+
+    assert images_api._colors_in_flight == set()
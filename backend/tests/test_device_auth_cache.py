@@ -0,0 +1,76 @@
+"""Cached device auth lookups are dropped when a device's status or token changes"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.display_devices import reset_device
+from models.display_device import DeviceStatus
+from services.caching_service import cache_service
+from services.display_device_service import DisplayDeviceService
+
+TOKEN = "test-device-token"
+DEVICE_ID = 7
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache_service.delete(f"device_auth_{TOKEN}")
+    yield
+    cache_service.delete(f"device_auth_{TOKEN}")
+
+
+def _device(status=DeviceStatus.AUTHORIZED):
+    return SimpleNamespace(id=DEVICE_ID, device_token=TOKEN, status=status)
+
+
+def _db(device):
+    """Session whose every query finds `device` (as a row for column queries)"""
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = device
+    return db
+
+
+def _prime_auth_cache(status=DeviceStatus.AUTHORIZED):
+    db = _db(SimpleNamespace(id=DEVICE_ID, status=status))
+    assert DisplayDeviceService(db).get_device_auth(TOKEN) == (DEVICE_ID, status)
+    # Served from cache from now on
+    assert DisplayDeviceService(_db(None)).get_device_auth(TOKEN) == (DEVICE_ID, status)
+
+
+def test_reject_drops_cached_auth():
+    _prime_auth_cache()
+    DisplayDeviceService(_db(_device())).reject_device(DEVICE_ID, SimpleNamespace(id=1, username="admin"))
+
+    db = _db(SimpleNamespace(id=DEVICE_ID, status=DeviceStatus.REJECTED))
+    assert DisplayDeviceService(db).get_device_auth(TOKEN) == (DEVICE_ID, DeviceStatus.REJECTED)
+
+
+def test_delete_drops_cached_auth():
+    _prime_auth_cache()
+    DisplayDeviceService(_db(_device())).delete_device(DEVICE_ID)
+
+    assert DisplayDeviceService(_db(None)).get_device_auth(TOKEN) is None
+
+
+def test_authorize_drops_cached_auth():
+    _prime_auth_cache(DeviceStatus.PENDING)
+    DisplayDeviceService(_db(_device(DeviceStatus.PENDING))).authorize_device(
+        DEVICE_ID, SimpleNamespace(id=1, username="admin")
+    )
+
+    db = _db(SimpleNamespace(id=DEVICE_ID, status=DeviceStatus.AUTHORIZED))
+    assert DisplayDeviceService(db).get_device_auth(TOKEN) == (DEVICE_ID, DeviceStatus.AUTHORIZED)
+
+
+def test_reset_drops_cached_auth_for_old_token():
+    _prime_auth_cache()
+    device = _device()
+
+    result = asyncio.run(reset_device(DEVICE_ID, SimpleNamespace(username="admin"), _db(device)))
+
+    assert result["success"] is True
+    assert device.device_token != TOKEN
+    # The old token no longer resolves to the (now re-tokened) device
+    assert DisplayDeviceService(_db(None)).get_device_auth(TOKEN) is None
@@ -0,0 +1,19 @@
+"""Smart serving and variant selection share one device geometry bucketing"""
+import pytest
+
+from services.playlist_variant_service import bucket_device_geometry
+
+
+@pytest.mark.parametrize("geometry, expected", [
+    ((1920, 1080, 1.0), (1920, 1088, 1.0)),
+    ((1366, 768, 1.25), (1344, 768, 1.0)),
+    ((810, 1280, 2.2), (832, 1280, 2.0)),
+    ((10, 10, 4.0), (64, 64, 3.0)),
+])
+def test_bucket_device_geometry(geometry, expected):
+    assert bucket_device_geometry(*geometry) == expected
+
+
+def test_bucket_device_geometry_is_idempotent():
+    once = bucket_device_geometry(1366, 768, 1.7)
+    assert bucket_device_geometry(*once) == once
@@ -0,0 +1,79 @@
+"""ErrorCatchMiddleware turns unhandled route errors into a generic JSON 500"""
+import logging
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from utils.error_middleware import ErrorCatchMiddleware
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    # Same order as main.py: ErrorCatchMiddleware innermost, CORS outside it
+    app.add_middleware(ErrorCatchMiddleware)
+    app.add_middleware(CORSMiddleware, allow_origins=["http://display.local"])
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("secret detail")
+
+    @app.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="Not here")
+
+    @app.get("/ok")
+    def ok():
+        return {"ok": True}
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_unhandled_error_becomes_generic_500(client, caplog):
+    with caplog.at_level(logging.ERROR, logger="utils.error_middleware"):
+        response = client.get("/boom")
+
+    assert response.status_code == 500
+    assert response.headers["content-type"] == "application/json"
+    # Exception text stays in the log, not the response
+    assert response.json() == {"detail": "Internal server error"}
+    assert "GET /boom failed: secret detail" in caplog.text
+
+
+def test_500_keeps_outer_middleware_headers(client):
+    response = client.get("/boom", headers={"Origin": "http://display.local"})
+
+    assert response.status_code == 500
+    assert response.headers["access-control-allow-origin"] == "http://display.local"
+
+
+def test_http_exceptions_pass_through(client):
+    response = client.get("/missing")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not here"}
+
+
+def test_successful_responses_untouched(client):
+    response = client.get("/ok")
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+
+
+def test_error_after_response_started_is_reraised():
+    app = FastAPI()
+    app.add_middleware(ErrorCatchMiddleware)
+
+    @app.get("/stream")
+    def stream():
+        def body():
+            yield b"partial"
+            raise RuntimeError("mid-stream")
+        return StreamingResponse(body(), media_type="text/plain")
+
+    with pytest.raises(RuntimeError, match="mid-stream"):
+        TestClient(app).get("/stream")
@@ -0,0 +1,140 @@
+"""Manual retry must clear the circuit breaker in the process that runs the job"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import BackgroundTasks
+
+import tasks.image_processing as image_tasks
+from api import images as images_api
+from utils.retry import image_processing_circuit_breaker
+
+IMAGE_ID = 4242
+
+
+def _open_breaker(image_id):
+    for _ in range(image_processing_circuit_breaker.failure_threshold):
+        image_processing_circuit_breaker.record_failure(image_id)
+    assert image_processing_circuit_breaker.is_open(image_id)
+
+
+@pytest.fixture(autouse=True)
+def clean_breaker():
+    image_processing_circuit_breaker.reset(IMAGE_ID)
+    yield
+    image_processing_circuit_breaker.reset(IMAGE_ID)
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """process_full_image with a fake session and no real file work"""
+    image = SimpleNamespace(
+        id=IMAGE_ID, thumbnail_status='failed', variant_status='failed',
+        processing_status='failed', processing_attempts=0,
+        last_processing_attempt=None, processing_completed_at=None, processing_error=None,
+    )
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = image
+    monkeypatch.setattr(image_tasks.process_full_image, "_db", db, raising=False)
+
+    from services.image_storage_service import image_storage_service
+    from services.image_service import ImageService
+    monkeypatch.setattr(image_storage_service, "process_thumbnails", lambda *a, **k: [])
+    monkeypatch.setattr(image_storage_service, "process_variants", lambda *a, **k: {})
+    monkeypatch.setattr(ImageService, "record_variants", lambda *a, **k: None)
+    for name in ("notify_thumbnail_complete", "notify_variant_complete",
+                 "notify_processing_complete", "notify_processing_failed"):
+        monkeypatch.setattr(image_tasks, name, lambda *a, **k: None)
+    return image
+
+
+def test_worker_skips_image_with_open_breaker(worker):
+    _open_breaker(IMAGE_ID)
+
+    result = image_tasks.process_full_image.run(IMAGE_ID, "a.jpg", 1)
+
+    assert result["status"] == "skipped"
+    assert worker.processing_status == "failed"
+    assert worker.processing_error.startswith("Circuit breaker open")
+
+
+def test_worker_retry_resets_open_breaker(worker):
+    _open_breaker(IMAGE_ID)
+
+    result = image_tasks.process_full_image.run(IMAGE_ID, "a.jpg", 1, reset_breaker=True)
+
+    assert result["status"] == "success"
+    assert worker.processing_status == "complete"
+    assert worker.processing_error is None
+    assert not image_processing_circuit_breaker.is_open(IMAGE_ID)
+
+
+def test_retry_asks_celery_worker_to_reset_breaker(monkeypatch):
+    monkeypatch.setenv("USE_CELERY", "true")
+    delay = MagicMock(return_value=SimpleNamespace(id="task-1"))
+    monkeypatch.setattr(image_tasks.process_full_image, "delay", delay)
+
+    queued = images_api._queue_image_processing(BackgroundTasks(), IMAGE_ID, "a.jpg", 1, reset_breaker=True)
+
+    assert queued is True
+    delay.assert_called_once_with(IMAGE_ID, "a.jpg", 1, reset_breaker=True)
+
+
+def test_retry_fallback_resets_breaker_in_process(monkeypatch):
+    monkeypatch.setenv("USE_CELERY", "false")
+    _open_breaker(IMAGE_ID)
+    background_tasks = BackgroundTasks()
+
+    queued = images_api._queue_image_processing(background_tasks, IMAGE_ID, "a.jpg", 1, reset_breaker=True)
+
+    assert queued is False
+    assert len(background_tasks.tasks) == 1
+    assert not image_processing_circuit_breaker.is_open(IMAGE_ID)
+
+
+def test_retry_all_asks_celery_workers_to_reset_breakers(monkeypatch):
+    monkeypatch.setenv("USE_CELERY", "true")
+    signatures = []
+
+    def fake_s(*args, **kwargs):
+        signatures.append((args, kwargs))
+        return MagicMock()
+
+    monkeypatch.setattr(image_tasks.process_full_image, "s", fake_s)
+    group = MagicMock()
+    group.return_value.apply_async.return_value = SimpleNamespace(id="group-1")
+    monkeypatch.setattr("celery.group", group)
+
+    jobs = [(IMAGE_ID, "a.jpg"), (IMAGE_ID + 1, "b.jpg")]
+    queued = images_api._queue_image_processing_many(BackgroundTasks(), jobs, 1, reset_breaker=True)
+
+    assert queued is True
+    assert signatures == [
+        ((IMAGE_ID, "a.jpg", 1), {"reset_breaker": True}),
+        ((IMAGE_ID + 1, "b.jpg", 1), {"reset_breaker": True}),
+    ]
+
+
+def test_retry_all_fallback_resets_breakers_in_process(monkeypatch):
+    monkeypatch.setenv("USE_CELERY", "false")
+    _open_breaker(IMAGE_ID)
+    background_tasks = BackgroundTasks()
+
+    jobs = [(IMAGE_ID, "a.jpg"), (IMAGE_ID + 1, "b.jpg")]
+    queued = images_api._queue_image_processing_many(background_tasks, jobs, 1, reset_breaker=True)
+
+    assert queued is False
+    # One pooled batch for the whole retry, not one task per image
+    assert len(background_tasks.tasks) == 1
+    assert background_tasks.tasks[0].func is images_api._run_processing_batch
+    assert background_tasks.tasks[0].args == (jobs, 1)
+    assert not image_processing_circuit_breaker.is_open(IMAGE_ID)
+
+
+def test_processing_batch_runs_every_job_for_the_user(monkeypatch):
+    calls = []
+    monkeypatch.setattr(images_api, "_run_pooled", lambda label, fn, jobs, *extra, user_id=1: calls.append((fn, jobs, user_id)))
+
+    images_api._run_processing_batch([(IMAGE_ID, "a.jpg")], 9)
+
+    assert calls == [(images_api.process_image_background, [(IMAGE_ID, "a.jpg")], 9)]
@@ -0,0 +1,86 @@
+"""ETag / If-None-Match handling for cached playlist responses"""
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from api.playlists import _cached_playlist_payload, _not_modified
+from services.caching_service import cache_service, playlist_response_key
+
+ETAG = '"0123456789abcdef"'
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("if_none_match", [
+    ETAG,
+    f"W/{ETAG}",
+    f'"other", {ETAG}',
+    f' "other" ,W/{ETAG} ',
+    "*",
+])
+def test_matching_if_none_match_returns_304(if_none_match):
+    response = Response()
+
+    result = _not_modified(_request(if_none_match), response, ETAG)
+
+    assert result is not None
+    assert result.status_code == 304
+    assert result.body == b""
+    assert result.headers["etag"] == ETAG
+    assert result.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.parametrize("if_none_match", [None, "", '"other"', '"0123456789abcdef', "W/\"other\""])
+def test_non_matching_if_none_match_tags_response(if_none_match):
+    response = Response()
+
+    assert _not_modified(_request(if_none_match), response, ETAG) is None
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_etag_is_stable_per_payload_and_changes_with_it():
+    name = "test_etag_payload"
+    cache_service.delete(playlist_response_key(name))
+    payload, etag = _cached_playlist_payload(name, 60, lambda: {"id": 1, "name": "a"})
+
+    # Served from cache: the build is not called again and the ETag is reused
+    assert _cached_playlist_payload(name, 60, lambda: pytest.fail("rebuilt")) == (payload, etag)
+
+    cache_service.delete(playlist_response_key(name))
+    _, changed = _cached_playlist_payload(name, 60, lambda: {"id": 1, "name": "b"})
+    assert changed != etag
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_none_payload_is_not_cached():
+    name = "test_etag_missing"
+    cache_service.delete(playlist_response_key(name))
+
+    assert _cached_playlist_payload(name, 60, lambda: None) is None
+    assert cache_service.get(playlist_response_key(name)) is None
+
+
+def test_conditional_get_round_trip():
+    app = FastAPI()
+
+    @app.get("/item")
+    def item(request: Request, response: Response):
+        not_modified = _not_modified(request, response, ETAG)
+        if not_modified:
+            return not_modified
+        return {"id": 1}
+
+    client = TestClient(app)
+    first = client.get("/item")
+    assert first.status_code == 200
+    assert first.json() == {"id": 1}
+    assert first.headers["etag"] == ETAG
+
+    second = client.get("/item", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.content == b""
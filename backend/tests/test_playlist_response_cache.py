@@ -0,0 +1,33 @@
+"""Playlist responses built across a write's invalidation are not cached"""
+from services.caching_service import (
+    cache_service, invalidate_playlist_cache, playlist_response_generation, playlist_response_key,
+    set_playlist_response,
+)
+
+KEY = playlist_response_key("playlist_777")
+
+
+def setup_function():
+    cache_service.delete(KEY)
+
+
+def test_store_without_intervening_write_is_cached():
+    generation = playlist_response_generation()
+
+    assert set_playlist_response(KEY, ({"id": 777}, '"etag"'), 60, generation) is True
+    assert cache_service.get(KEY) == ({"id": 777}, '"etag"')
+
+
+def test_store_after_intervening_write_is_skipped():
+    generation = playlist_response_generation()
+    # A write lands while the (pre-write) payload is being built
+    invalidate_playlist_cache(777)
+
+    assert set_playlist_response(KEY, ({"id": 777, "name": "old"}, '"stale"'), 60, generation) is False
+    assert cache_service.get(KEY) is None
+
+
+def test_invalidation_bumps_generation():
+    before = playlist_response_generation()
+    invalidate_playlist_cache()
+    assert playlist_response_generation() == before + 1
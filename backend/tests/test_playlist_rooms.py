@@ -0,0 +1,35 @@
+"""Playlist rooms follow scheduler changes and playlist deletion"""
+from websocket.manager import ConnectionManager
+
+
+def test_scheduler_change_moves_device_to_new_room():
+    manager = ConnectionManager()
+    manager.subscribe("token-a", 1, device_id=10)
+
+    manager.move_device(10, 2)
+
+    assert manager.device_playlists["token-a"] == 2
+    assert manager.playlist_rooms == {2: {"token-a"}}
+
+
+def test_scheduler_change_for_unknown_device_is_ignored():
+    manager = ConnectionManager()
+    manager.subscribe("token-a", 1, device_id=10)
+
+    manager.move_device(99, 2)
+
+    assert manager.playlist_rooms == {1: {"token-a"}}
+
+
+def test_deleted_playlist_room_is_closed():
+    manager = ConnectionManager()
+    manager.subscribe("token-a", 1, device_id=10)
+    manager.subscribe("token-b", 1, device_id=11)
+    manager.subscribe("token-c", 2, device_id=12)
+
+    manager.close_playlist_room(1)
+
+    # Devices of the deleted playlist have no known playlist again
+    assert "token-a" not in manager.device_playlists
+    assert "token-b" not in manager.device_playlists
+    assert manager.playlist_rooms == {2: {"token-c"}}
@@ -0,0 +1,158 @@
+"""UserLogWriter must not lose rows when it is cancelled on shutdown"""
+import asyncio
+
+from services import user_log_writer as writer_module
+from services.user_log_writer import UserLogWriter
+
+
+def _run_until_cancelled(writer, rows, monkeypatch, flush_interval=60.0):
+    written = []
+    monkeypatch.setattr(writer_module, "USER_LOG_FLUSH_INTERVAL", flush_interval)
+    monkeypatch.setattr(writer, "_write", lambda batch: written.append(list(batch)))
+
+    async def scenario():
+        for row in rows:
+            writer.enqueue(row)
+        task = asyncio.create_task(writer.run())
+        # Let the writer dequeue everything into its batch window
+        for _ in range(10):
+            await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    return written
+
+
+def test_cancel_during_batch_window_flushes_dequeued_rows(monkeypatch):
+    writer = UserLogWriter()
+    rows = [{"message": f"log {i}"} for i in range(3)]
+
+    written = _run_until_cancelled(writer, rows, monkeypatch)
+
+    assert [row for batch in written for row in batch] == rows
+
+
+def test_cancel_flushes_dequeued_and_still_queued_rows(monkeypatch):
+    monkeypatch.setattr(writer_module, "USER_LOG_BATCH_SIZE", 2)
+    writer = UserLogWriter()
+    rows = [{"message": f"log {i}"} for i in range(5)]
+    written = []
+    monkeypatch.setattr(writer_module, "USER_LOG_FLUSH_INTERVAL", 60.0)
+
+    async def scenario():
+        for row in rows:
+            writer.enqueue(row)
+        blocked = asyncio.Event()
+
+        async def slow_to_thread(fn, batch):
+            # First batch is written; the writer is cancelled before the next
+            written.append(list(batch))
+            blocked.set()
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(writer_module.asyncio, "to_thread", slow_to_thread)
+        monkeypatch.setattr(writer, "_write", lambda batch: written.append(list(batch)))
+        task = asyncio.create_task(writer.run())
+        await blocked.wait()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+
+    assert [row for batch in written for row in batch] == rows
+
+
+def test_cancel_with_empty_queue_writes_nothing(monkeypatch):
+    writer = UserLogWriter()
+
+    written = _run_until_cancelled(writer, [], monkeypatch)
+
+    assert written == []
+
+
+def test_failed_flush_loses_only_that_batch(monkeypatch):
+    monkeypatch.setattr(writer_module, "USER_LOG_FLUSH_INTERVAL", 0.01)
+    writer = UserLogWriter()
+    written = []
+    attempts = []
+
+    def flaky_write(batch):
+        attempts.append(list(batch))
+        if len(attempts) == 1:
+            raise RuntimeError("Database not configured")
+        written.append(list(batch))
+
+    monkeypatch.setattr(writer, "_write", flaky_write)
+
+    async def scenario():
+        task = asyncio.create_task(writer.run())
+        writer.enqueue({"message": "lost"})
+        while len(attempts) < 1:
+            await asyncio.sleep(0.01)
+        writer.enqueue({"message": "kept"})
+        while not written:
+            await asyncio.sleep(0.01)
+        assert not task.done()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+
+    assert written == [[{"message": "kept"}]]
+
+
+def test_write_survives_database_not_initialized(monkeypatch):
+    from models import database as db_module
+
+    def not_ready():
+        raise RuntimeError("Database not configured")
+
+    monkeypatch.setattr(db_module, "ensure_database_initialized", not_ready)
+
+    # Logged and swallowed rather than raised into the writer loop
+    UserLogWriter()._write([{"message": "x"}])
+
+
+def _submit(monkeypatch, queued):
+    from fastapi import HTTPException
+    from starlette.requests import Request
+
+    from api import logs as logs_api
+
+    rows = []
+
+    def enqueue(row):
+        rows.append(row)
+        return queued
+
+    monkeypatch.setattr(logs_api.user_log_writer, "enqueue", enqueue)
+    request = Request({"type": "http", "method": "POST", "path": "/api/logs/user",
+                       "headers": [], "client": ("127.0.0.1", 1234)})
+    log_data = logs_api.UserLogRequest(log_level="info", action=next(iter(logs_api._LOG_ACTIONS)), message="hello")
+    try:
+        return asyncio.run(logs_api.submit_user_log(request, log_data, None)), rows
+    except HTTPException as e:
+        return e, rows
+
+
+def test_submit_stamps_created_at_and_reports_success(monkeypatch):
+    result, rows = _submit(monkeypatch, queued=True)
+
+    assert result["success"] is True
+    assert rows[0]["created_at"] is not None
+
+
+def test_submit_reports_dropped_entry_when_buffer_is_full(monkeypatch):
+    result, _ = _submit(monkeypatch, queued=False)
+
+    assert result.status_code == 503
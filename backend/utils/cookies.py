@@ -184,8 +184,6 @@ class CookieManager:
         if not provided_token:
             provided_token = request.headers.get("X-CSRF-Token")
         
-        logger.info(f"🔑 CSRF Header Token: {provided_token[:20] if provided_token else 'None'}...")
-        
         if not provided_token:
             logger.warning("❌ No CSRF token in header")
             return False
@@ -193,16 +191,12 @@ class CookieManager:
         # Get stored token from cookie
         stored_token = request.cookies.get(CookieManager.CSRF_COOKIE)
         
-        logger.info(f"🍪 CSRF Cookie Token: {stored_token[:20] if stored_token else 'None'}...")
-        
         if not stored_token:
             logger.warning("❌ No CSRF token in cookie")
             return False
         
         # Compare tokens securely
-        result = secrets.compare_digest(provided_token, stored_token)
-        logger.info(f"🔐 Token comparison result: {result}")
-        return result
+        return secrets.compare_digest(provided_token, stored_token)
     
     @staticmethod
     def set_oauth_cookies(
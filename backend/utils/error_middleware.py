@@ -0,0 +1,44 @@
+"""
+Pure ASGI middleware that turns unhandled route errors into a JSON 500.
+
+Route handlers let unexpected exceptions propagate instead of each wrapping
+its body in try/except; HTTPException is still answered by FastAPI before it
+gets here. Registered innermost so CORS and security headers still apply to
+the 500 response.
+"""
+import logging
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorCatchMiddleware:
+    """Log an unhandled exception once and answer with a generic 500"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # Lazy %-formatting: the message is only built if ERROR is enabled
+            logger.error("%s %s failed: %s", scope["method"], scope["path"], e, exc_info=True)
+            if response_started:
+                # Too late for a 500; let the server drop the connection
+                raise
+            response = ORJSONResponse({"detail": "Internal server error"}, status_code=500)
+            await response(scope, receive, send)
@@ -10,6 +10,9 @@ from pathlib import Path
 # Log directory - mounted as Docker volume
 LOG_DIR = Path("/app/logs")
 
+# Block size for reading log files backwards from the end
+LOG_TAIL_BLOCK_SIZE = 64 * 1024
+
 def setup_file_logging():
     """Configure file logging for the backend"""
     # Ensure log directory exists
@@ -45,17 +48,29 @@ def get_log_file_path(log_type: str) -> Path:
     return log_files.get(log_type, LOG_DIR / f"{log_type}.log")
 
 def read_log_file(log_type: str, lines: int = 1000) -> list[str]:
-    """Read the last N lines from a log file"""
+    """Read the last N lines from a log file (without line endings)"""
     log_file = get_log_file_path(log_type)
     
     if not log_file.exists():
         return []
     
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            # Read all lines and return the last N
-            all_lines = f.readlines()
-            return all_lines[-lines:] if len(all_lines) > lines else all_lines
+        with open(log_file, 'rb') as f:
+            # Read blocks backwards from the end until there are more than N line
+            # breaks, so the (possibly partial) first line read can be dropped
+            position = f.seek(0, os.SEEK_END)
+            blocks = []
+            newlines = 0
+            while position > 0 and newlines <= lines:
+                block_size = min(LOG_TAIL_BLOCK_SIZE, position)
+                position -= block_size
+                f.seek(position)
+                block = f.read(block_size)
+                blocks.append(block)
+                newlines += block.count(b'\n')
+        
+        tail = b''.join(reversed(blocks)).decode('utf-8', errors='replace')
+        return tail.splitlines()[-lines:]
     except Exception as e:
         logging.error(f"Failed to read log file {log_file}: {e}")
         return []
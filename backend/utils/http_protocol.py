@@ -0,0 +1,33 @@
+"""
+uvicorn HTTP protocol with a configurable per-connection send buffer.
+
+uvicorn's --http flag only accepts its built-in protocol names, so this class is
+passed as an object: `uvicorn.run(app, http=SendBufferHttpToolsProtocol)`, as
+`python main.py` does. The Docker start scripts launch the backend that way;
+HTTP_SEND_BUFFER_BYTES is set in docker-compose.yml.
+"""
+import os
+import socket
+import logging
+from uvicorn.protocols.http.httptools_impl import HttpToolsProtocol
+
+logger = logging.getLogger(__name__)
+
+# Per-connection send buffer in bytes; 0 leaves the kernel's TCP autotuning alone.
+# Linux caps explicit values at net.core.wmem_max, so raise that sysctl too when
+# setting e.g. 4194304 for streaming multi-MB originals over the LAN.
+SEND_BUFFER_BYTES = int(os.getenv("HTTP_SEND_BUFFER_BYTES", "0"))
+
+
+class SendBufferHttpToolsProtocol(HttpToolsProtocol):
+    """uvicorn httptools protocol that sizes SO_SNDBUF on every accepted connection"""
+
+    def connection_made(self, transport) -> None:
+        if SEND_BUFFER_BYTES > 0:
+            sock = transport.get_extra_info("socket")
+            if sock is not None:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+                except OSError as e:
+                    logger.debug(f"Could not set SO_SNDBUF to {SEND_BUFFER_BYTES}: {e}")
+        super().connection_made(transport)
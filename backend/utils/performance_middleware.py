@@ -17,6 +17,9 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# How long a computed stats snapshot is served before being rebuilt (seconds)
+STATS_SNAPSHOT_TTL = 1.0
+
 class PerformanceMetrics:
     """Thread-safe performance metrics collector"""
     
@@ -35,8 +38,13 @@ class PerformanceMetrics:
         # System metrics
         self.system_metrics = deque(maxlen=100)
         
-        # Error tracking
+        # Error tracking (total kept alongside so health checks don't sum the dict)
         self.error_counts = defaultdict(int)
+        self.total_errors = 0
+        
+        # Last get_stats() result, shared by dashboard endpoints polled together
+        self._stats_snapshot = None
+        self._stats_snapshot_at = 0.0
         
     def record_response_time(self, endpoint: str, method: str, duration: float, status_code: int):
         """Record API response time"""
@@ -82,67 +90,90 @@ class PerformanceMetrics:
         """Record error occurrence"""
         with self._lock:
             self.error_counts[f"{endpoint}:{error_type}"] += 1
+            self.total_errors += 1
+    
+    def reset(self):
+        """Clear all collected metrics"""
+        with self._lock:
+            self.response_times.clear()
+            self.query_times.clear()
+            self.slow_queries.clear()
+            self.system_metrics.clear()
+            self.error_counts.clear()
+            self.total_errors = 0
+            for endpoint_times in self.endpoint_times.values():
+                endpoint_times.clear()
+            self._stats_snapshot = None
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get current performance statistics"""
+        """Get current performance statistics (rebuilt at most every STATS_SNAPSHOT_TTL seconds)"""
         with self._lock:
-            now = datetime.utcnow()
-            last_hour = now - timedelta(hours=1)
-            
-            # Filter recent data
-            recent_responses = [r for r in self.response_times if r['timestamp'] > last_hour]
-            recent_queries = [q for q in self.query_times if q['timestamp'] > last_hour]
-            
-            # Calculate response time stats
-            if recent_responses:
-                response_durations = [r['duration'] for r in recent_responses]
-                avg_response_time = sum(response_durations) / len(response_durations)
-                max_response_time = max(response_durations)
-                min_response_time = min(response_durations)
-            else:
-                avg_response_time = max_response_time = min_response_time = 0
-            
-            # Calculate query stats
-            if recent_queries:
-                query_durations = [q['duration'] for q in recent_queries]
-                avg_query_time = sum(query_durations) / len(query_durations)
-                max_query_time = max(query_durations)
-                slow_query_count = len([q for q in query_durations if q > 1.0])
-            else:
-                avg_query_time = max_query_time = slow_query_count = 0
-            
-            # Get endpoint performance
-            endpoint_stats = {}
-            for endpoint, times in self.endpoint_times.items():
-                if times:
-                    endpoint_stats[endpoint] = {
-                        'avg_time': sum(times) / len(times),
-                        'max_time': max(times),
-                        'request_count': len(times)
-                    }
-            
-            # Get latest system metrics
-            latest_system = self.system_metrics[-1] if self.system_metrics else {}
-            
-            return {
-                'timestamp': now.isoformat(),
-                'response_times': {
-                    'avg_ms': round(avg_response_time * 1000, 2),
-                    'max_ms': round(max_response_time * 1000, 2),
-                    'min_ms': round(min_response_time * 1000, 2),
-                    'total_requests': len(recent_responses)
-                },
-                'database_queries': {
-                    'avg_ms': round(avg_query_time * 1000, 2),
-                    'max_ms': round(max_query_time * 1000, 2),
-                    'total_queries': len(recent_queries),
-                    'slow_queries': slow_query_count
-                },
-                'endpoints': endpoint_stats,
-                'system': latest_system,
-                'errors': dict(self.error_counts),
-                'slow_queries': list(self.slow_queries)[-10:]  # Last 10 slow queries
-            }
+            if self._stats_snapshot is not None and time.monotonic() - self._stats_snapshot_at < STATS_SNAPSHOT_TTL:
+                return self._stats_snapshot
+            self._stats_snapshot = self._compute_stats()
+            self._stats_snapshot_at = time.monotonic()
+            return self._stats_snapshot
+    
+    def _compute_stats(self) -> Dict[str, Any]:
+        """Compute statistics from the collected metrics (caller holds the lock)"""
+        now = datetime.utcnow()
+        last_hour = now - timedelta(hours=1)
+        
+        # Filter recent data
+        recent_responses = [r for r in self.response_times if r['timestamp'] > last_hour]
+        recent_queries = [q for q in self.query_times if q['timestamp'] > last_hour]
+        
+        # Calculate response time stats
+        if recent_responses:
+            response_durations = [r['duration'] for r in recent_responses]
+            avg_response_time = sum(response_durations) / len(response_durations)
+            max_response_time = max(response_durations)
+            min_response_time = min(response_durations)
+        else:
+            avg_response_time = max_response_time = min_response_time = 0
+        
+        # Calculate query stats
+        if recent_queries:
+            query_durations = [q['duration'] for q in recent_queries]
+            avg_query_time = sum(query_durations) / len(query_durations)
+            max_query_time = max(query_durations)
+            slow_query_count = len([q for q in query_durations if q > 1.0])
+        else:
+            avg_query_time = max_query_time = slow_query_count = 0
+        
+        # Get endpoint performance
+        endpoint_stats = {}
+        for endpoint, times in self.endpoint_times.items():
+            if times:
+                endpoint_stats[endpoint] = {
+                    'avg_time': sum(times) / len(times),
+                    'max_time': max(times),
+                    'request_count': len(times)
+                }
+        
+        # Get latest system metrics
+        latest_system = self.system_metrics[-1] if self.system_metrics else {}
+        
+        return {
+            'timestamp': now.isoformat(),
+            'response_times': {
+                'avg_ms': round(avg_response_time * 1000, 2),
+                'max_ms': round(max_response_time * 1000, 2),
+                'min_ms': round(min_response_time * 1000, 2),
+                'total_requests': len(recent_responses)
+            },
+            'database_queries': {
+                'avg_ms': round(avg_query_time * 1000, 2),
+                'max_ms': round(max_query_time * 1000, 2),
+                'total_queries': len(recent_queries),
+                'slow_queries': slow_query_count
+            },
+            'endpoints': endpoint_stats,
+            'system': latest_system,
+            'errors': dict(self.error_counts),
+            'errors_total': self.total_errors,
+            'slow_queries': list(self.slow_queries)[-10:]  # Last 10 slow queries
+        }
 
 # Global metrics instance
 performance_metrics = PerformanceMetrics()
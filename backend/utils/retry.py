@@ -8,7 +8,7 @@ for handling transient failures in image processing tasks.
 import time
 import asyncio
 import logging
-from typing import Callable, Any, Dict, List
+from typing import Callable, Any, Dict, List, Tuple
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -158,18 +158,19 @@ class CircuitBreaker:
         Returns:
             True if circuit is open (too many failures), False otherwise
         """
-        if task_id not in self.failures:
-            return False
-        
-        # Clean up old failures
-        now = time.time()
-        self.failures[task_id] = [
-            timestamp for timestamp in self.failures[task_id]
-            if now - timestamp < self.reset_timeout
-        ]
+        return self.probe(task_id)[0]
+    
+    def probe(self, task_id: int) -> Tuple[bool, int]:
+        """
+        Check the circuit and read the failure count in a single pass.
         
-        # Check if threshold exceeded
-        failure_count = len(self.failures[task_id])
+        Args:
+            task_id: The ID of the task/image to check
+            
+        Returns:
+            (is_open, failure_count) within the reset timeout window
+        """
+        failure_count = self.get_failure_count(task_id)
         is_open = failure_count >= self.failure_threshold
         
         if is_open:
@@ -178,7 +179,7 @@ class CircuitBreaker:
                 f"{failure_count} failures in {self.reset_timeout}s window"
             )
         
-        return is_open
+        return is_open, failure_count
     
     def get_failure_count(self, task_id: int) -> int:
         """
@@ -213,6 +214,25 @@ class CircuitBreaker:
         if task_id in self.failures:
             del self.failures[task_id]
             logger.info(f"Circuit breaker manually reset for task {task_id}")
+    
+    def reset_many(self, task_ids: List[int]) -> int:
+        """
+        Manually reset the circuit breaker for several tasks at once.
+        Used by bulk retry operations.
+        
+        Args:
+            task_ids: The IDs of the tasks/images to reset
+            
+        Returns:
+            Number of tasks that had failure history cleared
+        """
+        cleared = 0
+        for task_id in task_ids:
+            if self.failures.pop(task_id, None) is not None:
+                cleared += 1
+        if cleared:
+            logger.info(f"Circuit breaker manually reset for {cleared} tasks")
+        return cleared
 
 
 # Global circuit breaker instance for image processing
@@ -1,5 +1,5 @@
 import asyncio
-import json
+import orjson
 from typing import Dict, Set, Optional, Any
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime, timedelta
@@ -8,6 +8,10 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Outgoing messages buffered per connection; when a slow client falls this far
+# behind, its oldest pending message is dropped
+SEND_QUEUE_SIZE = 64
+
 class ConnectionManager:
     """Manages WebSocket connections for display devices and admin clients"""
     
@@ -30,6 +34,18 @@ class ConnectionManager:
         # Message queues for offline devices
         self.message_queues: Dict[str, list] = {}  # device_token -> [messages]
         
+        # Outgoing message queue and the task draining it, per connection, so
+        # senders never wait on a client's socket
+        self.send_queues: Dict[str, asyncio.Queue] = {}
+        self.sender_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Playlist rooms: playlist_id -> device tokens showing it, and the reverse
+        # lookup. Kept by token so a device stays in its room across reconnects.
+        self.playlist_rooms: Dict[int, Set[str]] = {}
+        self.device_playlists: Dict[str, int] = {}
+        # device_id -> token, for changes reported by device ID (scheduler events)
+        self.device_tokens: Dict[int, str] = {}
+        
     async def connect(self, websocket: WebSocket, connection_type: str, device_token: Optional[str] = None) -> str:
         """Connect a new WebSocket connection (connection should already be accepted)"""
         
@@ -38,6 +54,11 @@ class ConnectionManager:
         
         # Store connection
         self.active_connections[connection_id] = websocket
+        send_queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.send_queues[connection_id] = send_queue
+        self.sender_tasks[connection_id] = asyncio.create_task(
+            self._send_loop(connection_id, websocket, send_queue)
+        )
         
         # Store metadata
         self.connection_metadata[connection_id] = {
@@ -90,27 +111,53 @@ class ConnectionManager:
                 self.admin_connections.discard(connection_id)
                 logger.info(f"Admin disconnected: {connection_id}")
             
+            # Stop the sender (unless the sender itself is disconnecting us)
+            self.send_queues.pop(connection_id, None)
+            sender_task = self.sender_tasks.pop(connection_id, None)
+            if sender_task is not None and sender_task is not asyncio.current_task():
+                sender_task.cancel()
+            
             # Clean up metadata
             if connection_id in self.connection_metadata:
                 del self.connection_metadata[connection_id]
             if connection_id in self.last_heartbeat:
                 del self.last_heartbeat[connection_id]
     
-    async def send_to_connection(self, connection_id: str, message: dict):
-        """Send a message to a specific connection"""
-        if connection_id in self.active_connections:
+    async def _send_loop(self, connection_id: str, websocket: WebSocket, send_queue: asyncio.Queue):
+        """Write queued messages to one connection in order until it fails or is disconnected"""
+        while True:
+            text = await send_queue.get()
             try:
-                websocket = self.active_connections[connection_id]
-                await websocket.send_text(json.dumps(message))
-                
-                # Update last activity
-                if connection_id in self.connection_metadata:
-                    self.connection_metadata[connection_id]["last_activity"] = datetime.now()
-                    
+                await websocket.send_text(text)
             except Exception as e:
                 logger.error(f"Failed to send message to connection {connection_id}: {e}")
                 # Remove the connection if it's broken
                 self.disconnect(connection_id)
+                return
+    
+    def _enqueue(self, connection_id: str, text: str):
+        """Queue serialized text for a connection without waiting on its socket"""
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
+            return
+        if send_queue.full():
+            send_queue.get_nowait()
+            logger.warning(f"Send queue full for connection {connection_id}, dropped oldest message")
+        send_queue.put_nowait(text)
+        
+        # Update last activity
+        if connection_id in self.connection_metadata:
+            self.connection_metadata[connection_id]["last_activity"] = datetime.now()
+    
+    @staticmethod
+    def _encode(message: dict) -> str:
+        """Serialize a message to the JSON text sent over the socket"""
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    async def send_to_connection(self, connection_id: str, message: dict):
+        """Send a message to a specific connection (queued; returns without waiting for the client)"""
+        if connection_id in self.active_connections:
+            self._enqueue(connection_id, self._encode(message))
     
     async def send_to_device(self, device_token: str, message: dict):
         """Send a message to a specific device"""
@@ -125,14 +172,54 @@ class ConnectionManager:
             logger.info(f"Device {device_token[:8]}... is offline, message queued")
     
     async def send_to_all_admins(self, message: dict):
-        """Send a message to all admin connections"""
+        """Send a message to all admin connections (serialized once for all of them)"""
+        if not self.admin_connections:
+            return
+        text = self._encode(message)
         for connection_id in list(self.admin_connections):
-            await self.send_to_connection(connection_id, message)
+            self._enqueue(connection_id, text)
+    
+    def subscribe(self, device_token: str, playlist_id: Optional[int], device_id: Optional[int] = None):
+        """Put a device in the room for the playlist it shows (None leaves all rooms)"""
+        if device_id is not None:
+            self.device_tokens[device_id] = device_token
+        current = self.device_playlists.get(device_token)
+        if current == playlist_id:
+            return
+        self.unsubscribe(device_token)
+        if playlist_id is not None:
+            self.playlist_rooms.setdefault(playlist_id, set()).add(device_token)
+            self.device_playlists[device_token] = playlist_id
+    
+    def unsubscribe(self, device_token: str):
+        """Remove a device from its playlist room"""
+        playlist_id = self.device_playlists.pop(device_token, None)
+        if playlist_id is None:
+            return
+        room = self.playlist_rooms.get(playlist_id)
+        if room is not None:
+            room.discard(device_token)
+            if not room:
+                del self.playlist_rooms[playlist_id]
+    
+    def move_device(self, device_id: int, playlist_id: Optional[int]):
+        """Move a device, known by ID, to another playlist's room (e.g. after a schedule change)"""
+        device_token = self.device_tokens.get(device_id)
+        if device_token is not None:
+            self.subscribe(device_token, playlist_id)
+    
+    def close_playlist_room(self, playlist_id: int):
+        """Drop a deleted playlist's room; its devices go back to having no known playlist"""
+        for device_token in list(self.playlist_rooms.get(playlist_id, ())):
+            self.unsubscribe(device_token)
     
     async def send_to_all_devices(self, message: dict):
-        """Send a message to all connected devices"""
-        for device_token, connection_id in list(self.device_connections.items()):
-            await self.send_to_connection(connection_id, message)
+        """Send a message to all connected devices (serialized once for all of them)"""
+        if not self.device_connections:
+            return
+        text = self._encode(message)
+        for connection_id in list(self.device_connections.values()):
+            self._enqueue(connection_id, text)
     
     async def broadcast_device_status_update(self, device_data: dict):
         """Broadcast device status update to all admins"""
@@ -163,13 +250,25 @@ class ConnectionManager:
         await self.send_to_device(device_token, message)
     
     async def broadcast_playlist_update(self, playlist_data: dict):
-        """Broadcast playlist update to all connected devices"""
+        """Broadcast playlist update to the devices showing that playlist"""
         message = {
             "type": "playlist_update",
             "playlist": playlist_data,
             "timestamp": datetime.now().isoformat()
         }
-        await self.send_to_all_devices(message)
+        # Only devices showing this playlist, plus devices with no known playlist
+        # (they fall back to the default playlist, which may be this one)
+        room = self.playlist_rooms.get(playlist_data.get("id"), set())
+        connection_ids = [
+            connection_id
+            for device_token, connection_id in list(self.device_connections.items())
+            if device_token in room or device_token not in self.device_playlists
+        ]
+        if not connection_ids:
+            return
+        text = self._encode(message)
+        for connection_id in connection_ids:
+            self._enqueue(connection_id, text)
     
     async def broadcast_image_processing_update(self, event_payload: dict):
         """
@@ -6,8 +6,8 @@ updates to connected clients via Redis pub/sub (cross-process communication).
 """
 
 import logging
-from typing import Optional, Dict, Any
-from .redis_bridge import publish_processing_update
+from typing import Optional, Dict, Any, List
+from .redis_bridge import publish_processing_update, publish_processing_updates
 from .events import (
     WS_EVENT_THUMBNAIL_COMPLETE,
     WS_EVENT_THUMBNAIL_FAILED,
@@ -42,6 +42,22 @@ def emit_processing_update_sync(event_payload: Dict[str, Any]):
         logger.warning(f"Failed to publish processing update: {e}")
 
 
+def emit_processing_updates_sync(event_payloads: List[Dict[str, Any]]):
+    """
+    Emit several processing updates at once (single Redis round-trip).
+    
+    Lets background jobs collect events while they hold a DB session and
+    publish them after it is released.
+    
+    Args:
+        event_payloads: Event dicts from websocket.events module, in delivery order
+    """
+    try:
+        publish_processing_updates(event_payloads)
+    except Exception as e:
+        logger.warning(f"Failed to publish processing updates: {e}")
+
+
 # Convenience functions for common events
 
 def notify_thumbnail_complete(image_id: int, thumbnail_count: int):
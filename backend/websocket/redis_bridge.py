@@ -9,7 +9,7 @@ import json
 import logging
 import os
 import redis
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 
 logger = logging.getLogger(__name__)
 
@@ -49,3 +49,27 @@ def publish_processing_update(event_payload: Dict[str, Any]):
     except Exception as e:
         logger.error(f"❌ Failed to publish to Redis: {e}", exc_info=True)
 
+
+def publish_processing_updates(event_payloads: List[Dict[str, Any]]):
+    """
+    Publish several image processing updates in one Redis round-trip.
+    
+    Args:
+        event_payloads: Event dicts from websocket.events module, in delivery order
+    """
+    if not event_payloads:
+        return
+    
+    try:
+        client = get_redis_client()
+        channel = 'glowworm:processing:updates'
+        
+        pipeline = client.pipeline(transaction=False)
+        for event_payload in event_payloads:
+            pipeline.publish(channel, json.dumps(event_payload))
+        pipeline.execute()
+        logger.info(f"📤 Published {len(event_payloads)} updates to Redis for image {event_payloads[0].get('image_id')}")
+        
+    except Exception as e:
+        logger.error(f"❌ Failed to publish to Redis: {e}", exc_info=True)
+
@@ -12,6 +12,7 @@ import os
 from typing import Optional
 import redis.asyncio as aioredis
 from .manager import connection_manager
+from .scheduler_events import WS_EVENT_PLAYLIST_SCHEDULED_CHANGE
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,12 @@ async def redis_subscriber_task():
                         # Parse the event payload
                         event_payload = json.loads(message['data'])
                         
+                        # The scheduler runs in Celery; keep playlist rooms in step
+                        if event_payload.get('type') == WS_EVENT_PLAYLIST_SCHEDULED_CHANGE:
+                            connection_manager.move_device(
+                                event_payload['device_id'], event_payload.get('new_playlist_id')
+                            )
+                        
                         # Broadcast to all admin WebSocket connections
                         await connection_manager.broadcast_image_processing_update(event_payload)
                         
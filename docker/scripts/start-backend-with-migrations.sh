@@ -195,6 +195,6 @@ fi
 
 echo ""
 
-# Start the backend server
+# Start the backend server (main.py runs uvicorn with the send-buffer protocol)
 echo "🚀 Starting backend server..."
-exec python -m uvicorn main:app --host 0.0.0.0 --port 8001
\ No newline at end of file
+exec env BACKEND_PORT=8001 python main.py
\ No newline at end of file
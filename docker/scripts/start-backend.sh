@@ -32,6 +32,6 @@ while True:
 echo "🔄 Running database migrations..."
 python -m alembic upgrade head
 
-# Start the backend server
+# Start the backend server (main.py runs uvicorn with the send-buffer protocol)
 echo "🚀 Starting backend server..."
-python -m uvicorn main:app --host 0.0.0.0 --port 8001
+BACKEND_PORT=8001 python main.py